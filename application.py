@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import Any
 
@@ -22,20 +23,35 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 # from starlette.middleware import Middleware
 from starlette.responses import JSONResponse
 
+from apps.appclient.services.appclient_service import AppClientService
+from apps.auditlog.interfaces.notification_interface import Notification
 from apps.blockchain.interfaces.transaction_interface import BlockchainTransaction
+from apps.blockchain.services.blockchain_service import BlockchainService
+from apps.defi.lending.services.lending_service import LendingService
 from apps.socket.services.socket_service import sio
 from apps.user.interfaces.user_interface import User
+from apps.wallet.interfaces.qrimage_interface import QRImage
+from apps.wallet.interfaces.walletasset_interface import WalletAsset
+from apps.wallet.services.qr_image_service import qrImageService
 from core import urls
 from core.config import settings
 from core.cron import CronJob
-from core.db import client, cursor
+from core.db import async_client, client
+from core.db.change_stream import changeStream
 from core.db.event_listeners import CommandLogger
 
 # from core.db.populate_core_data import seed_deg_x
 from core.middleware.sentry import sentry_setup
 from core.utils.custom_exceptions import UnicornException, UnicornRequest
+from core.utils.key_cache import derivedKeyCache
 from core.utils.loggly import logger
+from core.utils.reference_cache import ReferenceCache
+from core.utils.request import HTTPRepository
 from core.utils.response_service import ResponseService
+from core.utils.s3_uploader import s3Uploader
+from core.utils.shared_cache import SharedCache
+from core.utils.utils_service import Utils
+from core.warmup import warmup
 
 # from fastapi_socketio import SocketManager
 
@@ -68,6 +84,46 @@ def custom_openapi(app: FastAPI) -> dict[str, Any]:
     return app.openapi_schema
 
 
+async def load_reference_data() -> None:
+    await BlockchainService.load_reference_data()
+    await LendingService.get_default_provider_key()
+
+
+async def load_contract_abis() -> None:
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, Utils.load_contract_abis)
+
+
+def register_warmup_steps() -> None:
+    warmup.register("reference_data", load_reference_data)
+    warmup.register("app_clients", AppClientService().load_clients)
+    warmup.register("contract_abis", load_contract_abis)
+    warmup.register("web3_providers", BlockchainService.load_web3_providers)
+    # nothing is read from or written to the bucket outside dev
+    if settings.IS_DEV:
+        warmup.register("s3_region", s3Uploader.load_region)
+
+
+def start_change_stream() -> None:
+    if not settings.CHANGE_STREAM_ENABLED:
+        return
+    changeStream.register(
+        ReferenceCache.get_collections(),
+        # replaces come from documents edited by hand
+        ["insert", "update", "replace", "delete"],
+        None,
+        ReferenceCache.handle_change,
+    )
+    # balances are only written with $set, replaces never carry a balance change
+    changeStream.register(
+        ["walletasset"],
+        ["update"],
+        WalletAsset,
+        BlockchainService.push_walletasset_balance,
+    )
+    changeStream.start()
+
+
 def create_app() -> FastAPI:
     Config.set(
         key="[AVAILABLE IN THE SCOUT UI]",
@@ -104,7 +160,7 @@ def create_app() -> FastAPI:
     app.add_middleware(ExceptionMiddleware, handlers=app.exception_handlers)
 
     @app.on_event("startup")
-    def startup() -> None:
+    async def startup() -> None:
         logger.info("Setting up model collections")
         monitoring.register(CommandLogger())
         if settings.CRON_ENABLED:
@@ -112,16 +168,30 @@ def create_app() -> FastAPI:
         # await seed_deg_x()
         User.init()
         BlockchainTransaction.init()
+        Notification.init()
+        QRImage.init()
         sentry_setup()
         logger.info("Done setting up model collections")
 
+        register_warmup_steps()
+        await warmup.start()
+        start_change_stream()
+        qrImageService.start()
+
         # run_in_threadpool(mongo_data_streaming)
 
     @app.on_event("shutdown")
-    def shutdown() -> None:
+    async def shutdown() -> None:
         logger.info("Closing connection with MongoDB.")
-        cursor.close()
+        warmup.stop()
+        changeStream.stop()
+        qrImageService.stop()
+        await HTTPRepository.close()
+        await SharedCache.close()
+        BlockchainService.shutdown_derivation_pool()
+        derivedKeyCache.clear()
         client.close()
+        async_client.close()
         cronJob.scheduler.shutdown()
         logger.info("Closed connection with MongoDB.")
 
@@ -1,10 +1,12 @@
 from enum import Enum
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Callable, ClassVar
 
 from apps.appclient.interfaces.appclient_interface import AppClient
 from core.utils.custom_exceptions import UnicornException, UnicornRequest
+from core.utils.loggly import logger
 from core.utils.model_utility_service import ModelUtilityService
+from core.utils.reference_cache import ReferenceCache
 from core.utils.utils_service import Utils
 
 
@@ -17,6 +19,12 @@ class Apps(str, Enum):
 
 
 class AppClientService:
+    # left untyped so the api secrets of the clients stay out of the shared
+    # cache tier
+    clientCache: ClassVar[ReferenceCache[AppClient]] = ReferenceCache(
+        "appclient", ["appclient"]
+    )
+
     def client_auth(self, func: Callable[[UnicornRequest, Any, Any], Any]) -> Any:
         @wraps(func)
         async def wrapper(request: UnicornRequest, *args: Any, **kwargs: Any) -> Any:
@@ -53,16 +61,23 @@ class AppClientService:
 
         return app_client
 
-    def get_client_by_name(self, name: str) -> AppClient:
-        app_client = ModelUtilityService.non_async_find_one(
-            AppClient,
-            {"name": name, "isDeleted": False},
-        )
-
-        if not app_client:
-            raise UnicornException(status_code=403, message="client not found")
+    async def find_client_by_name(self, name: str) -> AppClient | None:
+        """
+        find_client_by_name: app client of an integration, None when it is not set
+        up or could not be read, in which case the next call looks it up again
+        """
+        query = {"name": name, "isDeleted": False}
+        try:
+            return await AppClientService.clientCache.get(
+                query, lambda: ModelUtilityService.find_one(AppClient, query)
+            )
+        except Exception as e:
+            logger.error(f"Error retrieving {name} app client - {str(e)}")
+            return None
 
-        return app_client
+    async def load_clients(self) -> None:
+        """load_clients: cache the app client of every integration at startup"""
+        await Utils.promise_all([self.find_client_by_name(app) for app in Apps])
 
     async def create_client(self, client: AppClient) -> AppClient:
         client.clientSecret = Utils.generate_random(24)
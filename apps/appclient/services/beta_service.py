@@ -2,6 +2,7 @@ from typing import Any, Generic, TypeVar
 from pydantic import BaseModel
 
 from apps.appclient.services.appclient_service import AppClientService, Apps
+from core.utils.custom_exceptions import UnicornException
 from core.utils.request import REQUEST_METHOD, HTTPRepository
 
 T = TypeVar("T")
@@ -15,18 +16,19 @@ class BaseBetaResponse(BaseModel, Generic[T]):
 class BetaService:
     appClientService = AppClientService()
 
-    def __init__(self) -> None:
-        client_data = None
-        try:
-            client_data = self.appClientService.get_client_by_name(Apps.Beta)
-        except Exception as e:
-            print(e)
-        self.base_url = client_data.appUrl if client_data else None
-        self.httpRepository = HTTPRepository(self.base_url)
+    async def get_http_repository(self) -> HTTPRepository:
+        client_data = await self.appClientService.find_client_by_name(Apps.Beta)
+        if not client_data:
+            raise UnicornException(
+                status_code=503, message="beta app client not set up"
+            )
+
+        return HTTPRepository(client_data.appUrl)
 
     async def interact_on_solend(self, action: str, payload: Any) -> str:
         payload["action"] = action
-        res = await self.httpRepository.call(
+        http_repository = await self.get_http_repository()
+        res = await http_repository.call(
             REQUEST_METHOD.POST, "/solend", BaseBetaResponse[str], payload
         )
         return res.data
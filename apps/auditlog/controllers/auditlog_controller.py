@@ -34,11 +34,12 @@ class AuditLogController:
         user: CurrentUser,
         page_num: int = 1,
         page_size: int = 10,
+        after: str | None = None,
     ) -> ResponseModel[Sequence[NotificationOut]]:
         try:
             request.app.logger.info("getting user notifications")
             res, meta = await self.auditLogService.get_users_notification(
-                user, page_num, page_size
+                user, page_num, page_size, after
             )
             request.app.logger.info("done getting user notifications")
             return self.responseService.send_response(
@@ -1,9 +1,11 @@
 from enum import Enum
 from typing import Union, Optional
 
+from pymongo import ASCENDING, DESCENDING
 
 from apps.user.interfaces.user_interface import User, UserBase
 
+from core.db import db
 from core.depends.get_object_id import PyObjectId
 from core.depends.model import SBaseModel, SBaseOutModel
 
@@ -23,3 +25,13 @@ class NotificationOut(SBaseOutModel):
 
 class Notification(NotificationOut, SBaseModel):
     user: Optional[Union[PyObjectId, User]] = None
+
+    @staticmethod
+    def init() -> None:
+        # keyset pagination of user and generic notifications
+        db.notification.create_index(
+            [("user", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]
+        )
+        db.notification.create_index(
+            [("type", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]
+        )
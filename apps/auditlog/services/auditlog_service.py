@@ -8,7 +8,7 @@ from apps.auditlog.interfaces.notification_interface import (
     NotificationType,
 )
 from apps.notification.slack.services.slack_service import SlackService
-from core.utils.model_utility_service import ModelUtilityService
+from core.utils.model_utility_service import CountMode, ModelUtilityService
 from core.utils.response_service import MetaDataModel
 
 
@@ -37,7 +37,7 @@ class AuditLogService:
         return notf_obj
 
     async def get_users_notification(
-        self, user: User, page_num: int, page_size: int
+        self, user: User, page_num: int, page_size: int, after: str | None = None
     ) -> tuple[list[Notification], MetaDataModel]:
         res, meta_data = await ModelUtilityService.paginate_data(
             Notification,
@@ -47,6 +47,9 @@ class AuditLogService:
             },
             page_num,
             page_size,
+            keyset=True,
+            after=after,
+            count_mode=CountMode.CACHED,
         )
 
         return res, meta_data
@@ -1,9 +1,12 @@
-import random
-import string
+import hashlib
+import re
 from typing import Any, Callable, cast
 
+from bitcoinlib.keys import HDKey
+from bitcoinlib.networks import Network as BitcoinNetwork
 from bitcoinlib.services.services import Service
 from bitcoinlib.wallets import Wallet as BitcoinWallet
+from bitcoinlib.wallets import wallet_delete, wallet_exists, wallets_list
 from mnemonic import Mnemonic
 
 from apps.blockchain.interfaces.blockchain_interface import ChainServiceName
@@ -13,8 +16,14 @@ from apps.blockchain.interfaces.blockchain_iservice import IBlockchainService
 from apps.user.interfaces.user_interface import User
 from apps.wallet.interfaces.wallet_interface import Wallet
 from apps.wallet.interfaces.walletasset_interface import Address
+from core.utils.key_cache import derivedKeyCache
+from core.utils.loggly import logger
 from core.utils.request import HTTPRepository
 
+# wallets used to be created under a random 5 character name on every call,
+# wallets of a seed are now named by its 64 character sha256
+ORPHANED_WALLET_NAME = re.compile(r"[A-Za-z0-9]{5}")
+
 
 class BasecoinService(IBlockchainService):
     httpRepository = HTTPRepository()
@@ -49,23 +58,84 @@ class BasecoinService(IBlockchainService):
     def get_wallet_from_mnemonic(
         self, mnemonic: str, network: NetworkType = NetworkType.TESTNET
     ) -> BitcoinWallet:
-        wallet_name = "".join(random.choices(string.ascii_letters + string.digits, k=5))
+        seed = derivedKeyCache.get(
+            "bip39", mnemonic, lambda: self.mnemo.to_seed(mnemonic)
+        )
+
+        return self.get_wallet_from_seed(seed, network)
+
+    def get_wallet_from_seed(
+        self, seed: bytes, network: NetworkType = NetworkType.TESTNET
+    ) -> BitcoinWallet:
+        """
+        get_wallet_from_seed: the bitcoinlib wallet of a seed on a network, created
+        once under a name hashed from the seed and reopened afterwards
+        """
+        coin_network = self.network_map[self.coin_network(network)]
+        wallet_name = hashlib.sha256(seed + coin_network.encode()).hexdigest()
+        if wallet_exists(wallet_name):
+            return BitcoinWallet(wallet_name)
+
         wallet = BitcoinWallet.create(
             wallet_name,
-            keys=mnemonic,
-            network=self.network_map[self.coin_network(network)],
+            keys=HDKey.from_seed(seed, network=coin_network),
+            network=coin_network,
         )
 
         return wallet
 
+    def get_address_from_seed(
+        self, seed: bytes, network: NetworkType = NetworkType.TESTNET
+    ) -> str:
+        # first receive address of account 0, the key a new bitcoinlib wallet hands out
+        coin_network = self.network_map[self.coin_network(network)]
+        coin_type = BitcoinNetwork(coin_network).bip44_cointype
+        key = HDKey.from_seed(seed, network=coin_network).subkey_for_path(
+            f"m/44'/{coin_type}'/0'/0/0"
+        )
+
+        return str(key.address())
+
     async def create_address(self, mnemonic: str) -> Address:
-        test_wallet = self.get_wallet_from_mnemonic(mnemonic)
-        main_wallet = self.get_wallet_from_mnemonic(mnemonic, NetworkType.MAINNET)
+        seed = derivedKeyCache.get(
+            "bip39", mnemonic, lambda: self.mnemo.to_seed(mnemonic)
+        )
+        return self.derive_address(seed)
+
+    def derive_address(self, seed: bytes) -> Address:
         # Construct from seed
         return Address(
-            main=main_wallet.get_key().address, test=test_wallet.get_key().address
+            main=self.get_address_from_seed(seed, NetworkType.MAINNET),
+            test=self.get_address_from_seed(seed),
         )
 
+    @staticmethod
+    def cleanup_orphaned_wallets() -> int:
+        """
+        cleanup_orphaned_wallets: delete the throwaway wallets earlier address
+        derivations left in the bitcoinlib database, ownerless bip32 wallets of
+        the mapped networks under a random 5 character name
+        """
+        networks = set(BasecoinService.network_map.values())
+        deleted = 0
+        for wallet in wallets_list():
+            if (
+                not ORPHANED_WALLET_NAME.fullmatch(wallet["name"])
+                or wallet["network"] not in networks
+                or wallet["scheme"] != "bip32"
+                or wallet["owner"]
+            ):
+                continue
+            logger.info(
+                f"deleting orphaned bitcoinlib wallet {wallet['name']} "
+                f"on {wallet['network']}"
+            )
+            wallet_delete(wallet["name"], force=True)
+            deleted += 1
+        logger.info(f"deleted {deleted} orphaned bitcoinlib wallets")
+
+        return deleted
+
     async def send(
         self,
         address: str,
@@ -77,7 +147,7 @@ class BasecoinService(IBlockchainService):
         gas_price: int = 50,
     ) -> str:
         network = cast(Network, token_asset.network)
-        wallet = self.get_wallet_from_mnemonic(mnemonic)
+        wallet = self.get_wallet_from_mnemonic(mnemonic, network.networkType)
         amount = int(self.format_num(value, "to"))
 
         hash = wallet.send_to(
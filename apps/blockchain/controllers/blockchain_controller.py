@@ -42,11 +42,12 @@ class BlockchainController:
         user: CurrentUser,
         page_num: int = 1,
         page_size: int = 10,
+        after: str | None = None,
     ) -> ResponseModel[Sequence[BlockchainTransactionOut]]:
         try:
             request.app.logger.info(f"getting user blockchain transactions - {user.id}")
             user_txns, meta_data = await self.blockchainService.get_transactions(
-                user, page_num, page_size
+                user, page_num, page_size, after
             )
             request.app.logger.info("done getting user blockchain transction data ")
             return self.responseService.send_response(
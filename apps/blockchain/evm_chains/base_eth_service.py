@@ -1,13 +1,14 @@
+import asyncio
 from typing import Any, cast
 
 import pendulum
 from eth_account import Account
+from eth_account.hdaccount import ETHEREUM_DEFAULT_PATH, key_from_seed
 from eth_account.signers.local import LocalAccount
 from eth_typing import Address as EthAddress
 from eth_typing import HexStr
-from web3 import Web3
+from web3 import AsyncWeb3, Web3
 from web3.contract.async_contract import AsyncContract
-from web3.middleware.geth_poa import geth_poa_middleware
 from web3.types import Wei
 
 from apps.blockchain.interfaces.blockchain_interface import Blockchain, ChainServiceName
@@ -20,8 +21,9 @@ from apps.blockchain.interfaces.transaction_interface import (
     TxnType,
 )
 from apps.blockchain.interfaces.blockchain_iservice import IBlockchainService
+from apps.blockchain.evm_chains.nonce_manager import NonceManager
+from apps.blockchain.evm_chains.web3_provider_pool import Web3ProviderPool
 from apps.blockchain.types.ethereum_type import (
-    EtherscanBaseResponse,
     IEtherscanNormalTxns,
 )
 from apps.networkfee.services.networkfee_service import (
@@ -33,15 +35,22 @@ from apps.user.interfaces.user_interface import User
 from apps.wallet.interfaces.wallet_interface import Wallet
 from apps.wallet.interfaces.walletasset_interface import Address
 from core.depends.get_object_id import PyObjectId
+from core.utils.key_cache import derivedKeyCache
 from core.utils.loggly import logger
 from core.utils.model_utility_service import ModelUtilityService
 from core.utils.request import REQUEST_METHOD, HTTPRepository
-from core.utils.utils_service import Utils, timed_cache
+from core.utils.ttl_cache import ttl_cache
+from core.utils.utils_service import Utils
+
+
+# Multicall3 is deployed at the same address on every supported evm chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
 
 
 class BaseEvmService(IBlockchainService):
     httpRepository = HTTPRepository()
     networkFeeService = NetworkFeeService()
+    nonceManager = NonceManager()
 
     def __init__(self, service_name: ChainServiceName) -> None:
         self.service_name = service_name
@@ -50,27 +59,55 @@ class BaseEvmService(IBlockchainService):
         return self.service_name
 
     def get_network_provider(self, chain_network: Network) -> Web3:
-        logger.info("getting network rpc provider")
-        web3 = Web3(Web3.HTTPProvider(chain_network.providerUrl))
-        web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        return Web3ProviderPool.get_provider(chain_network)
+
+    def get_async_network_provider(self, chain_network: Network) -> AsyncWeb3:
+        return Web3ProviderPool.get_async_provider(chain_network)
 
-        return web3
+    @staticmethod
+    def build_contract_txn(
+        contract: AsyncContract, fn_name: str, args: list[Any]
+    ) -> dict[str, Any]:
+        """
+        build_contract_txn: encode a contract call into a transaction without
+        touching the rpc, gas, fees and nonce are filled in by `sign_txn`
+        """
+        return {
+            "to": contract.address,
+            "value": 0,
+            "data": contract.encodeABI(fn_name=fn_name, args=args),
+        }
 
     @staticmethod
-    @timed_cache(60, 10, asyncFunction=True)
-    async def get_erc20_contract_obj(crt_address: str, web3: Web3) -> AsyncContract:
+    @ttl_cache(3600, 256)
+    async def get_erc20_contract_obj(
+        crt_address: str, web3: AsyncWeb3
+    ) -> AsyncContract:
         address = Web3.to_bytes(hexstr=HexStr(crt_address))
-        abi = await Utils.get_compiled_sol("IERC20", "0.6.12")
-        erc20_crt = cast(
-            AsyncContract, web3.eth.contract(address=EthAddress(address), abi=abi)
-        )
+        abi = Utils.get_contract_abi("IERC20")
+        erc20_crt = web3.eth.contract(address=EthAddress(address), abi=abi)
 
         return erc20_crt
 
+    @staticmethod
+    @ttl_cache(3600, 16)
+    async def get_multicall_contract_obj(web3: AsyncWeb3) -> AsyncContract:
+        abi = Utils.get_contract_abi("IMulticall3")
+        multicall_crt = web3.eth.contract(
+            address=Web3.to_checksum_address(MULTICALL3_ADDRESS), abi=abi
+        )
+
+        return multicall_crt
+
     @staticmethod
     def get_account_by_mmenonic(mnemonic: str) -> LocalAccount:
-        Account.enable_unaudited_hdwallet_features()
-        account: LocalAccount = Account.from_mnemonic(mnemonic)
+        def derive_private_key() -> bytes:
+            Account.enable_unaudited_hdwallet_features()
+            return bytes(Account.from_mnemonic(mnemonic).key)
+
+        account: LocalAccount = Account.from_key(
+            derivedKeyCache.get("evm", mnemonic, derive_private_key)
+        )
         return account
 
     async def create_address(self, mnemonic: str) -> Address:
@@ -78,6 +115,11 @@ class BaseEvmService(IBlockchainService):
         address = account.address
         return Address(main=address, test=address)
 
+    def derive_address(self, seed: bytes) -> Address:
+        # same path Account.from_mnemonic derives with
+        account = Account.from_key(key_from_seed(seed, ETHEREUM_DEFAULT_PATH))
+        return Address(main=account.address, test=account.address)
+
     async def send(
         self,
         address: str,
@@ -90,15 +132,17 @@ class BaseEvmService(IBlockchainService):
     ) -> str:
         chain_network = cast(Network, token_asset.network)
         blockchain = cast(Blockchain, token_asset.blockchain)
-        web3 = self.get_network_provider(chain_network)
+        web3 = self.get_async_network_provider(chain_network)
         if token_asset.contractAddress:
             erc20_crt = await BaseEvmService.get_erc20_contract_obj(
                 token_asset.contractAddress, web3
             )
 
-            txn_build = erc20_crt.functions.transfer(
-                Web3.to_bytes(hexstr=HexStr(to)), Web3.to_wei(value, "ether")
-            ).build_transaction()
+            txn_build = self.build_contract_txn(
+                erc20_crt,
+                "transfer",
+                [Web3.to_bytes(hexstr=HexStr(to)), Web3.to_wei(value, "ether")],
+            )
 
         else:
             # build a transaction in a dictionary
@@ -107,10 +151,6 @@ class BaseEvmService(IBlockchainService):
                 "value": Web3.to_wei(value, "ether"),
             }
 
-        txn_build = {
-            **txn_build,
-        }
-
         txn_hash = await self.sign_txn(chain_network, blockchain, mnemonic, txn_build)
 
         return txn_hash
@@ -122,20 +162,97 @@ class BaseEvmService(IBlockchainService):
     ) -> float:
         chain_network = cast(Network, token_asset.network)
 
-        web3 = self.get_network_provider(chain_network)
+        web3 = self.get_async_network_provider(chain_network)
         if token_asset.contractAddress:
             erc20_crt = await BaseEvmService.get_erc20_contract_obj(
                 token_asset.contractAddress, web3
             )
-            balance = erc20_crt.functions.balanceOf(
+            balance = await erc20_crt.functions.balanceOf(
                 Web3.to_bytes(hexstr=HexStr(address))
             ).call()
         else:
-            balance = web3.eth.get_balance(
+            balance = await web3.eth.get_balance(
                 EthAddress(Web3.to_bytes(hexstr=HexStr(address)))
             )
         return float(Web3.from_wei(int(balance), "ether"))
 
+    async def get_balances(
+        self,
+        address: str,
+        token_assets: list[TokenAsset],
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> dict[PyObjectId, float]:
+        """
+        get_balances: read native and erc20 balances of an address with a single
+        Multicall3 `aggregate3` eth_call per network, falling back to one call per
+        asset for networks without Multicall3
+        """
+        assets_by_network: dict[PyObjectId, list[TokenAsset]] = {}
+        for token_asset in token_assets:
+            chain_network = cast(Network, token_asset.network)
+            assets_by_network.setdefault(cast(PyObjectId, chain_network.id), []).append(
+                token_asset
+            )
+
+        balances: dict[PyObjectId, float] = {}
+        for network_assets in assets_by_network.values():
+            try:
+                balances.update(
+                    await self.get_network_balances(address, network_assets, semaphore)
+                )
+            except Exception as e:
+                logger.error(f"Error batching balance reads for {address} - {str(e)}")
+                balances.update(
+                    await super().get_balances(address, network_assets, semaphore)
+                )
+
+        return balances
+
+    async def get_network_balances(
+        self,
+        address: str,
+        token_assets: list[TokenAsset],
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> dict[PyObjectId, float]:
+        web3 = self.get_async_network_provider(cast(Network, token_assets[0].network))
+        multicall_crt = await BaseEvmService.get_multicall_contract_obj(web3)
+        erc20_crt = web3.eth.contract(abi=Utils.get_contract_abi("IERC20"))
+        owner = Web3.to_checksum_address(address)
+
+        calls = [
+            (
+                Web3.to_checksum_address(token_asset.contractAddress),
+                True,
+                erc20_crt.encodeABI(fn_name="balanceOf", args=[owner]),
+            )
+            if token_asset.contractAddress
+            else (
+                multicall_crt.address,
+                True,
+                multicall_crt.encodeABI(fn_name="getEthBalance", args=[owner]),
+            )
+            for token_asset in token_assets
+        ]
+        async with self.rpc_slot(semaphore):
+            results = await multicall_crt.functions.aggregate3(calls).call()
+
+        balances: dict[PyObjectId, float] = {}
+        failed_assets: list[TokenAsset] = []
+        for token_asset, (success, return_data) in zip(token_assets, results):
+            if not success or not return_data:
+                failed_assets.append(token_asset)
+                continue
+            (balance,) = web3.codec.decode(["uint256"], return_data)
+            balances[cast(PyObjectId, token_asset.id)] = float(
+                Web3.from_wei(int(balance), "ether")
+            )
+        if failed_assets:
+            balances.update(
+                await super().get_balances(address, failed_assets, semaphore)
+            )
+
+        return balances
+
     async def sign_txn(
         self,
         network: Network,
@@ -145,33 +262,49 @@ class BaseEvmService(IBlockchainService):
         txn_speed: TxnSpeedOption = TxnSpeedOption.STANDARD,
     ) -> str:
         # sign the transaction
-        web3 = self.get_network_provider(network)
+        web3 = self.get_async_network_provider(network)
         account = self.get_account_by_mmenonic(mnemonic)
-        nonce = web3.eth.get_transaction_count(account.address)
-        gas_fee_data = await self.networkFeeService.get_fee_value_by_speed(
-            txn_speed, blockchain.symbol
+        txn_build = {**txn_build, "from": account.address}
+        # estimated against the pending block so it sees this account's
+        # transactions that are sent but not mined yet
+        (
+            gas_fee_data,
+            max_priority_fee,
+            latest_block,
+            gas,
+            chain_id,
+        ) = await asyncio.gather(
+            self.networkFeeService.get_fee_value_by_speed(txn_speed, blockchain.symbol),
+            web3.eth.max_priority_fee,
+            web3.eth.get_block("latest"),
+            web3.eth.estimate_gas(txn_build, "pending"),
+            web3.eth.chain_id,
         )
-        txn_miner_tip = web3.eth.max_priority_fee + Web3.to_wei(12, "gwei")
-        block_base_fee_per_gas = web3.eth.get_block("latest").get("baseFeePerGas")
+        txn_miner_tip = max_priority_fee + Web3.to_wei(12, "gwei")
+        block_base_fee_per_gas = latest_block.get("baseFeePerGas")
         maxPFee = gas_fee_data.maxPriorityFeePerGas
         maxFee = gas_fee_data.maxFeePerGas
         assert maxPFee and maxFee, "evm gas fee not set"
-        txn_build = {
-            **txn_build,
-            "nonce": nonce,
-            "maxPriorityFeePerGas": Web3.to_wei(maxPFee, "gwei") or txn_miner_tip,
-            "gas": web3.eth.estimate_gas(txn_build),
-            "chainId": web3.eth.chain_id,
-            "maxFeePerGas": cast(
-                Wei, (Web3.to_wei(maxFee, "gwei") or block_base_fee_per_gas)
-            )
-            + txn_miner_tip,
-        }
+        async with self.nonceManager.reserve(
+            web3, chain_id, account.address
+        ) as reservation:
+            txn_build = {
+                **txn_build,
+                "nonce": reservation.nonce,
+                "maxPriorityFeePerGas": Web3.to_wei(maxPFee, "gwei") or txn_miner_tip,
+                "gas": gas,
+                "chainId": chain_id,
+                "maxFeePerGas": cast(
+                    Wei, (Web3.to_wei(maxFee, "gwei") or block_base_fee_per_gas)
+                )
+                + txn_miner_tip,
+            }
 
-        signed_tx = account.sign_transaction(txn_build)
+            signed_tx = account.sign_transaction(txn_build)
 
-        # send transaction
-        tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            # send transaction
+            reservation.sent = True
+            tx_hash = await web3.eth.send_raw_transaction(signed_tx.rawTransaction)
 
         return str(Web3.to_hex(tx_hash))
 
@@ -184,12 +317,17 @@ class BaseEvmService(IBlockchainService):
         token_address: str,
         spender_address: str,
     ) -> str:
-        web3 = self.get_network_provider(network)
+        web3 = self.get_async_network_provider(network)
         erc20_crt = await BaseEvmService.get_erc20_contract_obj(token_address, web3)
 
-        approve_txn_build = erc20_crt.functions.approve(
-            Web3.to_bytes(hexstr=HexStr(spender_address)), Web3.to_wei(amount, "ether")
-        ).build_transaction()
+        approve_txn_build = self.build_contract_txn(
+            erc20_crt,
+            "approve",
+            [
+                Web3.to_bytes(hexstr=HexStr(spender_address)),
+                Web3.to_wei(amount, "ether"),
+            ],
+        )
 
         txn_hash = await self.sign_txn(network, blockchain, mnemonic, approve_txn_build)
 
@@ -206,14 +344,19 @@ class BaseEvmService(IBlockchainService):
         assert chain_network.apiExplorer, "network apiexplorer not found"
         end_block = 999999999999999
 
-        res = await self.httpRepository.call(
-            REQUEST_METHOD.GET,
-            f"{chain_network.apiExplorer.url}?module=account&action=txlist&"
-            f"address={address}&startblock={start_block}&endblock={end_block}"
-            f"&page=1&offset=10000&sort=asc&apikey={chain_network.apiExplorer.keyToken}",
-            EtherscanBaseResponse[list[IEtherscanNormalTxns]],
-        )
-        txns_result = res.result
+        # up to 10000 transactions, parsed as they are received
+        txns_result = [
+            txn
+            async for txn in self.httpRepository.stream(
+                REQUEST_METHOD.GET,
+                f"{chain_network.apiExplorer.url}?module=account&action=txlist&"
+                f"address={address}&startblock={start_block}&endblock={end_block}"
+                f"&page=1&offset=10000&sort=asc"
+                f"&apikey={chain_network.apiExplorer.keyToken}",
+                IEtherscanNormalTxns,
+                "result.item",
+            )
+        ]
         txn_obj = []
 
         async def format_txns(txn: IEtherscanNormalTxns) -> None:
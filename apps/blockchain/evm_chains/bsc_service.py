@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 from web3 import Web3
 
@@ -21,26 +22,33 @@ class BscService(BaseEvmService):
         txn_speed: TxnSpeedOption = TxnSpeedOption.STANDARD,
     ) -> str:
         # sign the transaction
-        web3 = self.get_network_provider(network)
+        web3 = self.get_async_network_provider(network)
         account = self.get_account_by_mmenonic(mnemonic)
-        nonce = web3.eth.get_transaction_count(account.address)
-        gas_fee_data = await self.networkFeeService.get_fee_value_by_speed(
-            txn_speed, blockchain.symbol
+        txn_build = {**txn_build, "from": account.address}
+        gas_fee_data, max_priority_fee, gas, chain_id = await asyncio.gather(
+            self.networkFeeService.get_fee_value_by_speed(txn_speed, blockchain.symbol),
+            web3.eth.max_priority_fee,
+            web3.eth.estimate_gas(txn_build, "pending"),
+            web3.eth.chain_id,
         )
-        txn_miner_tip = web3.eth.max_priority_fee + Web3.to_wei(10, "gwei")
+        txn_miner_tip = max_priority_fee + Web3.to_wei(10, "gwei")
         maxPFee = gas_fee_data.gasPrice
         assert maxPFee, "bsc gas fee not set"
-        txn_build = {
-            **txn_build,
-            "nonce": nonce,
-            "gasPrice": Web3.to_wei(maxPFee, "gwei") or txn_miner_tip,
-            "gas": web3.eth.estimate_gas(txn_build),
-            "chainId": web3.eth.chain_id,
-        }
-
-        signed_tx = account.sign_transaction(txn_build)
-
-        # send transaction
-        tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        async with self.nonceManager.reserve(
+            web3, chain_id, account.address
+        ) as reservation:
+            txn_build = {
+                **txn_build,
+                "nonce": reservation.nonce,
+                "gasPrice": Web3.to_wei(maxPFee, "gwei") or txn_miner_tip,
+                "gas": gas,
+                "chainId": chain_id,
+            }
+
+            signed_tx = account.sign_transaction(txn_build)
+
+            # send transaction
+            reservation.sent = True
+            tx_hash = await web3.eth.send_raw_transaction(signed_tx.rawTransaction)
 
         return str(Web3.to_hex(tx_hash))
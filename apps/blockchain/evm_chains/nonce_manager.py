@@ -0,0 +1,119 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from web3 import AsyncWeb3
+
+from core.config import settings
+from core.utils.loggly import logger
+
+
+@dataclass
+class AccountNonce:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    nextNonce: int = 0
+    released: set[int] = field(default_factory=set)
+    reserved: int = 0
+    stale: bool = False
+    syncedAt: float = 0.0
+    allocatedAt: float = 0.0
+
+
+@dataclass
+class NonceReservation:
+    nonce: int
+    # set right before the signed transaction is sent, the node may have
+    # accepted it from then on even when the send fails
+    sent: bool = False
+
+
+class NonceManager:
+    """
+    NonceManager: hands out nonces per (chain, address) from memory so
+    back-to-back transactions of an account can be sent without waiting for
+    each other to be mined
+
+    the node's pending transaction count is re-read every
+    `NONCE_RESYNC_INTERVAL` seconds. it raises the local nonce when something
+    else sent from the account, and lowers it once the account has been idle
+    if transactions were dropped, so their nonces get reused
+
+    the counter lives in this process, so only one process may sign for an
+    account: two workers allocate the same nonces between resyncs and replace
+    each other's transactions. run the signing app with a single worker
+    """
+
+    def __init__(self) -> None:
+        self.accounts: dict[tuple[int, str], AccountNonce] = {}
+
+    async def sync(
+        self, web3: AsyncWeb3, address: str, account_nonce: AccountNonce
+    ) -> None:
+        pending = await web3.eth.get_transaction_count(
+            web3.to_checksum_address(address), "pending"
+        )
+        now = time.monotonic()
+        idle = account_nonce.allocatedAt + settings.NONCE_RESYNC_INTERVAL < now
+        # nonces reserved and not yet sent are missing from the node's count,
+        # lowering to it would hand them out twice
+        reset = (idle or account_nonce.stale) and not account_nonce.reserved
+        if pending > account_nonce.nextNonce or reset:
+            if pending < account_nonce.nextNonce:
+                logger.info(
+                    f"resetting nonce of {address} from {account_nonce.nextNonce} "
+                    f"to {pending}, pending transactions were dropped"
+                )
+            account_nonce.nextNonce = pending
+            account_nonce.released = set()
+        if reset:
+            account_nonce.stale = False
+        account_nonce.syncedAt = now
+
+    def get_account_nonce(self, chain_id: int, address: str) -> AccountNonce:
+        return self.accounts.setdefault((chain_id, address.lower()), AccountNonce())
+
+    @asynccontextmanager
+    async def reserve(
+        self, web3: AsyncWeb3, chain_id: int, address: str
+    ) -> AsyncIterator[NonceReservation]:
+        """
+        reserve: allocate the next nonce of an address for the transaction built,
+        signed and sent in the block
+
+        the nonce is handed back when the block fails before `sent` is set. a
+        failed send may still have reached the node, e.g. a timeout or an
+        `already known` answer, so its nonce is kept and the account is resynced
+        with the node before the next allocation instead
+        """
+        account_nonce = self.get_account_nonce(chain_id, address)
+        async with account_nonce.lock:
+            if (
+                account_nonce.stale
+                or account_nonce.syncedAt + settings.NONCE_RESYNC_INTERVAL
+                < time.monotonic()
+            ):
+                await self.sync(web3, address, account_nonce)
+            if account_nonce.released:
+                nonce = min(account_nonce.released)
+                account_nonce.released.remove(nonce)
+            else:
+                nonce = account_nonce.nextNonce
+                account_nonce.nextNonce += 1
+            account_nonce.reserved += 1
+            account_nonce.allocatedAt = time.monotonic()
+
+        reservation = NonceReservation(nonce)
+        try:
+            yield reservation
+        except Exception:
+            if reservation.sent:
+                account_nonce.stale = True
+            elif nonce == account_nonce.nextNonce - 1:
+                account_nonce.nextNonce -= 1
+            else:
+                account_nonce.released.add(nonce)
+            raise
+        finally:
+            account_nonce.reserved -= 1
@@ -0,0 +1,234 @@
+import asyncio
+import threading
+import time
+from typing import Any, ClassVar
+from urllib.parse import urlparse
+
+from aiohttp import ClientError
+from requests import RequestException, Session
+from requests.adapters import HTTPAdapter
+from web3 import AsyncHTTPProvider, AsyncWeb3, HTTPProvider, Web3
+from web3.middleware.geth_poa import async_geth_poa_middleware, geth_poa_middleware
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.providers.base import JSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from apps.blockchain.interfaces.network_interface import Network
+from core.config import settings
+from core.utils.loggly import logger
+
+
+class RPCNode:
+    """
+    RPCNode: a single rpc url of a network with its keep-alive http session and
+    request metrics
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=settings.WEB3_PROVIDER_POOL_SIZE
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        self.provider = HTTPProvider(
+            url,
+            session=session,
+            request_kwargs={"timeout": settings.WEB3_PROVIDER_TIMEOUT},
+        )
+        self.asyncProvider = AsyncHTTPProvider(
+            url, request_kwargs={"timeout": settings.WEB3_PROVIDER_TIMEOUT}
+        )
+        self.requests = 0
+        self.failures = 0
+        self.latency = 0.0
+        self.unhealthyUntil = 0.0
+
+    def is_healthy(self) -> bool:
+        return self.unhealthyUntil <= time.monotonic()
+
+    def record_success(self, latency: float) -> None:
+        self.requests += 1
+        # exponentially weighted so the latency follows the node's recent state
+        self.latency = (
+            latency if self.requests == 1 else 0.8 * self.latency + 0.2 * latency
+        )
+        self.unhealthyUntil = 0.0
+
+    def record_failure(self) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.unhealthyUntil = time.monotonic() + settings.WEB3_PROVIDER_COOLDOWN
+
+    def check_health(self) -> bool:
+        started = time.perf_counter()
+        if self.provider.is_connected():
+            self.record_success(time.perf_counter() - started)
+            return True
+
+        self.record_failure()
+        return False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            # the path of rpc urls usually carries the api key
+            "host": urlparse(self.url).netloc,
+            "healthy": self.is_healthy(),
+            "requests": self.requests,
+            "failures": self.failures,
+            "latencyMs": round(self.latency * 1000, 2),
+        }
+
+
+class FailoverHTTPProvider(JSONBaseProvider):
+    """
+    FailoverHTTPProvider: sends each request to the healthy rpc node of a network,
+    falling over to the next node when one cannot be reached
+    """
+
+    def __init__(self, urls: list[str]) -> None:
+        super().__init__()
+        self.nodes = [RPCNode(url) for url in urls]
+
+    def get_candidates(self) -> list[RPCNode]:
+        # healthy nodes in configured order first, cooling down nodes as last resort
+        return sorted(self.nodes, key=lambda node: not node.is_healthy())
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        error: Exception | None = None
+        for node in self.get_candidates():
+            started = time.perf_counter()
+            try:
+                response = node.provider.make_request(method, params)
+            except RequestException as e:
+                logger.error(
+                    f"rpc node {urlparse(node.url).netloc} failed {method} - {str(e)}"
+                )
+                node.record_failure()
+                error = e
+                continue
+            node.record_success(time.perf_counter() - started)
+
+            return response
+
+        raise Exception(f"no rpc node available for {method} - {str(error)}")
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return any(node.check_health() for node in self.nodes)
+
+
+class AsyncFailoverHTTPProvider(AsyncJSONBaseProvider):
+    """
+    AsyncFailoverHTTPProvider: AsyncWeb3 counterpart of FailoverHTTPProvider,
+    sharing its nodes so both record into the same metrics
+    """
+
+    def __init__(self, nodes: list[RPCNode]) -> None:
+        super().__init__()
+        self.nodes = nodes
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        error: Exception | None = None
+        for node in sorted(self.nodes, key=lambda node: not node.is_healthy()):
+            started = time.perf_counter()
+            try:
+                response = await node.asyncProvider.make_request(method, params)
+            except (ClientError, asyncio.TimeoutError) as e:
+                logger.error(
+                    f"rpc node {urlparse(node.url).netloc} failed {method} - {str(e)}"
+                )
+                node.record_failure()
+                error = e
+                continue
+            node.record_success(time.perf_counter() - started)
+
+            return response
+
+        raise Exception(f"no rpc node available for {method} - {str(error)}")
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        for node in self.nodes:
+            if await node.asyncProvider.is_connected():
+                return True
+
+        return False
+
+
+class Web3ProviderPool:
+    """
+    Web3ProviderPool: one Web3 instance per network, shared by every evm and defi
+    service so rpc connections are reused across requests
+    """
+
+    providers: ClassVar[dict[str, Web3]] = {}
+    asyncProviders: ClassVar[dict[str, AsyncWeb3]] = {}
+    networkNames: ClassVar[dict[str, str]] = {}
+    lock = threading.Lock()
+
+    @staticmethod
+    def get_provider_urls(network: Network) -> list[str]:
+        urls = [network.providerUrl] if network.providerUrl else []
+        urls += [url for url in network.fallbackProviderUrls or [] if url not in urls]
+        if not urls:
+            raise Exception(f"no rpc provider set for {network.name}")
+
+        return urls
+
+    @staticmethod
+    def get_key(network: Network) -> str:
+        return f"{network.id}:{','.join(Web3ProviderPool.get_provider_urls(network))}"
+
+    @classmethod
+    def get_provider(cls, network: Network) -> Web3:
+        key = cls.get_key(network)
+        if key in cls.providers:
+            return cls.providers[key]
+
+        with cls.lock:
+            if key not in cls.providers:
+                logger.info(f"creating rpc provider pool for {network.name}")
+                web3 = Web3(FailoverHTTPProvider(cls.get_provider_urls(network)))
+                web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+                cls.providers[key] = web3
+                cls.networkNames[key] = network.name
+
+        return cls.providers[key]
+
+    @classmethod
+    def get_async_provider(cls, network: Network) -> AsyncWeb3:
+        key = cls.get_key(network)
+        if key not in cls.asyncProviders:
+            nodes = cls.get_nodes(cls.get_provider(network))
+            async_web3 = AsyncWeb3(AsyncFailoverHTTPProvider(nodes))
+            # the validation middleware asks the node for its chain id before
+            # every eth_call, estimate and send to check the transaction's
+            # chainId. sign_txn sets chainId from that same node, so it only
+            # doubles the rpc calls. the other defaults are kept
+            async_web3.middleware_onion.remove("validation")
+            async_web3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+            cls.asyncProviders[key] = async_web3
+
+        return cls.asyncProviders[key]
+
+    @classmethod
+    def check_health(cls) -> None:
+        for web3 in list(cls.providers.values()):
+            for node in cls.get_nodes(web3):
+                if not node.check_health():
+                    logger.error(
+                        f"rpc node {urlparse(node.url).netloc} failed its health check"
+                    )
+
+    @staticmethod
+    def get_nodes(web3: Web3) -> list[RPCNode]:
+        return getattr(web3.provider, "nodes", [])
+
+    @classmethod
+    def get_stats(cls) -> dict[str, list[dict[str, Any]]]:
+        return {
+            f"{cls.networkNames[key]} ({key.split(':')[0]})": [
+                node.stats() for node in cls.get_nodes(web3)
+            ]
+            for key, web3 in cls.providers.items()
+        }
@@ -1,5 +1,7 @@
 import abc
-from typing import Any
+import asyncio
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Any, cast
 
 from apps.blockchain.interfaces.blockchain_interface import Blockchain, ChainServiceName
 from apps.blockchain.interfaces.network_interface import Network
@@ -7,6 +9,9 @@ from apps.blockchain.interfaces.tokenasset_interface import TokenAsset
 from apps.user.interfaces.user_interface import User
 from apps.wallet.interfaces.wallet_interface import Wallet
 from apps.wallet.interfaces.walletasset_interface import Address
+from core.depends.get_object_id import PyObjectId
+from core.utils.loggly import logger
+from core.utils.utils_service import Utils
 
 
 class IBlockchainService(metaclass=abc.ABCMeta):
@@ -26,6 +31,14 @@ class IBlockchainService(metaclass=abc.ABCMeta):
     async def create_address(self, mnemonic: str) -> Address:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def derive_address(self, seed: bytes) -> Address:
+        """
+        derive_address: address of a wallet from its BIP-39 seed, synchronous and
+        picklable so it can run in a worker process
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def send(
         self,
@@ -41,6 +54,49 @@ class IBlockchainService(metaclass=abc.ABCMeta):
     async def get_balance(self, address: str, token_asset: TokenAsset) -> float:
         raise NotImplementedError
 
+    @staticmethod
+    def rpc_slot(
+        semaphore: asyncio.Semaphore | None,
+    ) -> AbstractAsyncContextManager[Any]:
+        """rpc_slot: hold a slot of the chain's semaphore for a single rpc"""
+        if semaphore:
+            return semaphore
+        return nullcontext()
+
+    async def get_balances(
+        self,
+        address: str,
+        token_assets: list[TokenAsset],
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> dict[PyObjectId, float]:
+        """
+        get_balances: balances of many token assets held by one address, keyed by
+        token asset id. assets whose balance could not be read are left out
+
+        chains that can batch reads override this, the default reads every asset
+        concurrently. when a semaphore is given every balance rpc holds a slot of it
+        """
+
+        async def get_asset_balance(
+            token_asset: TokenAsset,
+        ) -> tuple[PyObjectId, float] | None:
+            try:
+                async with self.rpc_slot(semaphore):
+                    balance = await self.get_balance(address, token_asset)
+                return cast(PyObjectId, token_asset.id), balance
+            except Exception as e:
+                logger.error(
+                    f"Error getting balance of {token_asset.symbol} for {address} - "
+                    f"{str(e)}"
+                )
+                return None
+
+        balances = await Utils.promise_all(
+            [get_asset_balance(token_asset) for token_asset in token_assets]
+        )
+
+        return dict(balance for balance in balances if balance)
+
     @abc.abstractmethod
     async def get_transactions(
         self,
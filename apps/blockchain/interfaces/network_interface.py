@@ -30,3 +30,4 @@ class Network(NetworkOut, SBaseModel):
     isDefault: bool
     faucetUrl: Optional[str] = None
     providerUrl: Optional[str] = None
+    fallbackProviderUrls: Optional[list[str]] = None
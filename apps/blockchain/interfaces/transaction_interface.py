@@ -3,7 +3,7 @@ from enum import Enum
 from typing import Any, Optional, Union
 
 from pydantic import Field
-from pymongo import ASCENDING
+from pymongo import ASCENDING, DESCENDING
 
 from apps.blockchain.interfaces.network_interface import Network
 from apps.blockchain.interfaces.tokenasset_interface import TokenAsset, TokenAssetOut
@@ -62,3 +62,12 @@ class BlockchainTransaction(BlockchainTransactionOut, SBaseModel):
         db.blockchaintransaction.create_index(
             [("transactionHash", ASCENDING), ("user", ASCENDING)], unique=True
         )
+        # keyset pagination of user transactions
+        db.blockchaintransaction.create_index(
+            [
+                ("user", ASCENDING),
+                ("wallet", ASCENDING),
+                ("transactedAt", DESCENDING),
+                ("_id", DESCENDING),
+            ]
+        )
@@ -1,8 +1,12 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, cast
 
+from mnemonic import Mnemonic
 from pymongo import DESCENDING
-from starlette.background import BackgroundTask
 
+from apps.blockchain.evm_chains.base_eth_service import BaseEvmService
 from apps.blockchain.interfaces.blockchain_interface import Blockchain, ChainServiceName
 from apps.blockchain.interfaces.network_interface import Network, NetworkType
 from apps.blockchain.interfaces.tokenasset_interface import TokenAsset
@@ -26,26 +30,55 @@ from apps.blockchain.types.blockchain_type import (
     SwapTokenDTO,
     ReceipientType,
 )
-from core.db import db
+from core.config import settings
+from core.db import CursorModel
+from core.utils.key_cache import derivedKeyCache
 from core.utils.loggly import logger
-from core.utils.model_utility_service import ModelUtilityService
+from core.utils.model_utility_service import CountMode, ModelUtilityService
+from core.utils.reference_cache import ReferenceCache
 from core.utils.request import HTTPRepository
 from core.utils.response_service import MetaDataModel
 from core.depends.get_object_id import PyObjectId
 from core.utils.utils_service import NotFoundInRecordException, Utils
 
 
+def derive_chain_address(registry_name: ChainServiceName, seed: bytes) -> Address:
+    """derive_chain_address: address derivation entrypoint of the worker processes"""
+    return BlockchainService.blockchainRegistry.get_service(
+        registry_name
+    ).derive_address(seed)
+
+
 class BlockchainService:
     blockchainRegistry = BlockchainRegistry()
     httpRepository = HTTPRepository()
     slackService = SlackService()
+    blockchainCache = ReferenceCache[list[Blockchain]]("blockchain", ["blockchain"])
+    networkCache = ReferenceCache[Network]("network", ["network"])
+    tokenAssetCache = ReferenceCache[list[TokenAsset]](
+        "tokenasset", ["tokenasset", "network"]
+    )
+    balanceSemaphores: dict[str, asyncio.Semaphore] = {}
+    derivationPool: ProcessPoolExecutor | None = None
+
+    @staticmethod
+    def get_balance_semaphore(registry_name: str) -> asyncio.Semaphore:
+        """bound the balance calls in flight against a single chain's rpc"""
+        if registry_name not in BlockchainService.balanceSemaphores:
+            BlockchainService.balanceSemaphores[registry_name] = asyncio.Semaphore(
+                settings.BALANCE_REFRESH_CONCURRENCY
+            )
+
+        return BlockchainService.balanceSemaphores[registry_name]
 
     @staticmethod
     async def get_blockchains(query: dict[str, Any]) -> list[Blockchain]:
         logger.info("retrieving blockchains")
-        blockchains = await ModelUtilityService.find(Blockchain, query)
+        blockchains = await BlockchainService.blockchainCache.get(
+            query, lambda: ModelUtilityService.find(Blockchain, query)
+        )
 
-        return blockchains
+        return blockchains or []
 
     @staticmethod
     async def get_blockchain_by_query(query: dict[str, Any]) -> Blockchain:
@@ -59,7 +92,9 @@ class BlockchainService:
     @staticmethod
     async def get_network_by_query(query: dict[str, Any]) -> Network:
         logger.info("retrieving network chain")
-        chain_network = await ModelUtilityService.find_one(Network, query)
+        chain_network = await BlockchainService.networkCache.get(
+            query, lambda: ModelUtilityService.find_one(Network, query)
+        )
         if not chain_network:
             raise Exception("network chain not found")
 
@@ -74,15 +109,51 @@ class BlockchainService:
 
         return chain_networks
 
-    # @timed_cache(10, 10)
     @staticmethod
     async def get_token_assets(query: dict[str, Any]) -> list[TokenAsset]:
         logger.info(f"retrieving token assets for query - {query}")
-        token_assets = await ModelUtilityService.find_and_populate(
-            TokenAsset, query, ["network"]
+        token_assets = await BlockchainService.tokenAssetCache.get(
+            query,
+            lambda: ModelUtilityService.find_and_populate(
+                TokenAsset, query, ["network"]
+            ),
         )
 
-        return token_assets
+        return token_assets or []
+
+    @staticmethod
+    async def load_web3_providers() -> None:
+        """create the pooled web3 providers of every evm network ahead of use"""
+        blockchains = await BlockchainService.get_blockchains(
+            {"isDeleted": {"$ne": True}}
+        )
+        for chain in blockchains:
+            chain_service = BlockchainService.blockchainRegistry.registry.get(
+                chain.registryName
+            )
+            if not isinstance(chain_service, BaseEvmService):
+                continue
+            networks = await ModelUtilityService.find(
+                Network, {"blockchain": chain.id, "isDeleted": False}
+            )
+            for network in networks:
+                chain_service.get_network_provider(network)
+                chain_service.get_async_network_provider(network)
+
+    @staticmethod
+    async def load_reference_data() -> None:
+        """warm the reference data caches with the queries of the hot paths"""
+        blockchains = await BlockchainService.get_blockchains(
+            {"isDeleted": {"$ne": True}}
+        )
+        await Utils.promise_all(
+            [
+                BlockchainService.get_token_assets(
+                    {"isDeleted": False, "blockchain": chain.id, "isLayerOne": True}
+                )
+                for chain in blockchains
+            ]
+        )
 
     @staticmethod
     def get_address(address: Address, network: Network) -> str:
@@ -94,11 +165,11 @@ class BlockchainService:
     async def get_last_block_txn_by_query(
         query: dict[str, Any]
     ) -> BlockchainTransaction | None:
-        txn_rec = db.blockchaintransaction.find_one(
-            query, sort=[("blockNumber", DESCENDING)]
+        txn_rec = await ModelUtilityService.find_one(
+            BlockchainTransaction, query, [("blockNumber", DESCENDING)]
         )
 
-        return BlockchainTransaction(**txn_rec) if txn_rec else None
+        return txn_rec
 
     @staticmethod
     async def get_token_asset_by_query(query: dict[str, Any]) -> TokenAsset:
@@ -115,6 +186,52 @@ class BlockchainService:
             blockchain_provider
         ).create_address(mnemonic)
 
+    @staticmethod
+    def get_derivation_pool() -> ProcessPoolExecutor | None:
+        if settings.ADDRESS_DERIVATION_WORKERS <= 0:
+            return None
+        if not BlockchainService.derivationPool:
+            # spawned rather than forked, the pool is created once the app runs
+            # threads (threadpool, change stream, boto3) and a forked worker can
+            # inherit a lock one of them held
+            BlockchainService.derivationPool = ProcessPoolExecutor(
+                max_workers=settings.ADDRESS_DERIVATION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return BlockchainService.derivationPool
+
+    @staticmethod
+    def shutdown_derivation_pool() -> None:
+        if BlockchainService.derivationPool:
+            BlockchainService.derivationPool.shutdown(cancel_futures=True)
+            BlockchainService.derivationPool = None
+
+    async def derive_addresses(
+        self, blockchain_providers: list[ChainServiceName], mnemonic: str
+    ) -> dict[ChainServiceName, Address]:
+        """
+        derive_addresses: addresses of a mnemonic on many chains, the BIP-39 seed is
+        stretched once and every chain derives from it in the worker processes
+        """
+        loop = asyncio.get_event_loop()
+        seed = await loop.run_in_executor(
+            None,
+            derivedKeyCache.get,
+            "bip39",
+            mnemonic,
+            lambda: Mnemonic("english").to_seed(mnemonic),
+        )
+        pool = BlockchainService.get_derivation_pool()
+        addresses = await asyncio.gather(
+            *[
+                loop.run_in_executor(pool, derive_chain_address, provider, seed)
+                for provider in blockchain_providers
+            ]
+        )
+
+        return dict(zip(blockchain_providers, addresses))
+
     async def get_user_wallet_data(
         self,
         wallet_asset: PyObjectId,
@@ -249,38 +366,95 @@ class BlockchainService:
             WalletAsset,
             {"wallet": wallet.id, "isDeleted": False, "blockchain": blockchain.id},
         )
+        if not user_assets:
+            return
+
+        token_assets = await ModelUtilityService.find_and_populate(
+            TokenAsset,
+            {
+                "_id": {"$in": [user_asset.tokenasset for user_asset in user_assets]},
+                "isDeleted": False,
+            },
+            ["network"],
+        )
+        token_assets_by_id = {
+            token_asset.id: token_asset for token_asset in token_assets
+        }
+        chain_service = self.blockchainRegistry.get_service(blockchain.registryName)
+        semaphore = BlockchainService.get_balance_semaphore(blockchain.registryName)
+
+        # assets whose tokenasset was deleted or never loaded have no balance to
+        # read, they are skipped rather than reported on every refresh
+        assets_by_address: dict[str, list[WalletAsset]] = {}
         for user_asset in user_assets:
-            try:
-                token_asset = await ModelUtilityService.find_one_and_populate(
-                    TokenAsset,
-                    {"_id": user_asset.tokenasset, "isDeleted": False},
-                    [
-                        "network",
-                    ],
-                )
-                if not token_asset:
-                    raise Exception("token asset not found")
-                asset_balance = await self.blockchainRegistry.get_service(
-                    blockchain.registryName
-                ).get_balance(
-                    user_asset.address,
-                    token_asset,
-                )
+            if cast(PyObjectId, user_asset.tokenasset) not in token_assets_by_id:
+                continue
+            assets_by_address.setdefault(user_asset.address, []).append(user_asset)
+        failed_tokenassets: list[PyObjectId] = []
+
+        async def get_address_balances(
+            address: str, address_assets: list[WalletAsset]
+        ) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+            balances = await chain_service.get_balances(
+                address,
+                [
+                    token_assets_by_id[cast(PyObjectId, user_asset.tokenasset)]
+                    for user_asset in address_assets
+                ],
+                semaphore,
+            )
 
-                await ModelUtilityService.model_find_one_and_update(
-                    WalletAsset,
-                    {"_id": user_asset.id},
-                    {"balance": asset_balance},
-                )
-            except Exception as e:
-                BackgroundTask(
-                    self.slackService.send_formatted_message,
-                    "Error updating wallet asset balance for user",
-                    f"*user:* `{wallet.user}` \n *tokenasset:* `{user_asset.tokenasset}`"
-                    f"\n *error:* `{e}`",
-                    "backend",
+            updates = []
+            for user_asset in address_assets:
+                tokenasset_id = cast(PyObjectId, user_asset.tokenasset)
+                if tokenasset_id not in balances:
+                    failed_tokenassets.append(tokenasset_id)
+                    continue
+                updates.append(
+                    ({"_id": user_asset.id}, {"balance": balances[tokenasset_id]})
                 )
 
+            return updates
+
+        address_updates = await Utils.promise_all(
+            [
+                get_address_balances(address, address_assets)
+                for address, address_assets in assets_by_address.items()
+            ]
+        )
+        await ModelUtilityService.model_bulk_update(
+            WalletAsset, [update for updates in address_updates for update in updates]
+        )
+        if failed_tokenassets:
+            await self.slackService.send_formatted_message(
+                "Error updating wallet asset balance for user",
+                f"*user:* `{wallet.user}` \n *tokenassets:* `{failed_tokenassets}`"
+                "\n *error:* `balance not retrieved`",
+                "backend",
+            )
+
+    @staticmethod
+    async def push_walletasset_balance(event: CursorModel[WalletAsset]) -> None:
+        """push balance changes of a wallet asset to its owner's socket room"""
+        if (
+            not event.fullDocument
+            or not event.updateDescription
+            or "balance" not in event.updateDescription.updatedFields
+        ):
+            return
+
+        user_asset = event.fullDocument
+        await emit_socket_event_to_clients(
+            SocketEvent.ASSETBALANCE,
+            {
+                "walletasset": str(user_asset.id),
+                "tokenasset": str(user_asset.tokenasset),
+                "wallet": str(user_asset.wallet),
+                "balance": user_asset.balance,
+            },
+            str(user_asset.user),
+        )
+
     async def update_user_txns(
         self, user: User, user_default_wallet: Wallet, network: Network
     ) -> Any:
@@ -326,8 +500,7 @@ class BlockchainService:
 
             return default_wallet_txns
         except Exception as e:
-            BackgroundTask(
-                self.slackService.send_formatted_message,
+            await self.slackService.send_formatted_message(
                 "Error updating network txns for user",
                 f"*user:* `{user.id}` \n *network:* `{network.name}` \n *error:* `{e}`",
                 "backend",
@@ -338,6 +511,7 @@ class BlockchainService:
         user: User,
         page_num: int,
         page_size: int,
+        after: str | None = None,
     ) -> tuple[list[BlockchainTransaction], MetaDataModel]:
         user_default_wallet = await ModelUtilityService.find_one(
             Wallet, {"user": user.id, "isDeleted": False, "isDefault": True}
@@ -361,11 +535,6 @@ class BlockchainService:
             ]
         )
 
-        await emit_socket_event_to_clients(
-            SocketEvent.ASSETBALANCE,
-            SocketEvent.ASSETBALANCE.value,
-            str(user.id),
-        )
         res, meta = await ModelUtilityService.populate_and_paginate_data(
             BlockchainTransaction,
             {
@@ -380,6 +549,9 @@ class BlockchainService:
             page_num,
             page_size,
             "transactedAt",
+            keyset=True,
+            after=after,
+            count_mode=CountMode.CACHED,
         )
 
         return res, meta
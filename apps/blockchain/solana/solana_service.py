@@ -30,6 +30,7 @@ from apps.user.interfaces.user_interface import User
 from apps.wallet.interfaces.wallet_interface import Wallet
 from apps.wallet.interfaces.walletasset_interface import Address
 from core.depends.get_object_id import PyObjectId
+from core.utils.key_cache import derivedKeyCache
 from core.utils.model_utility_service import ModelUtilityService
 from core.utils.request import REQUEST_METHOD, HTTPRepository
 from core.utils.utils_service import Utils
@@ -57,8 +58,14 @@ class SolanaService(IBlockchainService):
         address = str(keypair.public_key)
         return Address(main=address, test=address)
 
+    def derive_address(self, seed: bytes) -> Address:
+        address = str(Keypair.from_secret_key(seed).public_key)
+        return Address(main=address, test=address)
+
     def get_keypair_from_mnemonic(self, mnemonic: str) -> Keypair:
-        seed = self.mnemo.to_seed(mnemonic)
+        seed = derivedKeyCache.get(
+            "bip39", mnemonic, lambda: self.mnemo.to_seed(mnemonic)
+        )
         keypair = Keypair.from_secret_key(seed)
         return keypair
 
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from typing import Any
+from unittest import TestCase
+from unittest.mock import patch
+
+from apps.blockchain.bitcoin.base_coin_service import BasecoinService
+
+
+def wallet(name: str, network: str = "bitcoin", **fields: Any) -> dict[str, Any]:
+    return {"name": name, "network": network, "scheme": "bip32", "owner": "", **fields}
+
+
+class TestCleanupOrphanedWallets(TestCase):
+    def test_only_legacy_wallets_deleted(self) -> None:
+        wallets = [
+            wallet("aB3x9"),
+            wallet("Zq7Lm", "testnet"),
+            wallet("a" * 64),
+            wallet("abc12\n"),
+            wallet("cold1", "bitcoin", owner="treasury"),
+            wallet("multi", "bitcoin", scheme="multisig"),
+            wallet("xyz12", "regtest"),
+        ]
+        with patch(
+            "apps.blockchain.bitcoin.base_coin_service.wallets_list",
+            return_value=wallets,
+        ), patch(
+            "apps.blockchain.bitcoin.base_coin_service.wallet_delete"
+        ) as wallet_delete:
+            assert BasecoinService.cleanup_orphaned_wallets() == 2
+
+        assert [call.args[0] for call in wallet_delete.call_args_list] == [
+            "aB3x9",
+            "Zq7Lm",
+        ]
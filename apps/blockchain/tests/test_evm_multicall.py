@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+from pathlib import Path
+from typing import Optional, cast
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from bson import ObjectId
+from eth_typing import ChecksumAddress
+from web3 import AsyncWeb3
+from web3.providers.eth_tester.main import AsyncEthereumTesterProvider
+
+from apps.blockchain.evm_chains.ethereum_service import EthereumService
+from apps.blockchain.interfaces.network_interface import Network, NetworkType
+from apps.blockchain.interfaces.tokenasset_interface import TokenAsset
+from core.depends.get_object_id import PyObjectId
+
+# runtime code of Multicall3 as deployed at 0xcA11bde05977b3631167028862bE2a173976CA11
+MULTICALL3_RUNTIME = bytes.fromhex(
+    Path(__file__).with_name("multicall3_runtime.hex").read_text().strip()[2:]
+)
+
+
+def deploy_code(runtime: bytes) -> bytes:
+    # copies the runtime code into memory and returns it as the contract code
+    return (
+        bytes([0x61])
+        + len(runtime).to_bytes(2, "big")
+        + bytes.fromhex("80600c6000396000f3")
+        + runtime
+    )
+
+
+def token_code(balance: int, revert_for: Optional[str] = None) -> bytes:
+    # answers every call with `balance`, reverts when called by `revert_for`
+    returns = (
+        bytes([0x7F]) + balance.to_bytes(32, "big") + bytes.fromhex("60005260206000f3")
+    )
+    if not revert_for:
+        return returns
+    return (
+        bytes([0x33, 0x73])
+        + bytes.fromhex(revert_for[2:])
+        + bytes.fromhex("14604357")
+        + returns
+        + bytes.fromhex("5b60006000fd")
+    )
+
+
+class TestEvmMulticall(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.web3 = AsyncWeb3(AsyncEthereumTesterProvider())
+        self.accounts: list[ChecksumAddress] = list(await self.web3.eth.accounts)
+        self.network = Network.model_construct(
+            id=cast(PyObjectId, ObjectId()),
+            name="eth-tester",
+            networkType=NetworkType.TESTNET,
+            blockchain=cast(PyObjectId, ObjectId()),
+            isDefault=True,
+        )
+        self.service = EthereumService()
+        patcher = patch.object(
+            self.service, "get_async_network_provider", lambda network: self.web3
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.multicall_address = await self.deploy(MULTICALL3_RUNTIME)
+
+    async def deploy(self, runtime: bytes) -> str:
+        txn_hash = await self.web3.eth.send_transaction(
+            {"from": self.accounts[0], "data": deploy_code(runtime)}
+        )
+        receipt = await self.web3.eth.wait_for_transaction_receipt(txn_hash)
+        return str(receipt["contractAddress"])
+
+    def token_asset(self, contract_address: Optional[str] = None) -> TokenAsset:
+        return TokenAsset.model_construct(
+            id=cast(PyObjectId, ObjectId()),
+            name="token",
+            network=self.network,
+            blockchain=self.network.blockchain,
+            contractAddress=contract_address,
+            symbol="tkn",
+        )
+
+    async def get_balances(
+        self, token_assets: list[TokenAsset], multicall_address: str
+    ) -> dict[PyObjectId, float]:
+        with patch(
+            "apps.blockchain.evm_chains.base_eth_service.MULTICALL3_ADDRESS",
+            multicall_address,
+        ):
+            return await self.service.get_balances(self.accounts[1], token_assets)
+
+    async def test_decodes_native_and_token_balances(self) -> None:
+        native = self.token_asset()
+        token = self.token_asset(await self.deploy(token_code(5 * 10**18)))
+        expected = float(
+            AsyncWeb3.from_wei(
+                await self.web3.eth.get_balance(self.accounts[1]), "ether"
+            )
+        )
+
+        balances = await self.get_balances([native, token], self.multicall_address)
+
+        assert balances == {native.id: expected, token.id: 5.0}
+
+    async def test_failed_calls_fall_back_to_direct_reads(self) -> None:
+        # reverts inside the multicall only, read directly on the fallback
+        reverting = self.token_asset(
+            await self.deploy(token_code(2 * 10**18, self.multicall_address))
+        )
+        # no contract, the call succeeds with no return data and is left out
+        missing = self.token_asset(self.accounts[2])
+        token = self.token_asset(await self.deploy(token_code(10**18)))
+
+        balances = await self.get_balances(
+            [reverting, missing, token], self.multicall_address
+        )
+
+        assert balances == {reverting.id: 2.0, token.id: 1.0}
+
+    async def test_network_without_multicall_reads_every_asset(self) -> None:
+        token = self.token_asset(await self.deploy(token_code(3 * 10**18)))
+
+        balances = await self.get_balances([token], self.accounts[3])
+
+        assert balances == {token.id: 3.0}
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+from typing import cast
+from unittest import IsolatedAsyncioTestCase
+
+from web3 import AsyncWeb3
+
+from apps.blockchain.evm_chains.nonce_manager import NonceManager
+
+ADDRESS = "0x7E5F4552091A69125d5DfCb7b8C2659029395Bdf"
+
+
+class FakeNode:
+    def __init__(self, pending: int) -> None:
+        self.pending = pending
+        self.eth = SimpleNamespace(get_transaction_count=self.get_transaction_count)
+
+    @property
+    def web3(self) -> AsyncWeb3:
+        # the nonce manager only reads the pending transaction count
+        return cast(AsyncWeb3, self)
+
+    def to_checksum_address(self, address: str) -> str:
+        return address
+
+    async def get_transaction_count(self, address: str, block: str) -> int:
+        return self.pending
+
+
+class TestNonceManager(IsolatedAsyncioTestCase):
+    async def reserve(self, node: FakeNode, manager: NonceManager) -> int:
+        async with manager.reserve(node.web3, 1, ADDRESS) as reservation:
+            reservation.sent = True
+            return reservation.nonce
+
+    async def test_allocates_from_pending_count(self) -> None:
+        node, manager = FakeNode(5), NonceManager()
+        assert [await self.reserve(node, manager) for _ in range(3)] == [5, 6, 7]
+
+    async def test_failure_before_send_releases_nonce(self) -> None:
+        node, manager = FakeNode(0), NonceManager()
+        async with manager.reserve(node.web3, 1, ADDRESS) as first:
+            with self.assertRaises(ValueError):
+                async with manager.reserve(node.web3, 1, ADDRESS) as second:
+                    assert second.nonce == 1
+                    raise ValueError("estimate failed")
+            # a released nonce below the counter is kept as a gap and reused
+            with self.assertRaises(ValueError):
+                async with manager.reserve(node.web3, 1, ADDRESS) as third:
+                    assert third.nonce == 1
+                    async with manager.reserve(node.web3, 1, ADDRESS) as fourth:
+                        fourth.sent = True
+                    raise ValueError("sign failed")
+            first.sent = True
+
+        assert fourth.nonce == 2
+        assert await self.reserve(node, manager) == 1
+        assert await self.reserve(node, manager) == 3
+
+    async def test_failure_after_send_keeps_nonce_and_resyncs(self) -> None:
+        node, manager = FakeNode(0), NonceManager()
+        with self.assertRaises(TimeoutError):
+            async with manager.reserve(node.web3, 1, ADDRESS) as reservation:
+                reservation.sent = True
+                raise TimeoutError("send timed out")
+
+        # the node did get the transaction
+        node.pending = 1
+        assert await self.reserve(node, manager) == 1
+
+        node.pending = 2
+        with self.assertRaises(ValueError):
+            async with manager.reserve(node.web3, 1, ADDRESS) as reservation:
+                reservation.sent = True
+                raise ValueError("insufficient funds")
+
+        # the node did not, its nonce is reused after the resync
+        assert await self.reserve(node, manager) == 2
+
+    async def test_resync_does_not_lower_below_reserved_nonces(self) -> None:
+        node, manager = FakeNode(0), NonceManager()
+        async with manager.reserve(node.web3, 1, ADDRESS) as first:
+            with self.assertRaises(TimeoutError):
+                async with manager.reserve(node.web3, 1, ADDRESS) as second:
+                    second.sent = True
+                    raise TimeoutError("send timed out")
+            # the first transaction is not on the node yet
+            assert await self.reserve(node, manager) == 2
+            first.sent = True
+
+        assert first.nonce == 0
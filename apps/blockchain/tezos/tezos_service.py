@@ -21,6 +21,7 @@ from apps.user.interfaces.user_interface import User
 from apps.wallet.interfaces.wallet_interface import Wallet
 from apps.wallet.interfaces.walletasset_interface import Address
 from core.depends.get_object_id import PyObjectId
+from core.utils.key_cache import derivedKeyCache
 from core.utils.model_utility_service import ModelUtilityService
 from core.utils.request import REQUEST_METHOD, HTTPRepository
 from core.utils.response_service import ResponseModel
@@ -41,7 +42,12 @@ class TezosService(IBlockchainService, HTTPRepository):
 
     @staticmethod
     def get_key_from_mnemonic(mnemonic: str) -> Key:
-        key = Key.from_mnemonic(mnemonic)
+        # same derivation as Key.from_mnemonic, ed25519 key from the seed's
+        # first 32 bytes
+        seed = derivedKeyCache.get(
+            "bip39", mnemonic, lambda: TezosService.mnemo.to_seed(mnemonic)
+        )
+        key = Key.from_secret_exponent(seed[:32])
         return key
 
     async def create_address(self, mnemonic: str) -> Address:
@@ -50,6 +56,10 @@ class TezosService(IBlockchainService, HTTPRepository):
         address = key.public_key_hash()
         return Address(main=address, test=address)
 
+    def derive_address(self, seed: bytes) -> Address:
+        address = Key.from_secret_exponent(seed[:32]).public_key_hash()
+        return Address(main=address, test=address)
+
     async def send(
         self,
         from_address: str,
@@ -22,9 +22,10 @@ from apps.notification.slack.services.slack_service import SlackService
 from apps.wallet.services.wallet_service import WalletService
 from core.depends.get_object_id import PyObjectId
 from core.config import settings
+from core.utils.custom_exceptions import UnicornException
 from core.utils.model_utility_service import ModelUtilityService
 from core.utils.request import REQUEST_METHOD, HTTPRepository
-from core.utils.utils_service import timed_cache
+from core.utils.ttl_cache import ttl_cache
 
 
 class ICreateStream(BaseModel):
@@ -95,26 +96,28 @@ class MoralisService(IStreamService):
     walletService = WalletService()
     slackService = SlackService()
 
-    def __init__(self) -> None:
-        client_data = None
-        try:
-            client_data = self.appClientService.get_client_by_name(Apps.MoralisStream)
-        except Exception as e:
-            print(e)
-        self.base_url = client_data.appUrl if client_data else None
-        self.httpRepository = HTTPRepository(
-            self.base_url,
+    async def get_http_repository(self) -> HTTPRepository:
+        client_data = await self.appClientService.find_client_by_name(
+            Apps.MoralisStream
+        )
+        if not client_data:
+            raise UnicornException(
+                status_code=503, message="moralis app client not set up"
+            )
+
+        return HTTPRepository(
+            client_data.appUrl,
             {
                 "accept": "application/json",
                 "content-type": "application/json",
-                "x-api-key": client_data.clientSecret if client_data else None,
+                "x-api-key": client_data.clientSecret,
             },
         )
 
     def name(self) -> StreamProvider:
         return StreamProvider.MORALIS
 
-    @timed_cache(1000000, 10)
+    @ttl_cache(settings.REFERENCE_CACHE_TTL, 1)
     async def get_supported_chain_ids(self) -> list[str]:
         blockchains = await self.blockchainService.get_blockchains(
             {
@@ -141,7 +144,7 @@ class MoralisService(IStreamService):
 
     async def create_address_stream(self, address: str) -> ICreateStream | None:
         try:
-            chain_ids = self.get_supported_chain_ids()
+            chain_ids = await self.get_supported_chain_ids()
             user_walletasset = await self.walletService.get_walletasset_by_query(
                 {
                     "address": address,
@@ -156,7 +159,8 @@ class MoralisService(IStreamService):
                 "chainIds": chain_ids,
                 "type": "wallet",
             }
-            stream_res = await self.httpRepository.call(
+            http_repository = await self.get_http_repository()
+            stream_res = await http_repository.call(
                 REQUEST_METHOD.POST, "/streams/evm", ICreateStream, payload
             )
             BackgroundTask(
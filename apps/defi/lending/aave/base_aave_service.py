@@ -1,7 +1,7 @@
 from typing import Any, cast
 
-from eth_typing import Address, HexStr
-from web3 import Web3
+from eth_typing import HexStr
+from web3 import AsyncWeb3, Web3
 from web3.contract.async_contract import AsyncContract
 
 from apps.blockchain.evm_chains.ethereum_service import EthereumService
@@ -11,7 +11,8 @@ from apps.defi.interfaces.defiprovider_interface import DefiProvider
 from apps.defi.lending.types.lending_types import IReserveToken, IUserAcccountData
 from apps.defi.lending.interfaces.lending_request_interface import InterestRateMode
 from apps.defi.lending.services.lending_iservice import ILendingService
-from core.utils.utils_service import Utils, timed_cache
+from core.utils.ttl_cache import ttl_cache
+from core.utils.utils_service import Utils
 
 
 class BaseAaveService(ILendingService):
@@ -27,20 +28,19 @@ class BaseAaveService(ILendingService):
     def name(self) -> str:
         return self.service_name
 
-    @timed_cache(10000, 10, asyncFunction=True)
+    @ttl_cache(3600, 32)
     async def get_contract_obj(
         self,
         defi_provider: DefiProvider,
-        addr: str | None,
+        addr: str | None = None,
         crt_name: str = "ILendingPool",
-    ) -> tuple[AsyncContract, Web3]:
+    ) -> tuple[AsyncContract, AsyncWeb3]:
         str_address = addr if addr else defi_provider.contractAddress
-        address = Web3.to_bytes(hexstr=HexStr(str_address))
         network = cast(Network, defi_provider.network)
-        web3 = self.ethereumService.get_network_provider(network)
-        abi = await Utils.get_compiled_sol(crt_name, "0.6.12")
-        aave_protocol = cast(
-            AsyncContract, web3.eth.contract(address=Address(address), abi=abi)
+        web3 = self.ethereumService.get_async_network_provider(network)
+        abi = Utils.get_contract_abi(crt_name)
+        aave_protocol = web3.eth.contract(
+            address=Web3.to_checksum_address(str_address), abi=abi
         )
         return aave_protocol, web3
 
@@ -48,7 +48,7 @@ class BaseAaveService(ILendingService):
         self, user_addr: str, defi_provider: DefiProvider
     ) -> IUserAcccountData:
         (aave_contract, _) = await self.get_contract_obj(defi_provider)
-        user_account_data: list[float] = aave_contract.functions.getUserAccountData(
+        user_account_data = await aave_contract.functions.getUserAccountData(
             Web3.to_bytes(hexstr=HexStr(user_addr))
         ).call()
         (
@@ -69,7 +69,7 @@ class BaseAaveService(ILendingService):
 
     async def get_user_config(self, user_addr: str, defi_provider: DefiProvider) -> Any:
         (aave_contract, _) = await self.get_contract_obj(defi_provider)
-        user_config_data = aave_contract.functions.getUserConfiguration(
+        user_config_data = await aave_contract.functions.getUserConfiguration(
             Web3.to_bytes(hexstr=HexStr(user_addr))
         ).call()
         return user_config_data
@@ -98,12 +98,16 @@ class BaseAaveService(ILendingService):
                 defi_provider.contractAddress,
             )
 
-            deposit_txn_build = aave_contract.functions.deposit(
-                Web3.to_bytes(hexstr=HexStr(asset)),
-                Web3.to_wei(amount, "ether"),
-                Web3.to_bytes(hexstr=HexStr(on_behalf_of)),
-                referral_code,
-            ).build_transaction()
+            deposit_txn_build = self.ethereumService.build_contract_txn(
+                aave_contract,
+                "deposit",
+                [
+                    Web3.to_bytes(hexstr=HexStr(asset)),
+                    Web3.to_wei(amount, "ether"),
+                    Web3.to_bytes(hexstr=HexStr(on_behalf_of)),
+                    referral_code,
+                ],
+            )
 
             txn_hash = await self.ethereumService.sign_txn(
                 network, blockchain, mnemonic, deposit_txn_build
@@ -128,11 +132,15 @@ class BaseAaveService(ILendingService):
             (aave_contract, web3) = await self.get_contract_obj(defi_provider)
             network = cast(Network, defi_provider.network)
             blockchain = cast(Blockchain, defi_provider.blockchain)
-            withdraw_txn_build = aave_contract.functions.withdraw(
-                Web3.to_bytes(hexstr=HexStr(asset)),
-                Web3.to_wei(amount, "ether"),
-                Web3.to_bytes(hexstr=HexStr(to)),
-            ).build_transaction()
+            withdraw_txn_build = self.ethereumService.build_contract_txn(
+                aave_contract,
+                "withdraw",
+                [
+                    Web3.to_bytes(hexstr=HexStr(asset)),
+                    Web3.to_wei(amount, "ether"),
+                    Web3.to_bytes(hexstr=HexStr(to)),
+                ],
+            )
 
             txn_hash = await self.ethereumService.sign_txn(
                 network, blockchain, mnemonic, withdraw_txn_build
@@ -160,13 +168,17 @@ class BaseAaveService(ILendingService):
             (aave_contract, web3) = await self.get_contract_obj(defi_provider)
             network = cast(Network, defi_provider.network)
             blockchain = cast(Blockchain, defi_provider.blockchain)
-            borrow_txn_build = aave_contract.functions.borrow(
-                Web3.to_bytes(hexstr=HexStr(asset)),
-                Web3.to_wei(amount, "ether"),
-                self.aave_interest_rate_mode[interest_rate_mode],
-                referral_code,
-                Web3.to_bytes(hexstr=HexStr(on_behalf_of)),
-            ).build_transaction()
+            borrow_txn_build = self.ethereumService.build_contract_txn(
+                aave_contract,
+                "borrow",
+                [
+                    Web3.to_bytes(hexstr=HexStr(asset)),
+                    Web3.to_wei(amount, "ether"),
+                    self.aave_interest_rate_mode[interest_rate_mode],
+                    referral_code,
+                    Web3.to_bytes(hexstr=HexStr(on_behalf_of)),
+                ],
+            )
             txn_hash = await self.ethereumService.sign_txn(
                 network, blockchain, mnemonic, borrow_txn_build
             )
@@ -201,12 +213,16 @@ class BaseAaveService(ILendingService):
                 defi_provider.contractAddress,
             )
 
-            repay_txn_build = aave_contract.functions.repay(
-                Web3.to_bytes(hexstr=HexStr(asset)),
-                Web3.to_wei(amount, "ether"),
-                self.aave_interest_rate_mode[rate_mode],
-                Web3.to_bytes(hexstr=HexStr(on_behalf_of)),
-            ).build_transaction()
+            repay_txn_build = self.ethereumService.build_contract_txn(
+                aave_contract,
+                "repay",
+                [
+                    Web3.to_bytes(hexstr=HexStr(asset)),
+                    Web3.to_wei(amount, "ether"),
+                    self.aave_interest_rate_mode[rate_mode],
+                    Web3.to_bytes(hexstr=HexStr(on_behalf_of)),
+                ],
+            )
             txn_hash = await self.ethereumService.sign_txn(
                 network, blockchain, mnemonic, repay_txn_build
             )
@@ -223,7 +239,7 @@ class BaseAaveService(ILendingService):
         defi_provider: DefiProvider,
     ) -> Any:
         (aave_contract, _) = await self.get_contract_obj(defi_provider)
-        return aave_contract.functions.swapBorrowRateMode(
+        return await aave_contract.functions.swapBorrowRateMode(
             Web3.to_bytes(hexstr=HexStr(asset)), rate_mode
         ).call()
 
@@ -234,11 +250,11 @@ class BaseAaveService(ILendingService):
         defi_provider: DefiProvider,
     ) -> Any:
         (aave_contract, _) = await self.get_contract_obj(defi_provider)
-        return aave_contract.functions.setUserUseReserveAsCollateral(
+        return await aave_contract.functions.setUserUseReserveAsCollateral(
             Web3.to_bytes(hexstr=HexStr(asset)), use_as_collateral
         ).call()
 
-    @timed_cache(10, 10, asyncFunction=True)
+    @ttl_cache(600, 10, shared=True)
     async def get_reserve_assets(
         self, defi_provider: DefiProvider
     ) -> list[IReserveToken]:
@@ -249,11 +265,11 @@ class BaseAaveService(ILendingService):
             "IProtocolDataProvider",
         )
 
-        def get_reserve_asset_data(
+        async def get_reserve_asset_data(
             symbol: str,
             asset: str,
         ) -> IReserveToken:
-            res_data = aave_contract.functions.getReserveData(
+            res_data = await aave_contract.functions.getReserveData(
                 Web3.to_bytes(hexstr=HexStr(asset))
             ).call()
             (
@@ -268,7 +284,7 @@ class BaseAaveService(ILendingService):
                 variableBorrowIndex,
                 lastUpdateTimestamp,
             ) = res_data
-            res_config_data = aave_contract.functions.getReserveConfigurationData(
+            res_config_data = await aave_contract.functions.getReserveConfigurationData(
                 Web3.to_bytes(hexstr=HexStr(asset))
             ).call()
             (
@@ -296,10 +312,7 @@ class BaseAaveService(ILendingService):
                 ltv=ltv / 100,
             )
 
-        reserve_tokens = list(
-            map(
-                lambda token: get_reserve_asset_data(token[0], token[1]),
-                aave_contract.functions.getAllReservesTokens().call(),
-            )
+        reserve_tokens = await aave_contract.functions.getAllReservesTokens().call()
+        return await Utils.promise_all(
+            [get_reserve_asset_data(symbol, asset) for symbol, asset in reserve_tokens]
         )
-        return reserve_tokens
@@ -20,7 +20,8 @@ from apps.wallet.interfaces.wallet_interface import Wallet
 from apps.wallet.interfaces.walletasset_interface import WalletAsset
 from apps.wallet.services.wallet_service import WalletService
 from core.depends.get_object_id import PyObjectId
-from core.utils.model_utility_service import ModelUtilityService
+from core.utils.model_utility_service import CountMode, ModelUtilityService
+from core.utils.reference_cache import ReferenceCache
 from core.utils.response_service import MetaDataModel
 
 
@@ -28,17 +29,22 @@ class LendingService:
     walletService = WalletService()
     lendingRegistry = LendingRegistry()
     slackService = SlackService()
+    defiProviderCache = ReferenceCache[DefiProvider](
+        "defiprovider", ["defiprovider", "network", "blockchain"]
+    )
 
     @staticmethod
     async def get_default_provider_key() -> DefiProvider:
-        default_lending_provider = await ModelUtilityService.find_one_and_populate(
-            DefiProvider,
-            {
-                "isDefault": True,
-                "serviceType": DefiServiceType.LENDING,
-                "isDeleted": False,
-            },
-            ["network", "blockchain"],
+        query = {
+            "isDefault": True,
+            "serviceType": DefiServiceType.LENDING,
+            "isDeleted": False,
+        }
+        default_lending_provider = await LendingService.defiProviderCache.get(
+            query,
+            lambda: ModelUtilityService.find_one_and_populate(
+                DefiProvider, query, ["network", "blockchain"]
+            ),
         )
 
         if not default_lending_provider:
@@ -96,6 +102,7 @@ class LendingService:
             ["defiProvider"],
             page_num,
             page_size,
+            count_mode=CountMode.CACHED,
         )
         return lending_reqs, metadata
 
@@ -12,8 +12,9 @@ from apps.defi.lending.solend.solend_types import ISolendMarketReserve, SolendAs
 from apps.defi.lending.types.lending_types import IReserveToken, IUserAcccountData
 from apps.defi.lending.interfaces.lending_request_interface import InterestRateMode
 from apps.defi.lending.services.lending_iservice import ILendingService
+from core.config import settings
 from core.utils.request import REQUEST_METHOD, HTTPRepository
-from core.utils.utils_service import timed_cache
+from core.utils.ttl_cache import ttl_cache
 
 
 class SolendService(ILendingService):
@@ -197,22 +198,22 @@ class SolendService(ILendingService):
     ) -> Any:
         raise NotImplementedError
 
-    @timed_cache(10, 10, asyncFunction=True)
+    @ttl_cache(600, 10, shared=True)
     async def get_reserve_assets(
         self, defi_provider: DefiProvider
     ) -> list[IReserveToken]:
         solend_info = await self._get_solend_info(defi_provider)
         reserve_tokens = list(
             map(
-                lambda asset: IReserveToken(
-                    **{"tokenSymbol": asset.symbol, "tokenAddress": asset.mintAddress}
+                lambda asset: IReserveToken.model_validate(
+                    {"tokenSymbol": asset.symbol, "tokenAddress": asset.mintAddress}
                 ),
                 solend_info.assets,
             )
         )
         return reserve_tokens
 
-    @timed_cache(100, 10, asyncFunction=True)
+    @ttl_cache(settings.SOLEND_INFO_CACHE_TTL, 10, shared=True)
     async def _get_solend_info(
         self,
         defi_provider: DefiProvider,
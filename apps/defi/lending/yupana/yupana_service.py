@@ -11,7 +11,7 @@ from apps.defi.lending.types.lending_types import IReserveToken, IUserAcccountDa
 from apps.defi.lending.interfaces.lending_request_interface import InterestRateMode
 from apps.defi.lending.services.lending_iservice import ILendingService
 from core.utils.request import HTTPRepository
-from core.utils.utils_service import timed_cache
+from core.utils.ttl_cache import ttl_cache
 
 
 class YupanaService(ILendingService):
@@ -183,7 +183,7 @@ class YupanaService(ILendingService):
     ) -> Any:
         raise NotImplementedError
 
-    @timed_cache(10, 10, asyncFunction=True)
+    @ttl_cache(600, 10)
     async def get_reserve_assets(
         self, defi_provider: DefiProvider
     ) -> list[IReserveToken]:
@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
+from typing import Any
+
 from fastapi import Response, status, APIRouter
 from fastapi_restful.cbv import cbv
 
+from apps.blockchain.evm_chains.web3_provider_pool import Web3ProviderPool
+from core.utils.reference_cache import ReferenceCache
 from core.utils.response_service import ResponseModel, ResponseService
+from core.utils.ttl_cache import TTLCache
+from core.warmup import warmup
 
 router = APIRouter(prefix="/health-check", tags=["Health Check 🩺"])
 
@@ -17,3 +23,35 @@ class HealthController:
         return self.responseService.send_response(
             res, status.HTTP_200_OK, "all good here, works"
         )
+
+    @router.get("/ready")
+    async def readiness(self, res: Response) -> ResponseModel[dict[str, Any]]:
+        if not warmup.ready:
+            return self.responseService.send_response(
+                res,
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "warming up",
+                warmup.get_stats(),
+            )
+
+        return self.responseService.send_response(
+            res, status.HTTP_200_OK, "ready", warmup.get_stats()
+        )
+
+    @router.get("/cache-stats")
+    async def cache_stats(self, res: Response) -> ResponseModel[dict[str, Any]]:
+        return self.responseService.send_response(
+            res,
+            status.HTTP_200_OK,
+            "cache stats retrieved",
+            {"reference": ReferenceCache.get_stats(), "ttl": TTLCache.get_stats()},
+        )
+
+    @router.get("/rpc-stats")
+    async def rpc_stats(self, res: Response) -> ResponseModel[dict[str, Any]]:
+        return self.responseService.send_response(
+            res,
+            status.HTTP_200_OK,
+            "rpc provider stats retrieved",
+            Web3ProviderPool.get_stats(),
+        )
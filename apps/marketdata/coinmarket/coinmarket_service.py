@@ -6,33 +6,30 @@ from apps.marketdata.coinmarket.coinmarket_type import (
 
 from apps.marketdata.services.marketdata_iservice import IMarketDataService
 from apps.marketdata.services.marketdata_type import IPriceData
+from core.utils.custom_exceptions import UnicornException
 from core.utils.request import REQUEST_METHOD, HTTPRepository
 
 
 class CoinmarketService(IMarketDataService):
     appClientService = AppClientService()
 
-    def __init__(self) -> None:
-        client_data = None
-
-        try:
-            client_data = self.appClientService.get_client_by_name(Apps.Coinmarket)
-        except Exception as e:
-            print(e)
+    async def get_http_repository(self) -> HTTPRepository:
+        client_data = await self.appClientService.find_client_by_name(Apps.Coinmarket)
+        if not client_data:
+            raise UnicornException(
+                status_code=503, message="coinmarket app client not set up"
+            )
 
-        self.base_url = client_data.appUrl if client_data else None
-        self.httpRepository = HTTPRepository(
-            self.base_url,
-            {
-                "X-CMC_PRO_API_KEY": client_data.clientSecret if client_data else None,
-            },
+        return HTTPRepository(
+            client_data.appUrl, {"X-CMC_PRO_API_KEY": client_data.clientSecret}
         )
 
     def name(self) -> str:
         return "coinmarket_service"
 
     async def get_historical_price_data(self) -> list[IPriceData]:
-        price_data = await self.httpRepository.call(
+        http_repository = await self.get_http_repository()
+        price_data = await http_repository.call(
             REQUEST_METHOD.GET,
             "/v1/cryptocurrency/listings/historical",
             BaseResponseModel[list[IHistoricalPriceData]],
@@ -1,6 +1,7 @@
 from apps.marketdata.registry.marketdata_registry import MarketDataRegistry
 from apps.marketdata.services.marketdata_type import IPriceData
-from core.utils.utils_service import timed_cache
+from core.config import settings
+from core.utils.single_flight import single_flight
 
 
 class MarketDataService:
@@ -9,7 +10,12 @@ class MarketDataService:
     def get_default_marketdata_provider(self) -> str:
         return "coingecko_service"
 
-    @timed_cache(10, 1, asyncFunction=True)
+    @single_flight(
+        settings.MARKET_DATA_CACHE_TTL,
+        settings.MARKET_DATA_STALE_TTL,
+        1,
+        shared=True,
+    )
     async def get_historical_price_data(self) -> list[IPriceData]:
         price_data = await self.marketDataRegistry.get_service(
             self.get_default_marketdata_provider()
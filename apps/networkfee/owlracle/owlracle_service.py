@@ -6,8 +6,10 @@ from apps.appclient.services.appclient_service import AppClientService, Apps
 from apps.networkfee.interfaces.networkfee_iservice import INetworkFeeService
 from apps.networkfee.owlracle.owlracle_type import IGasSpeed, IOwlRacleFeeInfo
 from apps.networkfee.types.networkfee_type import TxnSpeedOption
+from core.config import settings
+from core.utils.custom_exceptions import UnicornException
 from core.utils.request import REQUEST_METHOD, HTTPRepository
-from core.utils.utils_service import timed_cache
+from core.utils.single_flight import single_flight
 
 
 class OwlracleSupportedNetwork(str, Enum):
@@ -19,27 +21,24 @@ class OwlracleService(INetworkFeeService):
 
     network_gas_limit = {"eth": 21000, "bsc": 90000}
 
-    def __init__(self) -> None:
-        client_data = None
-        try:
-            client_data = self.appClientService.get_client_by_name(Apps.OwlRacle)
-        except Exception as e:
-            print(e)
-        self.api_key = client_data.clientID if client_data else None
-        self.api_secret = client_data.clientSecret if client_data else None
-        self.base_url = client_data.appUrl if client_data else None
-        self.httpRepository = HTTPRepository(self.base_url)
-
     def name(self) -> str:
         return "owlracle_service"
 
-    @timed_cache(10000000, asyncFunction=True)
+    @single_flight(
+        settings.NETWORK_FEE_CACHE_TTL, settings.NETWORK_FEE_STALE_TTL, shared=True
+    )
     async def get_network_fee_data(
         self, network: str, toBaseConversion: bool = False
     ) -> dict[TxnSpeedOption, IGasSpeed]:
-        fee_data = await self.httpRepository.call(
+        client_data = await self.appClientService.find_client_by_name(Apps.OwlRacle)
+        if not client_data:
+            raise UnicornException(
+                status_code=503, message="owlracle app client not set up"
+            )
+
+        fee_data = await HTTPRepository(client_data.appUrl).call(
             REQUEST_METHOD.GET,
-            f"/v3/{network}/gas?apikey={self.api_key}",
+            f"/v3/{network}/gas?apikey={client_data.clientID}",
             IOwlRacleFeeInfo,
         )
 
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, cast
 
 from fastapi import BackgroundTasks
 from pydantic import EmailStr
@@ -12,9 +12,9 @@ from apps.user.interfaces.user_interface import (
     UserUpdateDTO,
 )
 from apps.user.interfaces.user_token_interface import UserRefreshToken
+from apps.wallet.services.qr_image_service import qrImageService
 from apps.wallet.services.wallet_service import WalletService
 from apps.wallet.interfaces.wallet_interface import Wallet
-from core.db import client
 from core.depends.get_object_id import PyObjectId
 from core.utils.aes import EncryptedDTO
 from core.utils.model_utility_service import ModelUtilityService, UpdateAction
@@ -28,9 +28,7 @@ class UserService:
     backgroundTasks = BackgroundTasks()
 
     async def create_user(self, user: User) -> tuple[User, Wallet, EncryptedDTO]:
-        session = client.start_session()
-        session.start_transaction()
-        try:
+        async with ModelUtilityService.transaction() as session:
             assert user.username, "username can not be null"
             await self.check_if_username_exist_and_fail(user.username)
             dict_user = user.dict(by_alias=True, exclude_none=True)
@@ -38,13 +36,8 @@ class UserService:
             wallet, encrypted_seed = await self.walletService.create_wallet(
                 user_obj, session
             )
-            session.commit_transaction()
-            return user_obj, wallet, encrypted_seed
-        except Exception as e:
-            session.abort_transaction()
-            raise e
-        finally:
-            session.end_session()
+        qrImageService.enqueue_wallet(cast(PyObjectId, wallet.id))
+        return user_obj, wallet, encrypted_seed
 
     async def login_user(self, login_user_input: UserLoginInput) -> User:
         user_obj = await self.get_user_by_query(
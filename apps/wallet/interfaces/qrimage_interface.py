@@ -0,0 +1,15 @@
+from pymongo import ASCENDING
+
+from core.db import db
+from core.depends.model import SBaseModel
+
+
+class QRImage(SBaseModel):
+    key: str
+    address: str
+    url: str
+
+    @staticmethod
+    def init() -> None:
+        # one uploaded image per content key
+        db.qrimage.create_index([("key", ASCENDING)], unique=True)
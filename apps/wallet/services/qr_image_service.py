@@ -0,0 +1,113 @@
+import asyncio
+from typing import Any
+
+from apps.wallet.interfaces.qrimage_interface import QRImage
+from apps.wallet.interfaces.walletasset_interface import WalletAsset
+from core.config import settings
+from core.depends.get_object_id import PyObjectId
+from core.utils.loggly import logger
+from core.utils.model_utility_service import ModelUtilityService
+from core.utils.s3_uploader import PLACEHOLDER_FILE_URL, s3Uploader
+from core.utils.utils_service import Utils
+
+
+class QRImageService:
+    """
+    QRImageService: background queue filling in `WalletAsset.qrImage`
+
+    wallet assets are created without a qr image, the worker that created them
+    queues their addresses once the creating transaction commits. an address is
+    queued once however many assets share it, and the queue is refilled on
+    startup with the assets still missing their image, catching up on queues lost
+    to a restart. rendered images are indexed by content key in the qrimage
+    collection
+    """
+
+    def __init__(self, workers: int = settings.QR_IMAGE_WORKERS) -> None:
+        self.workers = workers
+        self.queue: asyncio.Queue[str] = asyncio.Queue()
+        self.pending: set[str] = set()
+        self.tasks: list[asyncio.Task[None]] = []
+        self.lookups: set[asyncio.Task[None]] = set()
+
+    def enqueue(self, address: str) -> None:
+        if address in self.pending:
+            return
+        self.pending.add(address)
+        self.queue.put_nowait(address)
+
+    def enqueue_wallet(self, wallet_id: PyObjectId) -> None:
+        """
+        enqueue_wallet: queue the addresses of a wallet's assets missing their qr
+        image, called once the transaction creating them commits
+        """
+        lookup = asyncio.create_task(self.enqueue_missing({"wallet": wallet_id}))
+        self.lookups.add(lookup)
+        lookup.add_done_callback(self.lookups.discard)
+
+    async def get_qr_image_url(self, address: str) -> str:
+        # uploads are disabled outside dev, nothing is rendered and the
+        # placeholder is never indexed as the image of the address
+        if not settings.IS_DEV:
+            return PLACEHOLDER_FILE_URL
+
+        key = Utils.get_qr_image_key(address)
+        qr_image = await ModelUtilityService.find_one(QRImage, {"key": key})
+        if qr_image:
+            return qr_image.url
+
+        if await s3Uploader.exists(key):
+            image_url = await s3Uploader.get_file_url(key)
+        else:
+            loop = asyncio.get_event_loop()
+            image = await loop.run_in_executor(None, Utils.render_qr_image, address)
+            image_url = await s3Uploader.upload(key, image, "image/png", unique=False)
+        qr_image = await ModelUtilityService.model_find_one_or_create(
+            QRImage,
+            {"key": key},
+            QRImage(key=key, address=address, url=image_url).model_dump(
+                by_alias=True, exclude_none=True
+            ),
+        )
+
+        return qr_image.url
+
+    async def create_qr_image(self, address: str) -> None:
+        image_url = await self.get_qr_image_url(address)
+        await ModelUtilityService.model_update_many(
+            WalletAsset, {"address": address, "qrImage": None}, {"qrImage": image_url}
+        )
+
+    async def work(self) -> None:
+        while True:
+            address = await self.queue.get()
+            try:
+                await self.create_qr_image(address)
+            except Exception as e:
+                logger.error(f"Error creating qr image for {address} - {str(e)}")
+            finally:
+                self.pending.discard(address)
+                self.queue.task_done()
+
+    async def enqueue_missing(self, query: dict[str, Any]) -> None:
+        try:
+            async for user_asset in ModelUtilityService.iter_find(
+                WalletAsset, {**query, "qrImage": None, "isDeleted": False}
+            ):
+                self.enqueue(user_asset.address)
+        except Exception as e:
+            logger.error(f"Error queueing missing qr images - {str(e)}")
+
+    def start(self) -> None:
+        if self.tasks:
+            return
+        self.tasks = [asyncio.create_task(self.work()) for _ in range(self.workers)]
+        self.tasks.append(asyncio.create_task(self.enqueue_missing({})))
+
+    def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+
+qrImageService = QRImageService()
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, cast
 
 from mnemonic import Mnemonic
@@ -10,9 +9,9 @@ from apps.blockchain.interfaces.tokenasset_interface import TokenAsset, TokenAss
 from apps.blockchain.services.blockchain_service import BlockchainService
 from apps.user.interfaces.user_interface import User
 from apps.wallet.interfaces.wallet_interface import Wallet, WalletType
-from apps.wallet.interfaces.walletasset_interface import WalletAsset
+from apps.wallet.interfaces.walletasset_interface import Address, WalletAsset
+from apps.wallet.services.qr_image_service import qrImageService
 
-from core.db import client
 from core.depends.get_object_id import PyObjectId
 from core.utils.aes import AesEncryptionService, EncryptedDTO
 from core.utils.model_utility_service import ModelUtilityService
@@ -55,17 +54,10 @@ class WalletService:
         self,
         user: User,
     ) -> tuple[Wallet, EncryptedDTO]:
-        session = client.start_session()
-        session.start_transaction()
-        try:
+        async with ModelUtilityService.transaction() as session:
             res = await self.create_wallet(user, session)
-            session.commit_transaction()
-            return res
-        except Exception as e:
-            session.abort_transaction()
-            raise e
-        finally:
-            session.end_session()
+        qrImageService.enqueue_wallet(cast(PyObjectId, res[0].id))
+        return res
 
     async def create_wallet(
         self,
@@ -92,10 +84,15 @@ class WalletService:
         blockchains = await BlockchainService.get_blockchains(
             {"isDeleted": {"$ne": True}}
         )
+        addresses = await self.blockchainService.derive_addresses(
+            [chain.registryName for chain in blockchains], mnemonic
+        )
 
         await Utils.promise_all(
             [
-                self.create_wallet_assets(user, wallet_obj, mnemonic, chain, session)
+                self.create_wallet_assets(
+                    user, wallet_obj, addresses[chain.registryName], chain, session
+                )
                 for chain in blockchains
             ]
         )
@@ -117,43 +114,27 @@ class WalletService:
         self,
         user: User,
         wallet: Wallet,
-        mnemonic: str,
+        address: Address,
         chain: Blockchain,
         session: ClientSession | None = None,
     ) -> None:
-
-        address = await self.blockchainService.create_address(
-            chain.registryName, mnemonic
-        )
-
         token_assets = await BlockchainService.get_token_assets(
             {"isDeleted": False, "blockchain": chain.id, "isLayerOne": True}
         )
-        loop = asyncio.get_event_loop()
-
-        def convert_assets_to_dict() -> list[dict[str, Any]]:
-            return list(
-                map(
-                    lambda token_asset: WalletAsset(
-                        user=cast(PyObjectId, user.id),
-                        wallet=cast(PyObjectId, wallet.id),
-                        tokenasset=cast(PyObjectId, token_asset.id),
-                        address=self.blockchainService.get_address(
-                            address, cast(Network, token_asset.network)
-                        ),
-                        qrImage=Utils.create_qr_image(
-                            self.blockchainService.get_address(
-                                address, cast(Network, token_asset.network)
-                            ),
-                        ),
-                        networkType=cast(Network, token_asset.network).networkType,
-                        blockchain=cast(PyObjectId, chain.id),
-                    ).model_dump(by_alias=True, exclude_none=True),
-                    token_assets,
-                )
-            )
-
-        dict_wallet_assets = await loop.run_in_executor(None, convert_assets_to_dict)
+        # qrImage is filled in by the qr image queue once the assets are committed
+        dict_wallet_assets = [
+            WalletAsset(
+                user=cast(PyObjectId, user.id),
+                wallet=cast(PyObjectId, wallet.id),
+                tokenasset=cast(PyObjectId, token_asset.id),
+                address=self.blockchainService.get_address(
+                    address, cast(Network, token_asset.network)
+                ),
+                networkType=cast(Network, token_asset.network).networkType,
+                blockchain=cast(PyObjectId, chain.id),
+            ).model_dump(by_alias=True, exclude_none=True)
+            for token_asset in token_assets
+        ]
 
         await ModelUtilityService.model_create_many(
             WalletAsset, dict_wallet_assets, session
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from typing import Any, AsyncIterator, cast
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from bson import ObjectId
+
+from apps.blockchain.interfaces.network_interface import NetworkType
+from apps.wallet.interfaces.walletasset_interface import WalletAsset
+from apps.wallet.services.qr_image_service import QRImageService
+from core.config import settings
+from core.depends.get_object_id import PyObjectId
+from core.utils.s3_uploader import PLACEHOLDER_FILE_URL
+
+
+class TestQRImageService(IsolatedAsyncioTestCase):
+    async def test_wallet_assets_queued_once_per_address(self) -> None:
+        wallet_id = cast(PyObjectId, ObjectId())
+        queries: list[dict[str, Any]] = []
+
+        async def iter_find(
+            generic_class: Any, query: dict[str, Any]
+        ) -> AsyncIterator[WalletAsset]:
+            queries.append(query)
+            for address in ["0xa", "0xa", "bc1b"]:
+                yield WalletAsset.model_construct(
+                    address=address,
+                    tokenasset=cast(PyObjectId, ObjectId()),
+                    wallet=wallet_id,
+                    blockchain=cast(PyObjectId, ObjectId()),
+                    networkType=NetworkType.MAINNET,
+                    user=cast(PyObjectId, ObjectId()),
+                )
+
+        service = QRImageService()
+        with patch(
+            "apps.wallet.services.qr_image_service.ModelUtilityService.iter_find",
+            iter_find,
+        ):
+            service.enqueue_wallet(wallet_id)
+            await asyncio.gather(*service.lookups)
+
+        assert queries == [{"wallet": wallet_id, "qrImage": None, "isDeleted": False}]
+        assert [service.queue.get_nowait() for _ in range(service.queue.qsize())] == [
+            "0xa",
+            "bc1b",
+        ]
+        assert not service.lookups
+
+    async def test_placeholder_not_indexed_outside_dev(self) -> None:
+        service = QRImageService()
+        with patch.object(settings, "IS_DEV", False), patch(
+            "apps.wallet.services.qr_image_service.ModelUtilityService"
+        ) as model_utility_service, patch(
+            "apps.wallet.services.qr_image_service.Utils.render_qr_image"
+        ) as render_qr_image:
+            assert await service.get_qr_image_url("0xa") == PLACEHOLDER_FILE_URL
+
+        assert not model_utility_service.mock_calls
+        render_qr_image.assert_not_called()
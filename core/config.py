@@ -40,6 +40,84 @@ class Settings(BaseSettings):
     # ~~~~~ DATA_BASE ~~~~~
     DATABASE_URI: str = "mongodb://127.0.0.1:27017/"
     DATABASE_NAME: str = "deg-x"
+    # use the motor asyncio driver instead of pymongo calls sent to the executor
+    DATABASE_ASYNC_DRIVER: bool = True
+    DATABASE_BATCH_SIZE: int = 100
+
+    # ~~~~~ PAGINATION ~~~~~
+    PAGINATION_COUNT_CACHE_TTL: int = 30  # in SECS
+    PAGINATION_COUNT_CACHE_SIZE: int = 1024
+
+    # ~~~~~ POPULATE ~~~~~
+    # fall back to $lookup aggregations instead of batched $in populates
+    POPULATE_WITH_LOOKUP: bool = False
+    POPULATE_CACHE_COLLECTIONS: list[str] = ["blockchain", "network", "tokenasset"]
+    POPULATE_CACHE_SIZE: int = 512
+    POPULATE_CACHE_TTL: int = 300  # in SECS
+
+    # ~~~~~ BALANCE REFRESH ~~~~~
+    BALANCE_REFRESH_CONCURRENCY: int = 5
+
+    # ~~~~~ WEB3 PROVIDERS ~~~~~
+    WEB3_PROVIDER_POOL_SIZE: int = 20
+    WEB3_PROVIDER_TIMEOUT: int = 10  # in SECS
+    WEB3_PROVIDER_COOLDOWN: int = 30  # in SECS
+    WEB3_PROVIDER_HEALTH_CHECK_INTERVAL: int = 60  # in SECS
+    # nonces are allocated in process memory, only one worker may sign
+    NONCE_RESYNC_INTERVAL: int = 30  # in SECS
+
+    # ~~~~~ HTTP CLIENT ~~~~~
+    HTTP_TIMEOUT: int = 30  # in SECS
+    HTTP_CONNECT_TIMEOUT: int = 10  # in SECS
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_ENABLE_HTTP2: bool = True
+    HTTP_RETRIES: int = 3
+    HTTP_RETRY_BACKOFF: float = 0.5  # in SECS, doubled on every retry
+
+    # ~~~~~ EXTERNAL DATA CACHE ~~~~~
+    # expired data is served for the stale ttl while one call refreshes it
+    MARKET_DATA_CACHE_TTL: int = 600  # in SECS
+    MARKET_DATA_STALE_TTL: int = 3600  # in SECS
+    NETWORK_FEE_CACHE_TTL: int = 60  # in SECS
+    NETWORK_FEE_STALE_TTL: int = 600  # in SECS
+    # solend market config, reserves and oracles rarely change
+    SOLEND_INFO_CACHE_TTL: int = 6000  # in SECS
+
+    # ~~~~~ SHARED CACHE ~~~~~
+    # redis://host:port/db, memory:// for an in-process stand-in, empty disables
+    SHARED_CACHE_URL: str = ""
+    SHARED_CACHE_PREFIX: str = "deg-x"
+    SHARED_CACHE_TIMEOUT: float = 1  # in SECS
+
+    # ~~~~~ DERIVED KEY CACHE ~~~~~
+    DERIVED_KEY_CACHE_TTL: int = 120  # in SECS, 0 disables the cache
+    DERIVED_KEY_CACHE_SIZE: int = 256
+
+    # ~~~~~ ADDRESS DERIVATION ~~~~~
+    ADDRESS_DERIVATION_WORKERS: int = 2  # 0 derives in the thread pool instead
+
+    # ~~~~~ WARMUP ~~~~~
+    WARMUP_ENABLED: bool = True
+    # run the warm-up after startup, readiness flips once it is done
+    WARMUP_IN_BACKGROUND: bool = True
+    WARMUP_STEPS: list[str] = []  # empty runs every step
+    WARMUP_STEP_TIMEOUT: int = 60  # in SECS
+
+    # ~~~~~ CHANGE STREAM ~~~~~
+    CHANGE_STREAM_ENABLED: bool = True
+    CHANGE_STREAM_NAME: str = "deg-x"
+    # resume token key shared by the workers of a deployment
+    CHANGE_STREAM_CONSUMER: str = "default"
+    # also key the resume token by host and pid, each process resumes on its own
+    CHANGE_STREAM_CONSUMER_PER_PROCESS: bool = False
+    CHANGE_STREAM_TOKEN_TTL: int = 7 * 24 * 3600  # in SECS
+    CHANGE_STREAM_COLLECTION: str = "changestream"
+    CHANGE_STREAM_RETRY_DELAY: int = 5  # in SECS
+
+    # ~~~~~ REFERENCE DATA CACHE ~~~~~
+    REFERENCE_CACHE_TTL: int = 600  # in SECS
+    REFERENCE_CACHE_SIZE: int = 256
 
     ACCESS_TOKEN_JWT_SECRET: str = "access"
     ACCESS_TOKEN_EXPIRATION: int = 600  # in MINS
@@ -58,6 +136,13 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY_ID: str = "your-access-key-id"
     AWS_SECRET_ACCESS_KEY: str = "your-access-key-secret"
     AWS_S3_URL: str = "http://localhost:4572"
+    S3_BUCKET_REGION: str = ""  # looked up from the bucket when empty
+    S3_MAX_POOL_CONNECTIONS: int = 20
+    S3_MAX_CONCURRENT_UPLOADS: int = 10
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024  # in BYTES
+
+    # ~~~~~ QR IMAGES ~~~~~
+    QR_IMAGE_WORKERS: int = 4
 
     # ~~~~~ ENVIRONMENT MODE ~~~~~
     ENV_MODE: str = "development"
@@ -4,7 +4,10 @@ import g4f
 import traceback
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from apps.blockchain.evm_chains.web3_provider_pool import Web3ProviderPool
 from apps.notification.slack.services.slack_service import SlackService
+from core.config import settings
+from core.utils.key_cache import derivedKeyCache
 from core.utils.loggly import logger
 from core.utils.utils_service import Utils
 
@@ -22,6 +25,17 @@ class CronJob:
         # self.notify_slack_for_demigod = self.scheduler.add_job(
         #     self.slackService.notify_slack_of_demigod, "interval", minutes=180
         # )
+        self.check_rpc_providers = self.scheduler.add_job(
+            Web3ProviderPool.check_health,
+            "interval",
+            seconds=settings.WEB3_PROVIDER_HEALTH_CHECK_INTERVAL,
+        )
+        if settings.DERIVED_KEY_CACHE_TTL > 0:
+            self.sweep_derived_keys = self.scheduler.add_job(
+                derivedKeyCache.sweep,
+                "interval",
+                seconds=settings.DERIVED_KEY_CACHE_TTL,
+            )
         self.notify_message_for_bros = self.scheduler.add_job(
             self.sendToBROs, "interval", minutes=240
         )
@@ -2,25 +2,34 @@ from typing import Any, Generic, Literal, Optional, TypeVar
 
 import certifi
 from bson.timestamp import Timestamp
+from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, Field, ConfigDict
 from pymongo import MongoClient
-from pymongo.change_stream import DatabaseChangeStream
 from pymongo.database import Database
 
 from core.config import settings
 from core.depends.get_object_id import PyObjectId
 
 
-def get_db() -> tuple[MongoClient[Any], Database[Any], DatabaseChangeStream[Any]]:
+def get_db() -> tuple[MongoClient[Any], Database[Any]]:
     db_name = settings.DATABASE_NAME
     uri = settings.DATABASE_URI
     client = MongoClient[Any](uri, tlsCAFile=certifi.where(), appname="deg-x")
     db = client[db_name]
-    cursor = db.watch()
-    return client, db, cursor
+    return client, db
 
 
-client, db, cursor = get_db()
+def get_async_db() -> tuple[Any, Any]:
+    # motor ships no type information, the client and database are untyped
+    db_name = settings.DATABASE_NAME
+    uri = settings.DATABASE_URI
+    async_client = AsyncIOMotorClient(uri, tlsCAFile=certifi.where(), appname="deg-x")
+    async_db = async_client[db_name]
+    return async_client, async_db
+
+
+client, db = get_db()
+async_client, async_db = get_async_db()
 
 T = TypeVar("T")
 
@@ -38,7 +47,7 @@ class UpdateDesc(BaseModel):
 
 class CursorModel(BaseModel, Generic[T]):
     id: dict[str, str] = Field(alias="_id")
-    operationType: Literal["insert", "delete", "update"]
+    operationType: Literal["insert", "delete", "update", "replace"]
     clusterTime: Timestamp
     fullDocument: Optional[T] = None
     ns: Ns
@@ -46,12 +55,3 @@ class CursorModel(BaseModel, Generic[T]):
     updateDescription: Optional[UpdateDesc] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True, populate_by_name=True)
-
-
-def mongo_data_streaming() -> None:
-    from apps.wallet.interfaces.walletasset_interface import WalletAssetOut
-
-    doc = next(cursor)
-    document = CursorModel[WalletAssetOut](**doc)
-
-    print("document", document, doc)
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import socket
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Literal, Optional, Type
+
+from pydantic import BaseModel
+from pymongo.errors import OperationFailure, PyMongoError
+
+from core.config import settings
+from core.db import CursorModel, async_db
+from core.utils.loggly import logger
+
+OperationType = Literal["insert", "delete", "update", "replace"]
+ChangeHandler = Callable[[CursorModel[Any]], Awaitable[None]]
+
+# the server no longer has the oplog entry the resume token points at
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+@dataclass
+class ChangeSubscription:
+    collections: list[str]
+    operation_types: list[OperationType]
+    # None hands the handler the full document as a raw dict
+    model: Optional[Type[BaseModel]]
+    handler: ChangeHandler
+
+
+class ChangeStreamService:
+    """
+    ChangeStreamService: background consumer of the database change stream
+
+    handlers subscribe to a set of collections and operation types and receive
+    the change with its full document validated as `model`. every worker consumes
+    the stream, the handlers keep per-process state (reference caches, socket
+    rooms), and the resume token is persisted after every change under
+    `CHANGE_STREAM_CONSUMER`, a stable key that resumes across restarts.
+    `CHANGE_STREAM_CONSUMER_PER_PROCESS` keys the token by host and pid as well.
+    tokens not updated for `CHANGE_STREAM_TOKEN_TTL` are expired
+    """
+
+    def __init__(
+        self,
+        name: str = settings.CHANGE_STREAM_NAME,
+        consumer: str = settings.CHANGE_STREAM_CONSUMER,
+        per_process: bool = settings.CHANGE_STREAM_CONSUMER_PER_PROCESS,
+    ) -> None:
+        self.name = name
+        self.consumer = (
+            f"{consumer}:{socket.gethostname()}:{os.getpid()}"
+            if per_process
+            else consumer
+        )
+        self.subscriptions: list[ChangeSubscription] = []
+        self.task: Optional[asyncio.Task[None]] = None
+
+    def register(
+        self,
+        collections: list[str],
+        operation_types: list[OperationType],
+        model: Optional[Type[BaseModel]],
+        handler: ChangeHandler,
+    ) -> None:
+        self.subscriptions.append(
+            ChangeSubscription(collections, operation_types, model, handler)
+        )
+
+    def pipeline(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "$match": {
+                    "$or": [
+                        {
+                            "ns.coll": {"$in": subscription.collections},
+                            "operationType": {"$in": subscription.operation_types},
+                        }
+                        for subscription in self.subscriptions
+                    ]
+                }
+            }
+        ]
+
+    def get_token_key(self) -> str:
+        return f"{self.name}:{self.consumer}"
+
+    async def get_resume_token(self) -> Optional[dict[str, Any]]:
+        state = await async_db[settings.CHANGE_STREAM_COLLECTION].find_one(
+            {"_id": self.get_token_key()}
+        )
+        return state["resumeToken"] if state else None
+
+    async def save_resume_token(self, resume_token: dict[str, Any] | None) -> None:
+        await async_db[settings.CHANGE_STREAM_COLLECTION].update_one(
+            {"_id": self.get_token_key()},
+            {"$set": {"resumeToken": resume_token, "updatedAt": datetime.now()}},
+            upsert=True,
+        )
+
+    async def dispatch(self, change: dict[str, Any]) -> None:
+        for subscription in self.subscriptions:
+            if (
+                change["ns"]["coll"] not in subscription.collections
+                or change["operationType"] not in subscription.operation_types
+            ):
+                continue
+            try:
+                event = CursorModel[Any].model_validate(change)
+                if subscription.model and event.fullDocument is not None:
+                    event.fullDocument = subscription.model.model_validate(
+                        event.fullDocument
+                    )
+                await subscription.handler(event)
+            except Exception as e:
+                logger.error(
+                    f"Error handling {change['operationType']} change on "
+                    f"{change['ns']['coll']} - {str(e)}"
+                )
+
+    async def consume(self) -> None:
+        # tokens of stopped consumers are left behind, mongo expires them
+        await async_db[settings.CHANGE_STREAM_COLLECTION].create_index(
+            "updatedAt", expireAfterSeconds=settings.CHANGE_STREAM_TOKEN_TTL
+        )
+        resume_token = await self.get_resume_token()
+        async with async_db.watch(
+            self.pipeline(),
+            full_document="updateLookup",
+            resume_after=resume_token,
+        ) as stream:
+            logger.info(f"{self.get_token_key()} change stream consumer started")
+            async for change in stream:
+                await self.dispatch(change)
+                await self.save_resume_token(stream.resume_token)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.consume()
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                logger.error(f"{self.name} change stream failed - {str(e)}")
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    await self.save_resume_token(None)
+            except PyMongoError as e:
+                logger.error(f"{self.name} change stream interrupted - {str(e)}")
+            await asyncio.sleep(settings.CHANGE_STREAM_RETRY_DELAY)
+
+    def start(self) -> None:
+        if not self.subscriptions or self.task:
+            return
+        self.task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+
+changeStream = ChangeStreamService()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import os
+from typing import Any
+from unittest import IsolatedAsyncioTestCase
+
+from bson import ObjectId, Timestamp
+from pydantic import BaseModel
+
+from core.db import CursorModel
+from core.db.change_stream import ChangeStreamService
+
+
+class Chain(BaseModel):
+    name: str
+
+
+def change(operation_type: str, collection: str) -> dict[str, Any]:
+    document_id = ObjectId()
+    return {
+        "_id": {"_data": "8263"},
+        "operationType": operation_type,
+        "clusterTime": Timestamp(1700000000, 1),
+        "ns": {"db": "deg-x", "coll": collection},
+        "documentKey": {"_id": document_id},
+        "fullDocument": {"_id": document_id, "name": "ethereum"},
+    }
+
+
+class TestChangeStream(IsolatedAsyncioTestCase):
+    def test_resume_token_keyed_per_consumer(self) -> None:
+        assert ChangeStreamService("deg-x", "web").get_token_key() == "deg-x:web"
+        assert (
+            ChangeStreamService("deg-x", "web", per_process=True)
+            .get_token_key()
+            .endswith(f":{os.getpid()}")
+        )
+
+    async def test_replace_dispatched_to_subscribers(self) -> None:
+        events: list[CursorModel[Any]] = []
+
+        async def handle(event: CursorModel[Any]) -> None:
+            events.append(event)
+
+        service = ChangeStreamService("deg-x", "test")
+        service.register(["network"], ["update", "replace"], Chain, handle)
+        service.register(["walletasset"], ["update"], None, handle)
+
+        await service.dispatch(change("replace", "network"))
+        await service.dispatch(change("insert", "network"))
+        await service.dispatch(change("replace", "walletasset"))
+        await service.dispatch(change("update", "walletasset"))
+
+        assert [event.operationType for event in events] == ["replace", "update"]
+        assert events[0].fullDocument == Chain(name="ethereum")
+        assert isinstance(events[1].fullDocument, dict)
+        assert events[1].fullDocument["name"] == "ethereum"
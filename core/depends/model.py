@@ -32,8 +32,8 @@ def serialise_obj(oid: Any) -> Any:
 
 class SBaseOutModel(HashableBaseModel, BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
-    createdAt: datetime = Field(default=datetime.now())
-    updatedAt: datetime = Field(default=datetime.now())
+    createdAt: datetime = Field(default_factory=datetime.now)
+    updatedAt: datetime = Field(default_factory=datetime.now)
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
@@ -0,0 +1,101 @@
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from core.config import settings
+
+
+class DerivedKeyCache:
+    """
+    DerivedKeyCache: short lived, memory only cache of key material derived from
+    mnemonics, so multi-step flows (approve then deposit, create then verify)
+    stretch the BIP-39 seed once
+
+    entries are keyed by an hmac of the mnemonic under a per-process secret, held
+    as bytearrays and overwritten with zeros when they expire, are evicted or the
+    cache is cleared. expired entries are swept by the cron scheduler and the
+    cache is cleared on shutdown
+    """
+
+    def __init__(
+        self,
+        ttl: int = settings.DERIVED_KEY_CACHE_TTL,
+        maxsize: int = settings.DERIVED_KEY_CACHE_SIZE,
+    ) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.secret = os.urandom(32)
+        self.entries: OrderedDict[str, tuple[float, bytearray]] = OrderedDict()
+        # derivation also runs in executor threads
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def zeroize(key_material: bytearray) -> None:
+        key_material[:] = bytes(len(key_material))
+
+    def get_cache_key(self, namespace: str, mnemonic: str) -> str:
+        return hmac.new(
+            self.secret, f"{namespace}:{mnemonic}".encode(), hashlib.sha256
+        ).hexdigest()
+
+    def evict_expired(self, now: float) -> None:
+        for cache_key in [
+            cache_key
+            for cache_key, (expires_at, _) in self.entries.items()
+            if expires_at <= now
+        ]:
+            _, key_material = self.entries.pop(cache_key)
+            self.zeroize(key_material)
+
+    def get(self, namespace: str, mnemonic: str, derive: Callable[[], bytes]) -> bytes:
+        """
+        get: key material of a mnemonic for `namespace`, derived with `derive` on a
+        miss
+
+        Args:
+            namespace (str): what the material is, e.g. the chain and network, so a
+                mnemonic maps to a separate entry per derivation
+            derive (Callable[[], bytes]): derives the key material from the mnemonic
+        """
+        if self.ttl <= 0:
+            return derive()
+
+        cache_key = self.get_cache_key(namespace, mnemonic)
+        with self.lock:
+            self.evict_expired(time.monotonic())
+            entry = self.entries.get(cache_key)
+            if entry:
+                self.entries.move_to_end(cache_key)
+                return bytes(entry[1])
+
+        key_material = bytearray(derive())
+        with self.lock:
+            if cache_key in self.entries:
+                self.zeroize(self.entries.pop(cache_key)[1])
+            self.entries[cache_key] = (time.monotonic() + self.ttl, key_material)
+            while len(self.entries) > self.maxsize:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.zeroize(evicted)
+
+            return bytes(key_material)
+
+    def sweep(self) -> None:
+        """
+        sweep: zeroize expired entries, run periodically so key material of
+        mnemonics that are not used again does not outlive its ttl
+        """
+        with self.lock:
+            self.evict_expired(time.monotonic())
+
+    def clear(self) -> None:
+        with self.lock:
+            for _, key_material in self.entries.values():
+                self.zeroize(key_material)
+            self.entries.clear()
+
+
+derivedKeyCache = DerivedKeyCache()
@@ -1,20 +1,30 @@
 import asyncio
+import base64
+import binascii
 import math
 import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime
 from enum import Enum
-from functools import lru_cache
-from typing import Any, Type, TypeVar
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Any, AsyncIterator, Type, TypeVar, cast
+from bson import json_util
+from bson.errors import BSONError
 from bson.objectid import ObjectId
-from pymongo import DESCENDING, ReturnDocument
+from pymongo import DESCENDING, ReturnDocument, UpdateOne
 from pymongo.client_session import ClientSession
 from pymongo.results import (
+    BulkWriteResult,
     DeleteResult,
     InsertManyResult,
     UpdateResult,
 )
 
-from core.db import db
+from core.config import settings
+from core.db import async_client, async_db, client, db
 from core.utils.loggly import logger
 from core.utils.response_service import MetaDataModel
 from core.utils.utils_service import Utils
@@ -26,8 +36,20 @@ class UpdateAction(str, Enum):
     PULL = "$pull"
 
 
+class CountMode(str, Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    NONE = "none"
+
+
 class ModelUtilityService:
     T = TypeVar("T")
+    # collection name -> serialised query -> (expiry, count)
+    __count_cache: dict[str, dict[str, tuple[float, int]]] = {}
+    # (collection name, _id) -> (expiry, document), least recently used first
+    __reference_cache: OrderedDict[
+        tuple[str, ObjectId], tuple[float, dict[str, Any]]
+    ] = OrderedDict()
 
     @lru_cache(16)
     @staticmethod
@@ -45,6 +67,351 @@ class ModelUtilityService:
         else:
             return noun + "s"
 
+    @staticmethod
+    def __collection_name(generic_class: Type[T] | str) -> str:
+        return (
+            generic_class
+            if isinstance(generic_class, str)
+            else generic_class.__name__.lower()
+        )
+
+    @staticmethod
+    async def __execute(
+        generic_class: Type[T] | str, operation: str, *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        __execute: run a collection operation on the configured mongo driver
+
+        Args:
+            generic_class (Type[T] | str): model class or name of the collection
+            operation (str): name of the collection method to call
+        """
+        collection_name = ModelUtilityService.__collection_name(generic_class)
+        if settings.DATABASE_ASYNC_DRIVER:
+            return await getattr(async_db[collection_name], operation)(*args, **kwargs)
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, partial(getattr(db[collection_name], operation), *args, **kwargs)
+        )
+
+    @staticmethod
+    async def __execute_cursor(
+        generic_class: Type[T] | str, operation: str, *args: Any, **kwargs: Any
+    ) -> list[Any]:
+        """
+        __execute_cursor: run a cursor returning collection operation
+        (find, aggregate) and fetch all of its documents
+
+        Args:
+            generic_class (Type[T] | str): model class or name of the collection
+            operation (str): name of the collection method to call
+        """
+        collection_name = ModelUtilityService.__collection_name(generic_class)
+        if settings.DATABASE_ASYNC_DRIVER:
+            documents = getattr(async_db[collection_name], operation)(*args, **kwargs)
+            return await documents.to_list(length=None)
+
+        def fetch_all() -> list[Any]:
+            return list(getattr(db[collection_name], operation)(*args, **kwargs))
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, fetch_all)
+
+    @staticmethod
+    async def iter_find(
+        generic_class: Type[T],
+        query: dict[str, Any],
+        batch_size: int = settings.DATABASE_BATCH_SIZE,
+        sort: list[tuple[str, int]] | None = None,
+        skip: int = 0,
+        limit: int = 0,
+    ) -> AsyncIterator[T]:
+        """
+        iter_find: stream the documents matching a query as class objects,
+        fetching them from the server `batch_size` documents at a time without
+        blocking the event loop
+
+        Args:
+            generic_class (Type[T]): model class whose collection is used
+            query (dict[str, Any]): query filter
+            batch_size (int, optional): documents fetched per round trip.
+            sort (list[tuple[str, int]] | None, optional): sort specification.
+            skip (int, optional): number of documents to skip. Defaults to 0.
+            limit (int, optional): max documents to return, 0 for no limit.
+        """
+        collection_name = generic_class.__name__.lower()
+        find_options = {
+            "sort": sort,
+            "skip": skip,
+            "limit": limit,
+            "batch_size": batch_size,
+        }
+        if settings.DATABASE_ASYNC_DRIVER:
+            async for document in async_db[collection_name].find(query, **find_options):
+                yield Utils.to_class_object(generic_class, document)
+            return
+
+        loop = asyncio.get_event_loop()
+        documents = db[collection_name].find(query, **find_options)
+        try:
+            while True:
+                batch = await loop.run_in_executor(
+                    None, lambda: list(islice(documents, batch_size))
+                )
+                if not batch:
+                    break
+                for document in batch:
+                    yield Utils.to_class_object(generic_class, document)
+        finally:
+            documents.close()
+
+    @staticmethod
+    async def __get_references(
+        collection_name: str, reference_ids: set[ObjectId]
+    ) -> dict[ObjectId, dict[str, Any]]:
+        """fetch referenced documents with a single `$in` query, serving hot
+        reference collections from the in-process LRU cache
+        """
+        reference_cache = ModelUtilityService.__reference_cache
+        cacheable = collection_name in settings.POPULATE_CACHE_COLLECTIONS
+        references: dict[ObjectId, dict[str, Any]] = {}
+        missing_ids = []
+        now = time.monotonic()
+
+        for reference_id in reference_ids:
+            cached_reference = (
+                reference_cache.get((collection_name, reference_id))
+                if cacheable
+                else None
+            )
+            if cached_reference and cached_reference[0] > now:
+                reference_cache.move_to_end((collection_name, reference_id))
+                references[reference_id] = cached_reference[1]
+            else:
+                missing_ids.append(reference_id)
+
+        if not missing_ids:
+            return references
+
+        documents = await ModelUtilityService.__execute_cursor(
+            collection_name, "find", {"_id": {"$in": missing_ids}}
+        )
+        for document in documents:
+            references[document["_id"]] = document
+            if cacheable:
+                reference_cache[(collection_name, document["_id"])] = (
+                    now + settings.POPULATE_CACHE_TTL,
+                    document,
+                )
+                reference_cache.move_to_end((collection_name, document["_id"]))
+                while len(reference_cache) > settings.POPULATE_CACHE_SIZE:
+                    reference_cache.popitem(last=False)
+
+        return references
+
+    @staticmethod
+    def invalidate_reference(
+        collection_name: str, reference_id: ObjectId | None = None
+    ) -> None:
+        """drop a cached reference document, or every cached document of the
+        collection when no id is given
+        """
+        reference_cache = ModelUtilityService.__reference_cache
+        for cache_key in list(reference_cache.keys()):
+            if cache_key[0] == collection_name and reference_id in (None, cache_key[1]):
+                reference_cache.pop(cache_key, None)
+
+    @staticmethod
+    async def populate(
+        documents: list[dict[str, Any]],
+        fields: list[str],
+        preserve_missing: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        populate: replace reference ids in raw documents with the referenced
+        documents, fetching each referenced collection once for the whole batch
+
+        Args:
+            documents (list[dict[str, Any]]): raw documents to populate
+            fields (list[str]): reference fields, nested ones as `parent.field`
+                after the parent field itself
+            preserve_missing (bool, optional): keep documents whose reference
+                is not found, otherwise they are dropped like `$unwind` does.
+        """
+
+        def get_parent(
+            document: dict[str, Any], parent_path: list[str]
+        ) -> dict[str, Any] | None:
+            parent: Any = document
+            for path in parent_path:
+                parent = parent.get(path) if isinstance(parent, dict) else None
+            return parent if isinstance(parent, dict) else None
+
+        for field in fields:
+            *parent_path, key = field.split(".")
+
+            reference_ids = set()
+            for document in documents:
+                parent = get_parent(document, parent_path)
+                if parent and isinstance(parent.get(key), ObjectId):
+                    reference_ids.add(parent[key])
+
+            references = await ModelUtilityService.__get_references(
+                key.lower(), reference_ids
+            )
+
+            populated_documents = []
+            for document in documents:
+                parent = get_parent(document, parent_path)
+                reference_id = parent.get(key) if parent else None
+                if isinstance(reference_id, ObjectId) and reference_id in references:
+                    # copy so nested populates never mutate cached documents
+                    cast(dict[str, Any], parent)[key] = dict(references[reference_id])
+                elif not preserve_missing:
+                    continue
+                populated_documents.append(document)
+            documents = populated_documents
+
+        return documents
+
+    @staticmethod
+    @asynccontextmanager
+    async def transaction() -> AsyncIterator[Any]:
+        """
+        transaction: open a session with a started transaction on the configured
+        mongo driver, committed on exit and aborted if an error is raised
+        """
+        if settings.DATABASE_ASYNC_DRIVER:
+            async with await async_client.start_session() as session:
+                async with session.start_transaction():
+                    yield session
+            return
+
+        # pymongo sessions talk to the server when they are opened, committed,
+        # aborted and ended, all of it runs in the executor like the operations
+        loop = asyncio.get_event_loop()
+        sync_session = await loop.run_in_executor(None, client.start_session)
+        try:
+            sync_session.start_transaction()
+            try:
+                yield sync_session
+            except BaseException:
+                await loop.run_in_executor(None, sync_session.abort_transaction)
+                raise
+            await loop.run_in_executor(None, sync_session.commit_transaction)
+        finally:
+            await loop.run_in_executor(None, sync_session.end_session)
+
+    @staticmethod
+    def encode_cursor(sort_value: Any, document_id: Any) -> str:
+        """
+        encode_cursor: build the opaque keyset pagination cursor pointing
+        after a document
+
+        Args:
+            sort_value (Any): value of the document's sort field
+            document_id (Any): the document's _id
+        """
+        payload = json_util.dumps({"value": sort_value, "id": document_id})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[Any, ObjectId]:
+        try:
+            payload = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return payload["value"], ObjectId(payload["id"])
+        except (binascii.Error, BSONError, ValueError, KeyError, TypeError):
+            raise Exception("invalid pagination cursor")
+
+    @staticmethod
+    def __keyset_query(
+        query: dict[str, Any], sort_field: str, after: str | None
+    ) -> dict[str, Any]:
+        """narrow a query to the documents that come after the `after` cursor
+        when sorting descending by `sort_field` then `_id`
+        """
+        if not after:
+            return query
+
+        sort_value, last_id = ModelUtilityService.decode_cursor(after)
+        return {
+            "$and": [
+                query,
+                {
+                    "$or": [
+                        {sort_field: {"$lt": sort_value}},
+                        {sort_field: sort_value, "_id": {"$lt": last_id}},
+                    ]
+                },
+            ]
+        }
+
+    @staticmethod
+    async def __count(
+        generic_class: Type[T], query: dict[str, Any], count_mode: CountMode
+    ) -> int | None:
+        """count the documents matching a query according to `count_mode`,
+        returns None when totals are skipped
+        """
+        if count_mode == CountMode.NONE:
+            return None
+
+        collection_name = generic_class.__name__.lower()
+        query_key = json_util.dumps(query, sort_keys=True)
+        collection_counts = ModelUtilityService.__count_cache.setdefault(
+            collection_name, {}
+        )
+        if count_mode == CountMode.CACHED:
+            cached_count = collection_counts.get(query_key)
+            if cached_count and cached_count[0] > time.monotonic():
+                return cached_count[1]
+
+        total_count: int = await ModelUtilityService.__execute(
+            generic_class, "count_documents", query
+        )
+
+        if count_mode == CountMode.CACHED:
+            if len(collection_counts) >= settings.PAGINATION_COUNT_CACHE_SIZE:
+                collection_counts.pop(next(iter(collection_counts)))
+            collection_counts[query_key] = (
+                time.monotonic() + settings.PAGINATION_COUNT_CACHE_TTL,
+                total_count,
+            )
+
+        return total_count
+
+    @staticmethod
+    def invalidate_counts(generic_class: Type[T]) -> None:
+        """drop the cached pagination counts of a collection"""
+        ModelUtilityService.__count_cache.pop(generic_class.__name__.lower(), None)
+
+    @staticmethod
+    def __page_meta(
+        page_num: int,
+        page_size: int,
+        total_count: int | None,
+        result_count: int,
+        has_more: bool,
+        next_cursor: str | None,
+    ) -> MetaDataModel:
+        prev_page = (lambda: page_num - 1 if (page_num - 1) > 0 else None)()
+        if total_count is None:
+            next_page = page_num + 1 if has_more else None
+        else:
+            total_page = math.ceil(total_count / page_size)
+            next_page = page_num + 1 if (page_num + 1) <= total_page else None
+
+        return MetaDataModel(
+            page=page_num,
+            perPage=page_size,
+            total=total_count,
+            pageCount=result_count,
+            previousPage=prev_page,
+            nextPage=next_page,
+            nextCursor=next_cursor,
+        )
+
     @staticmethod
     async def paginate_data(
         generic_class: Type[T],
@@ -52,55 +419,61 @@ class ModelUtilityService:
         page_num: int,
         page_size: int,
         sort_field: str = "createdAt",
+        keyset: bool = False,
+        after: str | None = None,
+        count_mode: CountMode = CountMode.EXACT,
     ) -> tuple[list[T], MetaDataModel]:
-        loop = asyncio.get_event_loop()
-        model = db[generic_class.__name__.lower()]
-
         """returns a set of documents belonging to page number `page_num`
         where size of each page is `page_size`.
-        """
-        # Calculate number of documents to skip
-        skips = page_size * (page_num - 1)
 
-        total_count = await loop.run_in_executor(None, model.count_documents, query)
+        in `keyset` mode documents are ordered by `sort_field` then `_id`, the
+        page starts after the `after` cursor instead of skipping documents and
+        `nextCursor` is returned in the metadata.
 
-        total_page = math.ceil(total_count / page_size)
-
-        prev_page = (lambda: page_num - 1 if (page_num - 1) > 0 else None)()
-        next_page = (lambda: page_num + 1 if (page_num + 1) <= total_page else None)()
+        `count_mode` decides if `total` is counted on every call, served from
+        the short lived count cache or skipped.
+        """
+        # Calculate number of documents to skip
+        skips = 0 if keyset and after else page_size * (page_num - 1)
 
-        documents = (
-            (await loop.run_in_executor(None, model.find, query))
-            .sort(sort_field, DESCENDING)
-            .skip(skips)
-            .limit(page_size)
+        total_count = await ModelUtilityService.__count(
+            generic_class, query, count_mode
         )
 
-        # Skip and limit
+        sort = [(sort_field, DESCENDING)]
+        page_query = query
+        if keyset:
+            sort.append(("_id", DESCENDING))
+            page_query = ModelUtilityService.__keyset_query(query, sort_field, after)
+        # fetch one extra document to know if there is a next page
+        limit = page_size + 1
 
-        result = list(documents)
-        result_count = len(result)
+        # Skip and limit
+        result = [
+            document
+            async for document in ModelUtilityService.iter_find(
+                generic_class,
+                page_query,
+                batch_size=limit,
+                sort=sort,
+                skip=skips,
+                limit=limit,
+            )
+        ]
 
-        meta_data = {
-            "page": page_num,
-            "perPage": page_size,
-            "total": total_count,
-            "pageCount": result_count,
-            "previousPage": prev_page,
-            "nextPage": next_page,
-        }
+        has_more = len(result) > page_size
+        result = result[:page_size]
+        next_cursor = (
+            ModelUtilityService.encode_cursor(
+                getattr(result[-1], sort_field), getattr(result[-1], "id")
+            )
+            if keyset and has_more
+            else None
+        )
 
         # Return documents
-        return (
-            list(
-                map(
-                    lambda x: Utils.to_class_object(generic_class, x),
-                    result,
-                )
-            )
-            if result
-            else result,
-            MetaDataModel(**meta_data),
+        return result, ModelUtilityService.__page_meta(
+            page_num, page_size, total_count, len(result), has_more, next_cursor
         )
 
     @staticmethod
@@ -111,87 +484,70 @@ class ModelUtilityService:
         page_num: int = 1,
         page_size: int = 10,
         sort_field: str = "createdAt",
+        keyset: bool = False,
+        after: str | None = None,
+        count_mode: CountMode = CountMode.EXACT,
     ) -> tuple[list[T], MetaDataModel]:
-        model = db[generic_class.__name__.lower()]
         # Calculate number of documents to skip
-        skips = page_size * (page_num - 1)
-
-        pipeline = [
-            {
-                "$facet": {
-                    "pipelineData": [
-                        {
-                            "$match": query,
-                        },
-                        {"$sort": {sort_field: DESCENDING}},
-                        {"$skip": skips},
-                        {"$limit": page_size},
-                    ],
-                    "pipelineCount": [
-                        {
-                            "$match": query,
-                        },
-                        {"$skip": skips},
-                        {"$limit": page_size},
-                        {"$count": "pageCount"},
-                    ],
-                    "totalCount": [
-                        {
-                            "$match": query,
-                        },
-                        {"$count": "count"},
-                    ],
-                }
-            }
-        ]
-
-        for field in fields:
-            lookup = [
+        skips = 0 if keyset and after else page_size * (page_num - 1)
+
+        sort = {sort_field: DESCENDING}
+        page_query = query
+        if keyset:
+            sort["_id"] = DESCENDING
+            page_query = ModelUtilityService.__keyset_query(query, sort_field, after)
+        # fetch one extra document to know if there is a next page
+        limit = page_size + 1
+
+        facet: dict[str, list[dict[str, Any]]] = {
+            "pipelineData": [
                 {
-                    "$lookup": {
-                        "from": field.split(".")[-1].lower(),
-                        "localField": field,
-                        "foreignField": "_id",
-                        "as": field,
-                    }
+                    "$match": page_query,
                 },
+                {"$sort": sort},
+                {"$skip": skips},
+                {"$limit": limit},
+            ],
+        }
+        if count_mode == CountMode.EXACT:
+            facet["totalCount"] = [
                 {
-                    "$unwind": {
-                        "path": f"${field}",
-                        "includeArrayIndex": "arrayIndex",
-                        "preserveNullAndEmptyArrays": True,
-                    }
+                    "$match": query,
                 },
+                {"$count": "count"},
             ]
-            for i, pl in enumerate(lookup):
-                pipeline[0]["$facet"]["pipelineData"].insert(1 + i, pl)
-        loop = asyncio.get_event_loop()
-        aggregation_result = list(
-            await loop.run_in_executor(None, model.aggregate, pipeline)
+        pipeline = [{"$facet": facet}]
+
+        if settings.POPULATE_WITH_LOOKUP:
+            for i, pl in enumerate(ModelUtilityService.__lookup_stages(fields, True)):
+                facet["pipelineData"].insert(1 + i, pl)
+        aggregation_result = await ModelUtilityService.__execute_cursor(
+            generic_class, "aggregate", pipeline
         )
 
         result = aggregation_result[0]["pipelineData"]
-        pipeline_count = aggregation_result[0]["pipelineCount"]
-        pipeline_total_count = aggregation_result[0]["totalCount"]
+        if count_mode == CountMode.EXACT:
+            pipeline_total_count = aggregation_result[0]["totalCount"]
+            total_count: int | None = (
+                pipeline_total_count[0]["count"] if len(pipeline_total_count) > 0 else 0
+            )
+        else:
+            total_count = await ModelUtilityService.__count(
+                generic_class, query, count_mode
+            )
 
-        result_count = pipeline_count[0]["pageCount"] if len(pipeline_count) > 0 else 0
-        total_count = (
-            pipeline_total_count[0]["count"] if len(pipeline_total_count) > 0 else 0
+        has_more = len(result) > page_size
+        result = result[:page_size]
+        next_cursor = (
+            ModelUtilityService.encode_cursor(
+                result[-1].get(sort_field), result[-1]["_id"]
+            )
+            if keyset and has_more
+            else None
         )
+        if not settings.POPULATE_WITH_LOOKUP:
+            result = await ModelUtilityService.populate(result, fields)
 
-        total_page = math.ceil(total_count / page_size)
-
-        prev_page = (lambda: page_num - 1 if (page_num - 1) > 0 else None)()
-        next_page = (lambda: page_num + 1 if (page_num + 1) <= total_page else None)()
-
-        meta_data = {
-            "page": page_num,
-            "perPage": page_size,
-            "total": total_count,
-            "pageCount": result_count,
-            "previousPage": prev_page,
-            "nextPage": next_page,
-        }
         # And there goes the populate function just as mongoose populate works 🚀🕺🏽
         return (
             list(
@@ -202,23 +558,25 @@ class ModelUtilityService:
             )
             if result
             else result,
-            MetaDataModel(**meta_data),
+            ModelUtilityService.__page_meta(
+                page_num, page_size, total_count, len(result), has_more, next_cursor
+            ),
         )
 
     @staticmethod
-    async def find_one_and_populate(
-        generic_class: Type[T],
-        query: dict[str, Any],
-        fields: list[str],
-    ) -> T | None:
-        model = db[generic_class.__name__.lower()]
-        pipeline: list[dict[str, Any]] = [
-            {
-                "$match": query,
-            },
-        ]
+    def __lookup_stages(
+        fields: list[str], preserve_missing: bool
+    ) -> list[dict[str, Any]]:
+        """`$lookup` + `$unwind` stages populating `fields`, used instead of
+        the batched populate when `POPULATE_WITH_LOOKUP` is set
+        """
+        stages: list[dict[str, Any]] = []
         for field in fields:
-            lookup: list[dict[str, Any]] = [
+            unwind: dict[str, Any] = {"path": f"${field}"}
+            if preserve_missing:
+                unwind["includeArrayIndex"] = "arrayIndex"
+                unwind["preserveNullAndEmptyArrays"] = True
+            stages += [
                 {
                     "$lookup": {
                         "from": field.split(".")[-1].lower(),
@@ -227,25 +585,44 @@ class ModelUtilityService:
                         "as": field,
                     }
                 },
-                {
-                    "$unwind": {
-                        "path": f"${field}",
-                        "includeArrayIndex": "arrayIndex",
-                        "preserveNullAndEmptyArrays": True,
-                    }
-                },
+                {"$unwind": unwind},
             ]
-            pipeline += lookup
+        return stages
+
+    @staticmethod
+    async def find_one_and_populate(
+        generic_class: Type[T],
+        query: dict[str, Any],
+        fields: list[str],
+    ) -> T | None:
+        if not settings.POPULATE_WITH_LOOKUP:
+            document = await ModelUtilityService.__execute(
+                generic_class, "find_one", query
+            )
+            if not document:
+                return None
+            [aggregation_result] = await ModelUtilityService.populate(
+                [document], fields
+            )
+            return generic_class(**aggregation_result)
+
+        pipeline: list[dict[str, Any]] = [
+            {
+                "$match": query,
+            },
+        ]
+        pipeline += ModelUtilityService.__lookup_stages(fields, True)
 
         pipeline += [{"$limit": 1}]
-        loop = asyncio.get_event_loop()
-        result = list(await loop.run_in_executor(None, model.aggregate, pipeline))
+        result = await ModelUtilityService.__execute_cursor(
+            generic_class, "aggregate", pipeline
+        )
 
-        aggregation_result = None
-        if result:
-            [aggregation_result] = result
+        if not result:
+            return None
+        [aggregation_result] = result
 
-        return generic_class(**aggregation_result) if aggregation_result else None
+        return generic_class(**aggregation_result)
 
     @staticmethod
     async def find_and_populate(
@@ -253,28 +630,21 @@ class ModelUtilityService:
         query: dict[str, Any],
         fields: list[str],
     ) -> list[T]:
-        model = db[generic_class.__name__.lower()]
-        loop = asyncio.get_event_loop()
-        pipeline = [
-            {
-                "$match": query,
-            },
-        ]
-
-        for field in fields:
-            lookup = [
+        if settings.POPULATE_WITH_LOOKUP:
+            pipeline = [
                 {
-                    "$lookup": {
-                        "from": field.split(".")[-1].lower(),
-                        "localField": field,
-                        "foreignField": "_id",
-                        "as": field,
-                    }
+                    "$match": query,
                 },
-                {"$unwind": {"path": f"${field}"}},
             ]
-            pipeline += lookup
-        results = await loop.run_in_executor(None, model.aggregate, pipeline)
+            pipeline += ModelUtilityService.__lookup_stages(fields, False)
+            results = await ModelUtilityService.__execute_cursor(
+                generic_class, "aggregate", pipeline
+            )
+        else:
+            documents = await ModelUtilityService.__execute_cursor(
+                generic_class, "find", query
+            )
+            results = await ModelUtilityService.populate(documents, fields, False)
 
         if not results:
             return []
@@ -287,10 +657,14 @@ class ModelUtilityService:
         )
 
     @staticmethod
-    async def find_one(generic_class: Type[T], query: dict[str, Any]) -> T | None:
-        model = db[generic_class.__name__.lower()]
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, model.find_one, query)
+    async def find_one(
+        generic_class: Type[T],
+        query: dict[str, Any],
+        sort: list[tuple[str, int]] | None = None,
+    ) -> T | None:
+        result = await ModelUtilityService.__execute(
+            generic_class, "find_one", query, sort=sort
+        )
 
         return generic_class(**result) if result else None
 
@@ -302,42 +676,51 @@ class ModelUtilityService:
         return generic_class(**result) if result else None
 
     @staticmethod
-    async def find(generic_class: Type[T], query: dict[str, Any]) -> list[T]:
-        loop = asyncio.get_event_loop()
-        model = db[generic_class.__name__.lower()]
-
-        results = await loop.run_in_executor(None, model.find, query)
-        if not results:
-            return []
-
-        return list(
-            map(
-                lambda x: Utils.to_class_object(generic_class, x),
-                results,
+    async def find(
+        generic_class: Type[T],
+        query: dict[str, Any],
+        batch_size: int = settings.DATABASE_BATCH_SIZE,
+    ) -> list[T]:
+        return [
+            document
+            async for document in ModelUtilityService.iter_find(
+                generic_class, query, batch_size
             )
-        )
+        ]
 
     @staticmethod
     async def model_create(
         generic_class: Type[T],
         record: dict[str, Any],
         session: ClientSession | None = None,
+        refetch: bool = False,
     ) -> T:
-        model = db[generic_class.__name__.lower()]
-        loop = asyncio.get_event_loop()
-
-        created_record = await loop.run_in_executor(
-            None, model.insert_one, record, False, session
+        """
+        model_create: insert a record and return it as a class object
+
+        Args:
+            generic_class (Type[T]): model class whose collection is used
+            record (dict[str, Any]): document to insert
+            session (ClientSession | None, optional): transaction session.
+            refetch (bool, optional): read the stored document back from the
+                server instead of building it from the inserted record.
+        """
+        created_record = await ModelUtilityService.__execute(
+            generic_class, "insert_one", record, session=session
         )
+        ModelUtilityService.invalidate_counts(generic_class)
 
-        def find_one() -> Any | None:
-            return model.find_one(
-                {"_id": ObjectId(created_record.inserted_id)}, session=session
+        if refetch:
+            res = await ModelUtilityService.__execute(
+                generic_class,
+                "find_one",
+                {"_id": ObjectId(created_record.inserted_id)},
+                session=session,
             )
 
-        res = await loop.run_in_executor(None, find_one)
+            return generic_class(**res)
 
-        return generic_class(**res)
+        return generic_class(**{**record, "_id": created_record.inserted_id})
 
     @staticmethod
     async def model_update(
@@ -346,17 +729,62 @@ class ModelUtilityService:
         record: dict[str, Any],
         session: ClientSession | None = None,
     ) -> UpdateResult:
-        model = db[generic_class.__name__.lower()]
         record["updatedAt"] = datetime.now()
-        loop = asyncio.get_event_loop()
-
-        def update_one() -> UpdateResult:
-            return model.update_one(query, {"$set": record}, session=session)
 
-        updated_record = await loop.run_in_executor(None, update_one)
+        updated_record = await ModelUtilityService.__execute(
+            generic_class, "update_one", query, {"$set": record}, session=session
+        )
+        # updates change which count queries a document matches, e.g. soft deletes
+        ModelUtilityService.invalidate_counts(generic_class)
 
         return updated_record
 
+    @staticmethod
+    async def model_update_many(
+        generic_class: Type[T],
+        query: dict[str, Any],
+        record: dict[str, Any],
+        session: ClientSession | None = None,
+    ) -> UpdateResult:
+        record["updatedAt"] = datetime.now()
+
+        updated_records = await ModelUtilityService.__execute(
+            generic_class, "update_many", query, {"$set": record}, session=session
+        )
+        ModelUtilityService.invalidate_counts(generic_class)
+
+        return updated_records
+
+    @staticmethod
+    async def model_bulk_update(
+        generic_class: Type[T],
+        updates: list[tuple[dict[str, Any], dict[str, Any]]],
+        session: ClientSession | None = None,
+    ) -> BulkWriteResult | None:
+        """
+        model_bulk_update: apply many (query, record) `$set` updates in one
+        unordered bulk write
+
+        Args:
+            updates (list[tuple[dict[str, Any], dict[str, Any]]]): query and
+                record pairs, each updating a single document
+        """
+        if not updates:
+            return None
+
+        updated_at = datetime.now()
+        operations = [
+            UpdateOne(query, {"$set": {**record, "updatedAt": updated_at}})
+            for query, record in updates
+        ]
+
+        bulk_result = await ModelUtilityService.__execute(
+            generic_class, "bulk_write", operations, ordered=False, session=session
+        )
+        ModelUtilityService.invalidate_counts(generic_class)
+
+        return bulk_result
+
     @staticmethod
     async def model_find_one_and_update(
         generic_class: Type[T],
@@ -366,24 +794,22 @@ class ModelUtilityService:
         session: ClientSession | None = None,
         updateAction: UpdateAction = UpdateAction.SET,
     ) -> T | None:
-        loop = asyncio.get_event_loop()
-        model = db[generic_class.__name__.lower()]
         update_payload = {"$set": {"updatedAt": datetime.now()}}
         if updateAction == UpdateAction.SET:
             update_payload["$set"] = {**record, **update_payload["$set"]}
         else:
             update_payload[updateAction.value] = record
 
-        def find_one_and_update() -> Any:
-            return model.find_one_and_update(
-                query,
-                update_payload,
-                upsert=upsert,
-                return_document=ReturnDocument.AFTER,
-                session=session,
-            )
-
-        updated_record = await loop.run_in_executor(None, find_one_and_update)
+        updated_record = await ModelUtilityService.__execute(
+            generic_class,
+            "find_one_and_update",
+            query,
+            update_payload,
+            upsert=upsert,
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+        ModelUtilityService.invalidate_counts(generic_class)
 
         return generic_class(**updated_record) if updated_record else None
 
@@ -391,18 +817,15 @@ class ModelUtilityService:
     async def model_find_one_or_create(
         generic_class: Type[T], query: dict[str, Any], record: dict[str, Any]
     ) -> T:
-        loop = asyncio.get_event_loop()
-        model = db[generic_class.__name__.lower()]
-
-        def find_one_and_update() -> Any:
-            return model.find_one_and_update(
-                query,
-                {"$setOnInsert": record},
-                upsert=True,
-                return_document=ReturnDocument.AFTER,
-            )
-
-        result = await loop.run_in_executor(None, find_one_and_update)
+        result = await ModelUtilityService.__execute(
+            generic_class,
+            "find_one_and_update",
+            query,
+            {"$setOnInsert": record},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        ModelUtilityService.invalidate_counts(generic_class)
 
         return generic_class(**result)
 
@@ -413,28 +836,51 @@ class ModelUtilityService:
         session: ClientSession | None = None,
     ) -> InsertManyResult | None:
         try:
-            loop = asyncio.get_event_loop()
-            model = db[generic_class.__name__.lower()]
-            created_records = await loop.run_in_executor(
-                None,
-                model.insert_many,
+            created_records = await ModelUtilityService.__execute(
+                generic_class,
+                "insert_many",
                 records,
-                False,
-                False,
-                session,
+                ordered=False,
+                bypass_document_validation=False,
+                session=session,
             )
+            ModelUtilityService.invalidate_counts(generic_class)
 
             return created_records
         except Exception as e:
             logger.error(f"Error inserting many records - {str(e)}")
             raise e
 
+    @staticmethod
+    async def model_bulk_create(
+        generic_class: Type[T],
+        records: list[dict[str, Any]],
+        session: ClientSession | None = None,
+    ) -> list[T]:
+        """
+        model_bulk_create: insert many records and return them as class objects
+        built from the inserted documents
+        """
+        created_records = await ModelUtilityService.model_create_many(
+            generic_class, records, session
+        )
+        if not created_records:
+            return []
+
+        return list(
+            map(
+                lambda x: Utils.to_class_object(generic_class, {**x[0], "_id": x[1]}),
+                zip(records, created_records.inserted_ids),
+            )
+        )
+
     @staticmethod
     async def model_hard_delete(
         generic_class: Type[T], query: dict[str, Any]
     ) -> DeleteResult:
-        loop = asyncio.get_event_loop()
-        model = db[generic_class.__name__.lower()]
-        deleted_record = await loop.run_in_executor(None, model.delete_one, query)
+        deleted_record = await ModelUtilityService.__execute(
+            generic_class, "delete_one", query
+        )
+        ModelUtilityService.invalidate_counts(generic_class)
 
         return deleted_record
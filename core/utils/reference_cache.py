@@ -0,0 +1,121 @@
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Generic,
+    Optional,
+    TypeVar,
+    get_args,
+)
+
+from bson import json_util
+
+from core.config import settings
+from core.db import CursorModel
+from core.utils.loggly import logger
+from core.utils.model_utility_service import ModelUtilityService
+from core.utils.shared_cache import SharedCache
+
+V = TypeVar("V")
+
+
+class ReferenceCache(Generic[V]):
+    """
+    ReferenceCache: read-through cache for reference data (blockchains,
+    networks, token assets, defi providers) that only changes when it is seeded
+
+    entries are keyed by the query they were loaded with, expire after `ttl`
+    seconds, are evicted least recently used first past `maxsize` and are
+    dropped whenever one of the `collections` they are built from changes
+    """
+
+    caches: ClassVar[list["ReferenceCache[Any]"]] = []
+
+    def __init__(
+        self,
+        name: str,
+        collections: list[str],
+        ttl: int = settings.REFERENCE_CACHE_TTL,
+        maxsize: int = settings.REFERENCE_CACHE_SIZE,
+    ) -> None:
+        self.name = name
+        self.collections = collections
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+        self.sharedCache: Optional[SharedCache] = None
+        ReferenceCache.caches.append(self)
+
+    def get_shared_cache(self) -> Optional[SharedCache]:
+        # the value type is only known from the subscripted class, e.g.
+        # ReferenceCache[Network](...)
+        if not SharedCache.is_enabled() or not hasattr(self, "__orig_class__"):
+            return None
+        if not self.sharedCache:
+            self.sharedCache = SharedCache(
+                f"reference:{self.name}", get_args(self.__orig_class__)[0]
+            )
+        return self.sharedCache
+
+    async def get(
+        self, query: dict[str, Any], loader: Callable[[], Awaitable[V | None]]
+    ) -> V | None:
+        """
+        get: cached value of a query, loaded on a miss. a loader that finds
+        nothing returns None, which is passed through and never cached
+        """
+        key = json_util.dumps(query, sort_keys=True)
+        entry = self.entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[1]
+
+        self.misses += 1
+        shared_cache = self.get_shared_cache()
+        value = (
+            await shared_cache.get_or_load(key, loader, self.ttl)
+            if shared_cache
+            else await loader()
+        )
+        if value is not None:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+        return value
+
+    async def invalidate(self) -> None:
+        self.entries.clear()
+        shared_cache = self.get_shared_cache()
+        if shared_cache:
+            await shared_cache.invalidate()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+    @classmethod
+    async def invalidate_collection(cls, collection_name: str) -> None:
+        ModelUtilityService.invalidate_reference(collection_name)
+        for cache in cls.caches:
+            if collection_name in cache.collections:
+                logger.info(f"invalidating {cache.name} reference cache")
+                await cache.invalidate()
+
+    @classmethod
+    def get_stats(cls) -> dict[str, dict[str, int]]:
+        return {cache.name: cache.stats() for cache in cls.caches}
+
+    @classmethod
+    def get_collections(cls) -> list[str]:
+        return list({name for cache in cls.caches for name in cache.collections})
+
+    @classmethod
+    async def handle_change(cls, event: CursorModel[Any]) -> None:
+        await cls.invalidate_collection(event.ns.coll)
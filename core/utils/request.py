@@ -1,23 +1,180 @@
 import asyncio
+import random
 from enum import Enum
-from typing import Any, Optional, Type, TypeVar
-import requests
+from typing import Any, AsyncIterator, Optional, Type, TypeVar
 
+import httpx
+import ijson
+
+from core.config import settings
 from core.utils.loggly import logger
 
+# retried for idempotent methods only, a 502/504 gateway may answer after the
+# upstream already handled the request
+RETRY_STATUS_CODES = [429, 502, 503, 504]
+IDEMPOTENT_METHODS = ["GET", "HEAD"]
+
+SKIPPED_EVENTS = ["start_array", "end_array", "map_key"]
+
 
 class REQUEST_METHOD(str, Enum):
     POST = "POST"
     GET = "GET"
 
 
+class ResponseStream:
+    """
+    ResponseStream: file like reader over a streamed httpx response for ijson
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        self.chunks = response.aiter_bytes()
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the type of the stream with a zero sized read
+        if size == 0:
+            return b""
+        try:
+            return await self.chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
+async def iter_items(response: httpx.Response, prefix: str) -> AsyncIterator[Any]:
+    """
+    iter_items: items of the array at `prefix` of a streamed json response
+
+    an error payload carrying something other than an array where the items are
+    expected, e.g. a rate limit message string, is raised with the top level
+    fields of the response rather than read as an empty list
+    """
+    parent = prefix.rpartition(".")[0]
+    envelope: dict[str, Any] = {}
+    builder: Optional[ijson.ObjectBuilder] = None
+    async for event_prefix, event, value in ijson.parse_async(
+        ResponseStream(response), use_float=True
+    ):
+        if builder:
+            builder.event(event, value)
+            if event_prefix == prefix and event in ("end_map", "end_array"):
+                yield builder.value
+                builder = None
+        elif event_prefix == prefix and event in ("start_map", "start_array"):
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif event_prefix == prefix and event != "map_key":
+            yield value
+        elif event_prefix == parent and event not in SKIPPED_EVENTS:
+            envelope[parent or "response"] = value
+            raise Exception(f"expected an array at {parent or 'root'}, got {envelope}")
+        elif event_prefix and "." not in event_prefix and event not in SKIPPED_EVENTS:
+            envelope[event_prefix] = value
+
+
 class HTTPRepository:
+    """
+    HTTPRepository: async http client for the external integrations
+
+    every repository shares one httpx client, so connections are pooled per host
+    across services and negotiate HTTP/2 where the server supports it. requests
+    failing on a connection error, a timeout or a 429/5xx gateway status are
+    retried `HTTP_RETRIES` times with full jitter exponential backoff. other
+    methods, POSTs included, are only retried when the request was never sent
+    (a connect error or a pool/connect timeout) or on a 429 with a
+    `Retry-After`, so non idempotent calls are never sent twice
+    """
+
     T = TypeVar("T")
+    client: httpx.AsyncClient | None = None
 
     def __init__(self, base_url: Optional[str] = None, headers: Any = None) -> None:
         self.base_url = base_url
-        self.headers = headers
-        self.session = requests.Session()
+        self.headers = (
+            {key: value for key, value in headers.items() if value is not None}
+            if headers
+            else None
+        )
+
+    @staticmethod
+    def get_client() -> httpx.AsyncClient:
+        # kept on HTTPRepository itself, subclasses share the client and close()
+        # closes it
+        if not HTTPRepository.client or HTTPRepository.client.is_closed:
+            HTTPRepository.client = httpx.AsyncClient(
+                http2=settings.HTTP_ENABLE_HTTP2,
+                timeout=httpx.Timeout(
+                    settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            )
+
+        return HTTPRepository.client
+
+    @staticmethod
+    async def close() -> None:
+        if HTTPRepository.client:
+            await HTTPRepository.client.aclose()
+            HTTPRepository.client = None
+
+    def build_request(
+        self, method: REQUEST_METHOD, url: str, data: Any | None = None
+    ) -> httpx.Request:
+        url = self.base_url + url if self.base_url else url
+        # raw bodies are sent as is, mappings form encoded
+        if isinstance(data, (str, bytes)):
+            return self.get_client().build_request(
+                method.name, url, headers=self.headers, content=data
+            )
+
+        return self.get_client().build_request(
+            method.name, url, headers=self.headers, data=data
+        )
+
+    @staticmethod
+    def should_retry(request: httpx.Request, error: Exception) -> bool:
+        idempotent = request.method in IDEMPOTENT_METHODS
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            if idempotent:
+                return status_code in RETRY_STATUS_CODES
+            return status_code == 429 and "Retry-After" in error.response.headers
+        if isinstance(
+            error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+        ):
+            return True
+        return idempotent and isinstance(error, httpx.TransportError)
+
+    @staticmethod
+    def get_retry_delay(error: Exception, attempt: int) -> float:
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = error.response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), settings.HTTP_TIMEOUT)
+        return random.uniform(0, settings.HTTP_RETRY_BACKOFF * 2**attempt)
+
+    async def send_request(
+        self, request: httpx.Request, stream: bool = False
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self.get_client().send(request, stream=stream)
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError:
+                    await response.aclose()
+                    raise
+                return response
+            except Exception as e:
+                if attempt >= settings.HTTP_RETRIES or not self.should_retry(
+                    request, e
+                ):
+                    raise
+                attempt += 1
+                await asyncio.sleep(self.get_retry_delay(e, attempt))
 
     async def call(
         self,
@@ -28,24 +185,40 @@ class HTTPRepository:
         opts: Any | None = None,
     ) -> T:
         try:
-            url = self.base_url + url if self.base_url else url
-
-            def run_req() -> requests.Response:
-                req: requests.Response = self.session.request(
-                    method.name,
-                    url,
-                    data=data,
-                    headers=self.headers,
-                )
-                req.raise_for_status()
-                return req
-
-            loop = asyncio.get_event_loop()
-            req = await loop.run_in_executor(None, run_req)
-
-            if type(req.json()) is list:
-                return generic_class(**{"data": req.json(), "message": "success"})
-            return generic_class(**req.json())
+            req = await self.send_request(self.build_request(method, url, data))
+
+            res = req.json()
+            if type(res) is list:
+                return generic_class(**{"data": res, "message": "success"})
+            return generic_class(**res)
         except Exception as e:
             logger.error(f"Error making request call - {str(e)}")
             raise Exception(str(e))
+
+    async def stream(
+        self,
+        method: REQUEST_METHOD,
+        url: str,
+        generic_class: Type[T],
+        prefix: str = "item",
+        data: Any | None = None,
+    ) -> AsyncIterator[T]:
+        """
+        stream: parse the items of a large json response as they are received
+
+        Args:
+            prefix (str): ijson path of the items, `item` for a top level array and
+                e.g. `result.item` for an array under the `result` key
+        """
+        try:
+            req = await self.send_request(
+                self.build_request(method, url, data), stream=True
+            )
+            try:
+                async for item in iter_items(req, prefix):
+                    yield generic_class(**item)
+            finally:
+                await req.aclose()
+        except Exception as e:
+            logger.error(f"Error streaming request call - {str(e)}")
+            raise Exception(str(e))
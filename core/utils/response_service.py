@@ -14,6 +14,7 @@ class MetaDataModel(BaseModel):
     pageCount: Optional[int] = None
     previousPage: Optional[int] = None
     nextPage: Optional[int] = None
+    nextCursor: Optional[str] = None
 
 
 class ResponseModel(BaseModel, Generic[T]):
@@ -0,0 +1,144 @@
+import asyncio
+import uuid
+from io import BytesIO
+from typing import Any, BinaryIO, cast
+
+from boto3 import client
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
+
+from core.config import settings
+
+# returned for every upload outside dev, where nothing is written to the bucket
+PLACEHOLDER_FILE_URL = (
+    "https://s3-us-west-2.amazonaws.com/verifi-app-bucket/"
+    + "1bad0760-22c5-4ac6-bcac-c963193e393063080868bcec8b55dc441a19"
+)
+
+
+class S3Uploader:
+    """
+    S3Uploader: long lived uploader sharing one pooled boto3 client
+
+    objects above `S3_MULTIPART_THRESHOLD` bytes are sent as concurrent multipart
+    uploads, async uploads run in the thread pool with at most
+    `S3_MAX_CONCURRENT_UPLOADS` in flight and the bucket region is looked up once,
+    in the thread pool during warm-up
+    """
+
+    def __init__(self, bucket_name: str = settings.S3_BUCKET_NAME) -> None:
+        self.bucket_name = bucket_name
+        self.s3_client: Any = None
+        self.region: str | None = None
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_THRESHOLD,
+            max_concurrency=settings.S3_MAX_POOL_CONNECTIONS,
+        )
+        self.semaphore = asyncio.Semaphore(settings.S3_MAX_CONCURRENT_UPLOADS)
+
+    def get_client(self) -> Any:
+        # boto3 clients are thread safe, one pooled client serves every upload
+        if not self.s3_client:
+            self.s3_client = client(
+                "s3",
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                config=BotoConfig(
+                    max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS
+                ),
+            )
+
+        return self.s3_client
+
+    def get_region(self) -> str:
+        # a blocking call on a miss, async code goes through load_region
+        if not self.region:
+            self.region = (
+                settings.S3_BUCKET_REGION
+                or self.get_client().get_bucket_location(Bucket=self.bucket_name)[
+                    "LocationConstraint"
+                ]
+                # buckets in us-east-1 have no location constraint
+                or "us-east-1"
+            )
+
+        return self.region
+
+    async def load_region(self) -> str:
+        if not self.region:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self.get_region)
+
+        return cast(str, self.region)
+
+    def get_url(self, file_name: str) -> str:
+        return "https://s3-{}.amazonaws.com/{}/{}".format(
+            self.get_region(), self.bucket_name, file_name
+        )
+
+    async def get_file_url(self, file_name: str) -> str:
+        await self.load_region()
+        return self.get_url(file_name)
+
+    def exists_sync(self, file_name: str) -> bool:
+        if not settings.IS_DEV:
+            return False
+        try:
+            self.get_client().head_object(Bucket=self.bucket_name, Key=file_name)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ["404", "NoSuchKey"]:
+                return False
+            raise
+
+    def upload_sync(
+        self,
+        file_name: str,
+        body: bytes | BinaryIO,
+        content_type: str | None = None,
+        unique: bool = True,
+    ) -> str:
+        """
+        upload_sync: upload bytes or a readable binary buffer and return its url
+
+        Args:
+            unique (bool): prefix the file name with a uuid so uploads never
+                overwrite each other, turn off for content addressed names
+        """
+        if not settings.IS_DEV:
+            return PLACEHOLDER_FILE_URL
+
+        if unique:
+            file_name = "{}{}".format(uuid.uuid4(), file_name)
+        self.get_client().upload_fileobj(
+            BytesIO(body) if isinstance(body, bytes) else body,
+            self.bucket_name,
+            file_name,
+            ExtraArgs={"ContentType": content_type} if content_type else None,
+            Config=self.transfer_config,
+        )
+
+        return self.get_url(file_name)
+
+    async def exists(self, file_name: str) -> bool:
+        loop = asyncio.get_event_loop()
+        async with self.semaphore:
+            return await loop.run_in_executor(None, self.exists_sync, file_name)
+
+    async def upload(
+        self,
+        file_name: str,
+        body: bytes | BinaryIO,
+        content_type: str | None = None,
+        unique: bool = True,
+    ) -> str:
+        loop = asyncio.get_event_loop()
+        async with self.semaphore:
+            return await loop.run_in_executor(
+                None, self.upload_sync, file_name, body, content_type, unique
+            )
+
+
+s3Uploader = S3Uploader()
@@ -0,0 +1,227 @@
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Hashable,
+    Optional,
+    get_type_hints,
+)
+
+import msgpack
+from bson import ObjectId
+from pydantic import TypeAdapter
+from redis import asyncio as aioredis
+
+from core.config import settings
+from core.utils.loggly import logger
+
+OBJECT_ID_EXT = 1
+DATETIME_EXT = 2
+
+
+def encode_ext(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return msgpack.ExtType(OBJECT_ID_EXT, value.binary)
+    if isinstance(value, datetime):
+        return msgpack.ExtType(DATETIME_EXT, value.isoformat().encode())
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"cannot serialize {type(value).__name__} for the shared cache")
+
+
+def decode_ext(code: int, data: bytes) -> Any:
+    if code == OBJECT_ID_EXT:
+        return ObjectId(data)
+    if code == DATETIME_EXT:
+        return datetime.fromisoformat(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+class SharedCacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        ...
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        return None
+
+
+class MemoryCacheBackend(SharedCacheBackend):
+    """
+    MemoryCacheBackend: in-process stand-in for redis, for a single worker and
+    tests
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[str, tuple[Optional[float], bytes]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        if entry[0] is not None and entry[0] <= time.monotonic():
+            self.entries.pop(key, None)
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        self.entries[key] = (time.monotonic() + ttl if ttl else None, value)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self.entries if key.startswith(prefix)]:
+            self.entries.pop(key, None)
+
+
+class RedisCacheBackend(SharedCacheBackend):
+    def __init__(self, url: str) -> None:
+        self.redis = aioredis.from_url(
+            url,
+            socket_timeout=settings.SHARED_CACHE_TIMEOUT,
+            socket_connect_timeout=settings.SHARED_CACHE_TIMEOUT,
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        await self.redis.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        keys = [key async for key in self.redis.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await self.redis.delete(*keys)
+
+    async def close(self) -> None:
+        await self.redis.close()
+
+
+class SharedCache:
+    """
+    SharedCache: second cache tier shared by every worker, behind the
+    in-process caches
+
+    values are validated and serialized with a pydantic TypeAdapter of
+    `value_type` and packed with msgpack. the backend is picked from
+    `SHARED_CACHE_URL`, `redis://...` for redis, `memory://` for the in-process
+    stand-in, empty to disable the tier. backend errors are logged and treated
+    as misses, so the caches fall back to the loader
+    """
+
+    backend: ClassVar[Optional[SharedCacheBackend]] = None
+
+    def __init__(self, namespace: str, value_type: Any) -> None:
+        self.namespace = namespace
+        self.adapter: TypeAdapter[Any] = TypeAdapter(value_type)
+
+    @classmethod
+    def get_backend(cls) -> Optional[SharedCacheBackend]:
+        if not cls.backend and settings.SHARED_CACHE_URL:
+            cls.backend = (
+                MemoryCacheBackend()
+                if settings.SHARED_CACHE_URL.startswith("memory://")
+                else RedisCacheBackend(settings.SHARED_CACHE_URL)
+            )
+
+        return cls.backend
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return bool(settings.SHARED_CACHE_URL)
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls.backend:
+            await cls.backend.close()
+            cls.backend = None
+
+    def get_prefix(self) -> str:
+        return f"{settings.SHARED_CACHE_PREFIX}:{self.namespace}:"
+
+    def get_key(self, key: Hashable) -> str:
+        # keys are built from strings, numbers and tuples, their repr is stable
+        # across processes unlike their hash
+        return self.get_prefix() + hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def pack(self, value: Any) -> bytes:
+        return msgpack.packb(
+            self.adapter.dump_python(value, by_alias=True), default=encode_ext
+        )
+
+    def unpack(self, data: bytes) -> Any:
+        return self.adapter.validate_python(msgpack.unpackb(data, ext_hook=decode_ext))
+
+    async def get(self, key: Hashable) -> tuple[bool, Any]:
+        backend = self.get_backend()
+        if not backend:
+            return False, None
+        try:
+            data = await backend.get(self.get_key(key))
+            if data is None:
+                return False, None
+            return True, self.unpack(data)
+        except Exception as e:
+            logger.error(f"Error reading {self.namespace} shared cache - {str(e)}")
+            return False, None
+
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        backend = self.get_backend()
+        if not backend or value is None:
+            return
+        try:
+            await backend.set(self.get_key(key), self.pack(value), ttl)
+        except Exception as e:
+            logger.error(f"Error writing {self.namespace} shared cache - {str(e)}")
+
+    async def get_or_load(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]], ttl: Optional[float]
+    ) -> Any:
+        hit, value = await self.get(key)
+        if hit:
+            return value
+        value = await fn()
+        await self.set(key, value, ttl)
+        return value
+
+    async def invalidate(self) -> None:
+        backend = self.get_backend()
+        if not backend:
+            return
+        try:
+            await backend.delete_prefix(self.get_prefix())
+        except Exception as e:
+            logger.error(f"Error clearing {self.namespace} shared cache - {str(e)}")
+
+
+def get_function_cache(func: Callable[..., Any]) -> Callable[[], Optional[SharedCache]]:
+    """
+    get_function_cache: lazily built SharedCache of a coroutine function, typed by
+    its return annotation, None while the shared tier is disabled
+    """
+    shared_caches: list[SharedCache] = []
+
+    def get_shared_cache() -> Optional[SharedCache]:
+        if not SharedCache.is_enabled():
+            return None
+        if not shared_caches:
+            shared_caches.append(
+                SharedCache(func.__qualname__, get_type_hints(func)["return"])
+            )
+        return shared_caches[0]
+
+    return get_shared_cache
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+from core.utils.loggly import logger
+from core.utils.shared_cache import SharedCache, get_function_cache
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    SingleFlight: concurrent calls for the same key share one in-flight call
+    """
+
+    def __init__(self) -> None:
+        self.calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self.calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self.calls.get(key)
+        if not future:
+            future = asyncio.ensure_future(fn())
+            self.calls[key] = future
+
+            def done(f: asyncio.Future[Any]) -> None:
+                self.calls.pop(key, None)
+                # the error is raised to the waiters, if any are left
+                if not f.cancelled():
+                    f.exception()
+
+            future.add_done_callback(done)
+
+        # a cancelled waiter must not cancel the call the others wait on
+        return await asyncio.shield(future)
+
+
+class SingleFlightCache:
+    """
+    SingleFlightCache: results kept for `ttl` seconds and loaded through a
+    SingleFlight, expired results are served for `stale_ttl` more seconds while a
+    single background call refreshes them
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        stale_ttl: int = 0,
+        maxsize: int = 128,
+        shared: Optional[Callable[[], Optional[SharedCache]]] = None,
+    ) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.shared = shared
+        self.flight = SingleFlight()
+        self.entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.refreshes: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        # a result another worker loaded within its ttl is used as is
+        shared_cache = self.shared() if self.shared else None
+        value = (
+            await shared_cache.get_or_load(key, fn, self.ttl)
+            if shared_cache
+            else await fn()
+        )
+        self.entries[key] = (time.monotonic(), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return value
+
+    async def revalidate(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> None:
+        try:
+            await self.flight.do(key, lambda: self.load(key, fn))
+        except Exception as e:
+            logger.error(f"Error refreshing cached {key} - {str(e)}")
+
+    async def get(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        entry = self.entries.get(key)
+        if entry:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.entries.move_to_end(key)
+                return entry[1]
+            if age < self.ttl + self.stale_ttl:
+                if not self.flight.in_flight(key):
+                    refresh = asyncio.create_task(self.revalidate(key, fn))
+                    self.refreshes.add(refresh)
+                    refresh.add_done_callback(self.refreshes.discard)
+                return entry[1]
+
+        return await self.flight.do(key, lambda: self.load(key, fn))
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+def single_flight(  # type: ignore
+    ttl: int, stale_ttl: int = 0, maxsize: int = 128, shared: bool = False
+):
+    """
+    single_flight: cache the result of an async method for `ttl` seconds,
+    coalescing concurrent calls with the same arguments into one call
+
+    Args:
+        ttl (int): seconds a result is fresh
+        stale_ttl (int, optional): seconds after `ttl` an expired result is still
+            served while a single background call refreshes it. Defaults to 0.
+        maxsize (int, optional): results kept, least recently used evicted.
+            Defaults to 128.
+        shared (bool, optional): read and write results through the SharedCache
+            tier, serialized as the return annotation. Defaults to False.
+    """
+
+    def wrapper(func):  # type: ignore
+        cache = SingleFlightCache(
+            ttl, stale_ttl, maxsize, get_function_cache(func) if shared else None
+        )
+
+        @wraps(func)
+        async def wrapped_func(self, *args, **kwargs):  # type: ignore
+            # results are shared between instances of the service
+            key = (args, tuple(sorted(kwargs.items())))
+            return await cache.get(key, lambda: func(self, *args, **kwargs))
+
+        wrapped_func.cache_clear = cache.clear  # type: ignore
+        return wrapped_func
+
+    return wrapper
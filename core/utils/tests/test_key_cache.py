@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+from unittest.mock import patch
+
+from core.utils.key_cache import DerivedKeyCache
+
+MNEMONIC = "test test test test test test test test test test test junk"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDerivedKeyCache(TestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        patcher = patch("core.utils.key_cache.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.calls = 0
+
+    def derive(self) -> bytes:
+        self.calls += 1
+        return bytes([self.calls]) * 32
+
+    def get_key_material(self, cache: DerivedKeyCache) -> bytearray:
+        return next(iter(cache.entries.values()))[1]
+
+    def test_derives_once_within_ttl(self) -> None:
+        cache = DerivedKeyCache(ttl=10, maxsize=8)
+
+        assert cache.get("evm", MNEMONIC, self.derive) == bytes([1]) * 32
+        assert cache.get("evm", MNEMONIC, self.derive) == bytes([1]) * 32
+        assert cache.get("bip39", MNEMONIC, self.derive) == bytes([2]) * 32
+        assert self.calls == 2
+        # the mnemonic is never a key
+        assert all(MNEMONIC not in cache_key for cache_key in cache.entries)
+
+    def test_sweep_zeroizes_expired_entries(self) -> None:
+        cache = DerivedKeyCache(ttl=10, maxsize=8)
+        cache.get("evm", MNEMONIC, self.derive)
+        key_material = self.get_key_material(cache)
+
+        self.clock.now += 9
+        cache.sweep()
+        assert key_material == bytearray([1]) * 32
+
+        self.clock.now += 1
+        cache.sweep()
+        assert key_material == bytearray(32)
+        assert not cache.entries
+
+    def test_evicted_and_cleared_entries_are_zeroized(self) -> None:
+        cache = DerivedKeyCache(ttl=10, maxsize=1)
+        cache.get("evm", MNEMONIC, self.derive)
+        evicted = self.get_key_material(cache)
+        cache.get("bip39", MNEMONIC, self.derive)
+        cleared = self.get_key_material(cache)
+
+        cache.clear()
+
+        assert evicted == bytearray(32)
+        assert cleared == bytearray(32)
+        assert not cache.entries
+
+    def test_disabled_cache_derives_every_time(self) -> None:
+        cache = DerivedKeyCache(ttl=0)
+        cache.get("evm", MNEMONIC, self.derive)
+        cache.get("evm", MNEMONIC, self.derive)
+
+        assert self.calls == 2
+        assert not cache.entries
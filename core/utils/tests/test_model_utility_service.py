@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import base64
+import threading
+from datetime import datetime
+from typing import Any
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, patch
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from core.config import settings
+from core.utils.model_utility_service import CountMode, ModelUtilityService
+
+
+class Item(BaseModel):
+    isDeleted: bool = False
+
+
+class TestPaginationCursor(TestCase):
+    def test_round_trip(self) -> None:
+        document_id = ObjectId()
+        for sort_value in [datetime(2023, 5, 1, 12, 30), 42, "eth", None]:
+            cursor = ModelUtilityService.encode_cursor(sort_value, document_id)
+            assert ModelUtilityService.decode_cursor(cursor) == (
+                sort_value,
+                document_id,
+            )
+
+    def test_tampered_cursor_rejected(self) -> None:
+        cursor = ModelUtilityService.encode_cursor(42, ObjectId())
+        tampered = [
+            cursor[:-4],
+            "not a cursor",
+            base64.urlsafe_b64encode(b'{"value": 42, "id": "1234"}').decode(),
+            base64.urlsafe_b64encode(b'{"value": 42}').decode(),
+            base64.urlsafe_b64encode(b"[42]").decode(),
+        ]
+        for cursor in tampered:
+            with self.assertRaisesRegex(Exception, "invalid pagination cursor"):
+                ModelUtilityService.decode_cursor(cursor)
+
+
+class TestCountCache(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.execute = AsyncMock()
+        patcher = patch.object(
+            ModelUtilityService, "_ModelUtilityService__execute", self.execute
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        ModelUtilityService.invalidate_counts(Item)
+
+    async def count(self, query: dict[str, Any]) -> Any:
+        return await ModelUtilityService._ModelUtilityService__count(  # type: ignore
+            Item, query, CountMode.CACHED
+        )
+
+    async def test_cached_count_reused(self) -> None:
+        self.execute.return_value = 3
+        assert await self.count({"isDeleted": False}) == 3
+        self.execute.return_value = 2
+        assert await self.count({"isDeleted": False}) == 3
+
+    async def test_updates_invalidate_counts(self) -> None:
+        updates = [
+            lambda: ModelUtilityService.model_update(
+                Item, {"_id": 1}, {"isDeleted": True}
+            ),
+            lambda: ModelUtilityService.model_update_many(
+                Item, {}, {"isDeleted": True}
+            ),
+            lambda: ModelUtilityService.model_bulk_update(
+                Item, [({"_id": 1}, {"isDeleted": True})]
+            ),
+            lambda: ModelUtilityService.model_find_one_and_update(
+                Item, {"_id": 1}, {"isDeleted": True}
+            ),
+        ]
+        for total_count, update in enumerate(updates):
+            self.execute.return_value = total_count + 10
+            assert await self.count({"isDeleted": False}) == total_count + 10
+
+            # soft deleting drops the document from the count
+            self.execute.return_value = None
+            await update()
+
+            self.execute.return_value = total_count
+            assert await self.count({"isDeleted": False}) == total_count
+            ModelUtilityService.invalidate_counts(Item)
+
+
+class FakeSession:
+    def __init__(self, calls: list[tuple[str, int]]) -> None:
+        self.calls = calls
+
+    def record(self, name: str) -> None:
+        self.calls.append((name, threading.get_ident()))
+
+    def start_transaction(self) -> None:
+        self.record("start_transaction")
+
+    def commit_transaction(self) -> None:
+        self.record("commit_transaction")
+
+    def abort_transaction(self) -> None:
+        self.record("abort_transaction")
+
+    def end_session(self) -> None:
+        self.record("end_session")
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, int]] = []
+
+    def start_session(self) -> FakeSession:
+        self.calls.append(("start_session", threading.get_ident()))
+        return FakeSession(self.calls)
+
+
+class TestSyncDriverTransaction(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.client = FakeClient()
+        patchers: list[Any] = [
+            patch.object(settings, "DATABASE_ASYNC_DRIVER", False),
+            patch("core.utils.model_utility_service.client", self.client),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def assert_off_loop(self, names: list[str]) -> None:
+        assert [name for name, _ in self.client.calls] == names
+        loop_thread = threading.get_ident()
+        for name, thread in self.client.calls:
+            # starting the transaction is local to the session
+            if name != "start_transaction":
+                assert thread != loop_thread, name
+
+    async def test_commit_runs_in_the_executor(self) -> None:
+        async with ModelUtilityService.transaction():
+            pass
+
+        self.assert_off_loop(
+            ["start_session", "start_transaction", "commit_transaction", "end_session"]
+        )
+
+    async def test_abort_runs_in_the_executor(self) -> None:
+        with self.assertRaises(ValueError):
+            async with ModelUtilityService.transaction():
+                raise ValueError("insert failed")
+
+        self.assert_off_loop(
+            ["start_session", "start_transaction", "abort_transaction", "end_session"]
+        )
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import json
+from typing import Any
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import httpx
+
+from core.utils.request import REQUEST_METHOD, HTTPRepository, iter_items
+
+
+def status_error(
+    method: str, status_code: int, **headers: str
+) -> httpx.HTTPStatusError:
+    request = httpx.Request(method, "https://example.com")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestShouldRetry(TestCase):
+    def test_gateway_errors_retry_idempotent_methods_only(self) -> None:
+        for status_code in [502, 503, 504]:
+            error = status_error("GET", status_code)
+            assert HTTPRepository.should_retry(error.request, error)
+            error = status_error("POST", status_code)
+            assert not HTTPRepository.should_retry(error.request, error)
+
+    def test_post_retries_rate_limit_with_retry_after(self) -> None:
+        error = status_error("POST", 429)
+        assert not HTTPRepository.should_retry(error.request, error)
+        error = status_error("POST", 429, **{"Retry-After": "2"})
+        assert HTTPRepository.should_retry(error.request, error)
+        assert HTTPRepository.get_retry_delay(error, 1) == 2
+
+    def test_post_retries_unsent_requests_only(self) -> None:
+        request = httpx.Request("POST", "https://example.com")
+        assert HTTPRepository.should_retry(request, httpx.ConnectError("refused"))
+        assert HTTPRepository.should_retry(request, httpx.ConnectTimeout("timeout"))
+        assert not HTTPRepository.should_retry(request, httpx.ReadTimeout("timeout"))
+        request = httpx.Request("GET", "https://example.com")
+        assert HTTPRepository.should_retry(request, httpx.ReadTimeout("timeout"))
+
+
+class TestBuildRequest(TestCase):
+    def test_raw_bodies_sent_as_is_and_mappings_form_encoded(self) -> None:
+        repository = HTTPRepository("https://example.com")
+        request = repository.build_request(REQUEST_METHOD.POST, "/a", '{"a": 1}')
+        assert request.read() == b'{"a": 1}'
+
+        request = repository.build_request(REQUEST_METHOD.POST, "/a", {"a": "1"})
+        assert request.read() == b"a=1"
+        assert request.headers["Content-Type"] == "application/x-www-form-urlencoded"
+
+        request = repository.build_request(REQUEST_METHOD.GET, "/a")
+        assert str(request.url) == "https://example.com/a"
+        assert request.read() == b""
+
+
+class TestIterItems(IsolatedAsyncioTestCase):
+    async def items(self, body: Any, prefix: str) -> list[Any]:
+        response = httpx.Response(200, content=json.dumps(body).encode())
+        return [item async for item in iter_items(response, prefix)]
+
+    async def test_items_under_prefix(self) -> None:
+        body = {"status": "1", "result": [{"a": 1, "b": [{"c": 2}]}, {"a": 2}]}
+        assert await self.items(body, "result.item") == [
+            {"a": 1, "b": [{"c": 2}]},
+            {"a": 2},
+        ]
+        assert await self.items([{"a": 1}, 2], "item") == [{"a": 1}, 2]
+
+    async def test_empty_result(self) -> None:
+        body = {"status": "0", "message": "No transactions found", "result": []}
+        assert await self.items(body, "result.item") == []
+
+    async def test_error_payload_raises(self) -> None:
+        body = {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+        with self.assertRaisesRegex(Exception, "Max rate limit reached"):
+            await self.items(body, "result.item")
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import threading
+from typing import Any
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+import boto3
+from moto import mock_s3
+
+from core.config import settings
+from core.utils.s3_uploader import S3Uploader
+
+BUCKET_NAME = "deg-x-test"
+
+
+class TestS3Uploader(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        patchers: list[Any] = [
+            mock_s3(),
+            patch.object(settings, "IS_DEV", True),
+            patch.object(settings, "S3_BUCKET_REGION", ""),
+            patch.object(settings, "AWS_ACCESS_KEY_ID", "testing"),
+            patch.object(settings, "AWS_SECRET_ACCESS_KEY", "testing"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def create_bucket(self, region: str) -> None:
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        if region == "us-east-1":
+            s3_client.create_bucket(Bucket=BUCKET_NAME)
+        else:
+            s3_client.create_bucket(
+                Bucket=BUCKET_NAME,
+                CreateBucketConfiguration={"LocationConstraint": region},
+            )
+
+    async def test_region_looked_up_once_off_the_event_loop(self) -> None:
+        self.create_bucket("eu-west-1")
+        uploader = S3Uploader(BUCKET_NAME)
+        s3_client = uploader.get_client()
+        lookups: list[int] = []
+
+        def get_bucket_location(**kwargs: Any) -> Any:
+            lookups.append(threading.get_ident())
+            return get_location(**kwargs)
+
+        get_location = s3_client.get_bucket_location
+        with patch.object(s3_client, "get_bucket_location", get_bucket_location):
+            assert await uploader.load_region() == "eu-west-1"
+            assert await uploader.get_file_url("a.png") == (
+                f"https://s3-eu-west-1.amazonaws.com/{BUCKET_NAME}/a.png"
+            )
+
+        assert len(lookups) == 1
+        assert lookups[0] != threading.get_ident()
+
+    async def test_us_east_1_bucket_has_a_region(self) -> None:
+        self.create_bucket("us-east-1")
+        uploader = S3Uploader(BUCKET_NAME)
+
+        assert await uploader.load_region() == "us-east-1"
+
+    async def test_upload_and_exists(self) -> None:
+        self.create_bucket("eu-west-1")
+        uploader = S3Uploader(BUCKET_NAME)
+
+        assert not await uploader.exists("qr/a.png")
+        url = await uploader.upload("qr/a.png", b"png", "image/png", unique=False)
+
+        assert url == f"https://s3-eu-west-1.amazonaws.com/{BUCKET_NAME}/qr/a.png"
+        assert await uploader.exists("qr/a.png")
+        s3_object = uploader.get_client().get_object(Bucket=BUCKET_NAME, Key="qr/a.png")
+        assert s3_object["Body"].read() == b"png"
+        assert s3_object["ContentType"] == "image/png"
+
+    async def test_unique_uploads_do_not_overwrite(self) -> None:
+        self.create_bucket("eu-west-1")
+        uploader = S3Uploader(BUCKET_NAME)
+
+        first = await uploader.upload("a.png", b"1")
+        second = await uploader.upload("a.png", b"2")
+
+        assert first != second
+        assert first.endswith("a.png") and second.endswith("a.png")
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+from typing import Optional
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from core.config import settings
+from core.utils.shared_cache import MemoryCacheBackend, SharedCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Price(BaseModel):
+    id: ObjectId
+    symbol: str
+    updatedAt: datetime
+
+    model_config = {"arbitrary_types_allowed": True}
+
+
+class TestMemoryCacheBackend(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        patcher = patch("core.utils.shared_cache.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_entries_expire_after_ttl(self) -> None:
+        backend = MemoryCacheBackend()
+        await backend.set("a", b"1", 10)
+        await backend.set("b", b"2", None)
+
+        assert await backend.get("a") == b"1"
+        self.clock.now += 10
+        assert await backend.get("a") is None
+        assert await backend.get("b") == b"2"
+
+    async def test_delete_prefix(self) -> None:
+        backend = MemoryCacheBackend()
+        await backend.set("deg-x:price:1", b"1", None)
+        await backend.set("deg-x:price:2", b"2", None)
+        await backend.set("deg-x:fee:1", b"3", None)
+
+        await backend.delete_prefix("deg-x:price:")
+
+        assert list(backend.entries) == ["deg-x:fee:1"]
+
+
+class TestSharedCache(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        patcher = patch.object(settings, "SHARED_CACHE_URL", "memory://")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        SharedCache.backend = None
+        self.addCleanup(setattr, SharedCache, "backend", None)
+
+    async def test_values_round_trip_as_their_type(self) -> None:
+        cache = SharedCache("price", list[Price])
+        prices = [Price(id=ObjectId(), symbol="eth", updatedAt=datetime(2023, 1, 1))]
+
+        await cache.set(("eth",), prices, 10)
+
+        assert isinstance(SharedCache.get_backend(), MemoryCacheBackend)
+        assert await cache.get(("eth",)) == (True, prices)
+        assert await cache.get(("btc",)) == (False, None)
+
+    async def test_get_or_load_loads_once(self) -> None:
+        cache = SharedCache("symbol", Optional[str])
+        calls: list[str] = []
+
+        async def load() -> str:
+            calls.append("eth")
+            return "eth"
+
+        assert await cache.get_or_load("key", load, 10) == "eth"
+        assert await cache.get_or_load("key", load, 10) == "eth"
+        assert calls == ["eth"]
+
+    async def test_invalidate_clears_its_namespace_only(self) -> None:
+        prices, fees = SharedCache("price", int), SharedCache("fee", int)
+        await prices.set("key", 1, None)
+        await fees.set("key", 2, None)
+
+        await prices.invalidate()
+
+        assert await prices.get("key") == (False, None)
+        assert await fees.get("key") == (True, 2)
+
+    async def test_backend_errors_are_misses(self) -> None:
+        cache = SharedCache("price", int)
+        backend = SharedCache.get_backend()
+        with patch.object(backend, "get", side_effect=ConnectionError("down")):
+            assert await cache.get("key") == (False, None)
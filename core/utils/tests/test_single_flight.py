@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from core.utils.single_flight import SingleFlight, SingleFlightCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Loader:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        await self.release.wait()
+        return self.calls
+
+
+class TestSingleFlight(IsolatedAsyncioTestCase):
+    async def test_concurrent_callers_share_one_call(self) -> None:
+        flight, loader = SingleFlight(), Loader()
+        callers = [asyncio.create_task(flight.do("key", loader)) for _ in range(10)]
+        await asyncio.sleep(0)
+        assert flight.in_flight("key")
+
+        loader.release.set()
+
+        assert await asyncio.gather(*callers) == [1] * 10
+        assert loader.calls == 1
+        assert not flight.in_flight("key")
+
+    async def test_error_raised_to_every_caller(self) -> None:
+        flight = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0)
+            raise ValueError("rpc down")
+
+        results = await asyncio.gather(
+            *[flight.do("key", fail) for _ in range(3)], return_exceptions=True
+        )
+
+        assert [str(result) for result in results] == ["rpc down"] * 3
+
+    async def test_cancelled_caller_does_not_cancel_the_call(self) -> None:
+        flight, loader = SingleFlight(), Loader()
+        first = asyncio.create_task(flight.do("key", loader))
+        second = asyncio.create_task(flight.do("key", loader))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        loader.release.set()
+
+        assert await second == 1
+
+
+class TestSingleFlightCache(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        patcher = patch("core.utils.single_flight.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_fresh_results_are_cached(self) -> None:
+        cache, loader = SingleFlightCache(10), Loader()
+        loader.release.set()
+
+        assert await cache.get("key", loader) == 1
+        self.clock.now += 9
+        assert await cache.get("key", loader) == 1
+        self.clock.now += 1
+        assert await cache.get("key", loader) == 2
+
+    async def test_stale_result_served_while_one_call_revalidates(self) -> None:
+        cache, loader = SingleFlightCache(10, stale_ttl=20), Loader()
+        loader.release.set()
+        await cache.get("key", loader)
+        loader.release.clear()
+
+        self.clock.now += 15
+        assert (
+            await asyncio.gather(*[cache.get("key", loader) for _ in range(5)])
+            == [1] * 5
+        )
+        await asyncio.sleep(0)
+        assert loader.calls == 2
+
+        loader.release.set()
+        await asyncio.gather(*cache.refreshes)
+        assert await cache.get("key", loader) == 2
+
+    async def test_result_past_stale_ttl_is_reloaded(self) -> None:
+        cache, loader = SingleFlightCache(10, stale_ttl=20), Loader()
+        loader.release.set()
+        await cache.get("key", loader)
+
+        self.clock.now += 30
+        assert await cache.get("key", loader) == 2
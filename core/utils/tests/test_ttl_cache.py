@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from typing import Optional
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from core.utils.ttl_cache import TTLCache, ttl_cache
+
+
+class Item(BaseModel):
+    id: ObjectId
+    name: str
+
+    model_config = {"arbitrary_types_allowed": True}
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache(TestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        patcher = patch("core.utils.ttl_cache.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_entries_expire_after_ttl(self) -> None:
+        cache: TTLCache[int] = TTLCache("test", 10)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=20)
+        assert cache.get("a") == (True, 1)
+
+        self.clock.now += 10
+        assert cache.get("a") == (False, None)
+        assert cache.get("b") == (True, 2)
+        assert cache.stats()["size"] == 1
+
+    def test_entries_without_ttl_never_expire(self) -> None:
+        cache: TTLCache[int] = TTLCache("test", None)
+        cache.set("a", 1)
+
+        self.clock.now += 10**9
+        assert cache.get("a") == (True, 1)
+
+    def test_least_recently_used_evicted_past_maxsize(self) -> None:
+        cache: TTLCache[int] = TTLCache("test", 10, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.get("c") == (True, 3)
+        assert cache.evictions == 1
+
+    def test_none_kept_for_negative_ttl_only(self) -> None:
+        cache: TTLCache[Optional[int]] = TTLCache("test", 10)
+        cache.set("a", None)
+        assert cache.get("a") == (False, None)
+
+        cache = TTLCache("test", 10, negative_ttl=1)
+        cache.set("a", None)
+        assert cache.get("a") == (True, None)
+        self.clock.now += 1
+        assert cache.get("a") == (False, None)
+
+
+class Service:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @ttl_cache(10)
+    async def get_name(self, item: Item) -> str:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return item.name
+
+
+class TestTTLCacheDecorator(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        Service.get_name.cache_clear()
+
+    async def test_methods_keyed_by_class_not_instance(self) -> None:
+        item = Item(id=ObjectId(), name="a")
+        first, second = Service(), Service()
+
+        assert await first.get_name(item) == "a"
+        assert await second.get_name(item) == "a"
+        assert (first.calls, second.calls) == (1, 0)
+
+    async def test_models_keyed_by_id(self) -> None:
+        service = Service()
+        item = Item(id=ObjectId(), name="a")
+
+        await service.get_name(item)
+        # same id, the cached result is returned
+        assert await service.get_name(Item(id=item.id, name="b")) == "a"
+        assert await service.get_name(Item(id=ObjectId(), name="b")) == "b"
+        assert service.calls == 2
+
+        Service.get_name.invalidate(service, item)
+        assert await service.get_name(Item(id=item.id, name="b")) == "b"
+
+    async def test_concurrent_misses_share_one_call(self) -> None:
+        service = Service()
+        item = Item(id=ObjectId(), name="a")
+
+        names = await asyncio.gather(*[service.get_name(item) for _ in range(5)])
+
+        assert names == ["a"] * 5
+        assert service.calls == 1
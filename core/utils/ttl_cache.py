@@ -0,0 +1,264 @@
+import inspect
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Generic,
+    Hashable,
+    Optional,
+    Protocol,
+    TypeVar,
+    cast,
+)
+
+from bson import json_util
+from pydantic import BaseModel
+
+from core.utils.shared_cache import get_function_cache
+from core.utils.single_flight import SingleFlight
+
+V = TypeVar("V")
+R = TypeVar("R")
+R_co = TypeVar("R_co", covariant=True)
+
+KeyBuilder = Callable[[tuple[Any, ...], dict[str, Any]], Hashable]
+
+
+def make_key_part(value: Any) -> Hashable:
+    """
+    make_key_part: stable hashable key for an argument, models with an id are
+    keyed by type and id, other models, dicts and lists by their contents
+    """
+    if isinstance(value, BaseModel):
+        model_id = getattr(value, "id", None)
+        if model_id is not None:
+            return (type(value).__name__, str(model_id))
+        return (type(value).__name__, value.model_dump_json())
+    if isinstance(value, dict):
+        return json_util.dumps(value, sort_keys=True)
+    if isinstance(value, (list, tuple, set)):
+        return tuple(make_key_part(item) for item in value)
+    if isinstance(value, Hashable):
+        return value
+    return repr(value)
+
+
+def make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+    return (
+        tuple(make_key_part(arg) for arg in args),
+        tuple((name, make_key_part(value)) for name, value in sorted(kwargs.items())),
+    )
+
+
+def estimate_size(value: Any) -> int:
+    if isinstance(value, BaseModel):
+        return sys.getsizeof(value) + estimate_size(value.__dict__)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(key) + estimate_size(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+@dataclass
+class CacheEntry(Generic[V]):
+    value: V
+    expiresAt: Optional[float]
+    size: int = 0
+
+
+class TTLCache(Generic[V]):
+    """
+    TTLCache: in-process cache where every entry expires `ttl` seconds after it
+    was set, `None` for entries that never expire
+
+    least recently used entries are evicted past `maxsize` entries or, when set,
+    `maxbytes` estimated bytes. `None` results are only kept for `negative_ttl`
+    seconds, not at all when it is 0
+    """
+
+    caches: ClassVar[list["TTLCache[Any]"]] = []
+
+    def __init__(
+        self,
+        name: str,
+        ttl: Optional[float],
+        maxsize: int = 128,
+        maxbytes: Optional[int] = None,
+        negative_ttl: float = 0,
+        sizeof: Callable[[Any], int] = estimate_size,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.negative_ttl = negative_ttl
+        self.sizeof = sizeof
+        self.entries: OrderedDict[Hashable, CacheEntry[V]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        TTLCache.caches.append(self)
+
+    def get(self, key: Hashable) -> tuple[bool, Optional[V]]:
+        entry = self.entries.get(key)
+        if entry and (entry.expiresAt is None or entry.expiresAt > time.monotonic()):
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return True, entry.value
+
+        if entry:
+            self.pop(key)
+        self.misses += 1
+        return False, None
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        if value is None:
+            if not self.negative_ttl:
+                return
+            ttl = self.negative_ttl
+
+        self.pop(key)
+        size = self.sizeof(value) if self.maxbytes else 0
+        self.entries[key] = CacheEntry(
+            value, time.monotonic() + ttl if ttl is not None else None, size
+        )
+        self.bytes += size
+        while len(self.entries) > self.maxsize or (
+            self.maxbytes and self.bytes > self.maxbytes and len(self.entries) > 1
+        ):
+            self.pop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.bytes -= entry.size
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self.entries.clear()
+            self.bytes = 0
+        else:
+            self.pop(key)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "bytes": self.bytes,
+        }
+
+    @classmethod
+    def get_stats(cls) -> dict[str, dict[str, int]]:
+        return {cache.name: cache.stats() for cache in cls.caches}
+
+
+class CachedFunction(Protocol[R_co]):
+    """CachedFunction: a function wrapped by ttl_cache, with its cache attached"""
+
+    cache: TTLCache[Any]
+
+    def __call__(self, *args: Any, **kwargs: Any) -> R_co:
+        ...
+
+    def cache_clear(self) -> None:
+        ...
+
+    def invalidate(self, *args: Any, **kwargs: Any) -> None:
+        ...
+
+
+def ttl_cache(
+    ttl: Optional[float],
+    maxsize: int = 128,
+    maxbytes: Optional[int] = None,
+    negative_ttl: float = 0,
+    key: KeyBuilder = make_key,
+    shared: bool = False,
+) -> Callable[[Callable[..., R]], CachedFunction[R]]:
+    """
+    ttl_cache: cache the results of a function in a TTLCache, concurrent misses of
+    a coroutine function share one call
+
+    methods are keyed by the class of `self` rather than the instance, models
+    with an id by their id. the cache is exposed as `.cache` and invalidated with
+    `.invalidate(*args, **kwargs)`, or `.cache_clear()` for every entry
+
+    Args:
+        ttl (float | None): seconds a result is kept, None to keep it until evicted
+        key (KeyBuilder, optional): builds the cache key of the call arguments.
+            Defaults to make_key.
+        shared (bool, optional): read and write results of a coroutine function
+            through the SharedCache tier, serialized as its return annotation.
+            Defaults to False.
+    """
+
+    def wrapper(func: Callable[..., R]) -> CachedFunction[R]:
+        cache: TTLCache[Any] = TTLCache(
+            func.__qualname__, ttl, maxsize, maxbytes, negative_ttl
+        )
+        is_method = next(iter(inspect.signature(func).parameters), None) == "self"
+
+        def build_key(args, kwargs):  # type: ignore
+            if is_method:
+                return (type(args[0]).__qualname__, key(args[1:], kwargs))
+            return key(args, kwargs)
+
+        if inspect.iscoroutinefunction(func):
+            flight = SingleFlight()
+            get_shared_cache = get_function_cache(func) if shared else lambda: None
+
+            @wraps(func)
+            async def wrapped_func(*args, **kwargs):  # type: ignore
+                cache_key = build_key(args, kwargs)
+                hit, value = cache.get(cache_key)
+                if hit:
+                    return value
+
+                async def load():  # type: ignore
+                    shared_cache = get_shared_cache()
+                    value = (
+                        await shared_cache.get_or_load(
+                            cache_key, lambda: func(*args, **kwargs), ttl
+                        )
+                        if shared_cache
+                        else await func(*args, **kwargs)
+                    )
+                    cache.set(cache_key, value)
+                    return value
+
+                return await flight.do(cache_key, load)
+
+        else:
+
+            @wraps(func)
+            def wrapped_func(*args, **kwargs):  # type: ignore
+                cache_key = build_key(args, kwargs)
+                hit, value = cache.get(cache_key)
+                if hit:
+                    return value
+                value = func(*args, **kwargs)
+                cache.set(cache_key, value)
+                return value
+
+        cached_func = cast(CachedFunction[R], wrapped_func)
+        cached_func.cache = cache
+        cached_func.cache_clear = cache.invalidate  # type: ignore[method-assign]
+        cached_func.invalidate = (  # type: ignore[method-assign]
+            lambda *args, **kwargs: cache.invalidate(build_key(args, kwargs))
+        )
+        return cached_func
+
+    return wrapper
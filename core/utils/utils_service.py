@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import binascii
 import hashlib
 import json
@@ -7,28 +6,23 @@ import os
 import random
 import string
 import time
-import uuid
-from functools import lru_cache, wraps
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Awaitable, Callable, List, Type, TypeVar
 from PIL import Image
 import requests
 import qrcode
-from async_lru import alru_cache
-from boto3 import client
-from frozendict.core import frozendict
 from itsdangerous import URLSafeTimedSerializer
 from pydantic import EmailStr
 from qrcode.image.styledpil import StyledPilImage
 from qrcode.image.styles.colormasks import RadialGradiantColorMask
 from qrcode.image.styles.moduledrawers import RoundedModuleDrawer
 from requests import request
-from solcx import compile_standard, install_solc
 from web3 import Web3
 
 from core.config import settings
 from core.utils.loggly import logger
+from core.utils.ttl_cache import ttl_cache
 
 
 class NotFoundInRecordException(Exception):
@@ -43,50 +37,6 @@ class NotFoundInRecordException(Exception):
         return f"{self.model} -> {self.message}"
 
 
-def timed_cache(  # type: ignore
-    timeout: int, maxsize: int = 128, typed: bool = False, asyncFunction: bool = False
-):
-    """
-    timed_cache: give lru cache time expiration ability
-
-    Args:
-        timeout (int): duration of cache power in minutes
-        maxsize (int, optional): _description_. Defaults to 128.
-        typed (bool, optional): _description_. Defaults to False.
-    """
-
-    def wrapper_cache(func):  # type: ignore
-        func = (
-            alru_cache(maxsize=maxsize, typed=typed)(func)
-            if asyncFunction
-            else lru_cache(maxsize=maxsize, typed=typed)(func)
-        )
-        func.delta = (timeout * 10**9) * 60
-        func.expiration = time.monotonic_ns() + func.delta
-
-        @wraps(func)
-        def wrapped_func(*args, **kwargs):  # type: ignore
-
-            args = tuple(
-                [frozendict(arg) if isinstance(arg, dict) else arg for arg in args]
-            )
-            kwargs = {
-                k: frozendict(v) if isinstance(v, dict) else v
-                for k, v in kwargs.items()
-            }
-            if time.monotonic_ns() >= func.expiration:
-                func.cache_clear()
-                func.expiration = time.monotonic_ns() + func.delta
-
-            return func(*args, **kwargs)
-
-        wrapped_func.cache_info = func.cache_info  # type: ignore
-        wrapped_func.cache_clear = func.cache_clear  # type: ignore
-        return wrapped_func
-
-    return wrapper_cache
-
-
 def timer_func(func: Callable[[Any, Any], Any]) -> Any:
     """
     timer_func This function shows the execution time of the function object passed
@@ -149,36 +99,32 @@ class Utils:
         return email
 
     @staticmethod
-    @timed_cache(10000000, asyncFunction=True)
-    async def get_compiled_sol(contract_file_name: str, version: str) -> Any:
-        with open(Path(f"./solidity/{contract_file_name}.sol"), "r") as file:
-            contract_file = file.read()
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, install_solc, version, True)
-
-        # Solidity source code
-        compiled_sol = compile_standard(
-            {
-                "language": "Solidity",
-                "sources": {f"{contract_file_name}.sol": {"content": contract_file}},
-                "settings": {
-                    "outputSelection": {
-                        "*": {
-                            "*": [
-                                "abi",
-                            ]
-                        }
-                    }
-                },
-            },
-            solc_version=version,
-        )
+    def load_contract_abis() -> None:
+        for artifact_path in (Path(settings.BASE_DIR) / "solidity" / "build").glob(
+            "*.json"
+        ):
+            Utils.get_contract_abi(artifact_path.stem)
 
-        abi = compiled_sol["contracts"][f"{contract_file_name}.sol"][
-            f"{contract_file_name}"
-        ]["abi"]
+    @staticmethod
+    @ttl_cache(None)
+    def get_contract_abi(contract_name: str) -> list[dict[str, Any]]:
+        """
+        get_contract_abi: abi of a solidity/ contract, read from the artifact built
+        by scripts/build_abis.py and checked against the source it was built from
+        """
+        solidity_dir = Path(settings.BASE_DIR) / "solidity"
+        artifact = json.loads(
+            (solidity_dir / "build" / f"{contract_name}.json").read_text()
+        )
+        source_hash = hashlib.sha256(
+            (solidity_dir / f"{contract_name}.sol").read_bytes()
+        ).hexdigest()
+        if artifact["sourceHash"] != source_hash:
+            raise Exception(
+                f"{contract_name} abi is stale, rebuild it with scripts/build_abis.py"
+            )
 
-        return abi
+        return artifact["abi"]
 
     @staticmethod
     def get_evm_reverted_reason(err: Any) -> str:
@@ -224,9 +170,14 @@ class Utils:
         return genericClass(**_dict)
 
     @staticmethod
-    @timed_cache(60, 10)
-    def create_qr_image(data_to_encode: Any = "Deg X", isBasic: bool = True) -> str:
-        # return ""
+    def get_qr_image_key(data_to_encode: Any = "Deg X", isBasic: bool = True) -> str:
+        # bump the version whenever the rendering changes
+        style = "basic" if isBasic else "styled"
+        content = f"qr:v2:{style}:{data_to_encode}".encode()
+        return f"qr/{hashlib.sha256(content).hexdigest()}.png"
+
+    @staticmethod
+    def render_qr_image(data_to_encode: Any = "Deg X", isBasic: bool = True) -> bytes:
         # Creating an instance of QRCode class
         qr = qrcode.QRCode(version=2, error_correction=qrcode.ERROR_CORRECT_Q)
 
@@ -253,47 +204,8 @@ class Utils:
             )
 
         buffer = BytesIO()
-        img.save(buffer)
-        img_base64 = base64.b64encode(buffer.getvalue()).decode()
-        image_url = Utils.upload_file(data_to_encode, img_base64)
-        return image_url
-
-    @staticmethod
-    def upload_file(file_name: str, base64_data: str) -> str:
-        if not settings.IS_DEV:
-            return (
-                "https://s3-us-west-2.amazonaws.com/verifi-app-bucket/"
-                + "1bad0760-22c5-4ac6-bcac-c963193e393063080868bcec8b55dc441a19"
-            )
-        else:
-            s3_client = client(
-                "s3",
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            )
-
-        file_name = Utils.generate_unique_file_name(file_name)
-        s3_client.put_object(
-            Body=base64.b64decode(base64_data),
-            Bucket=settings.S3_BUCKET_NAME,
-            Key=file_name,
-        )
-        # get object url
-        object_url = Utils.get_file_url_location(s3_client, file_name)
-        return object_url
-
-    @staticmethod
-    def generate_unique_file_name(file_name: str) -> str:
-        return "{}{}".format(uuid.uuid4(), file_name)
-
-    @staticmethod
-    def get_file_url_location(s3_client: Any, file_name: str) -> str:
-        location = s3_client.get_bucket_location(Bucket=settings.S3_BUCKET_NAME)[
-            "LocationConstraint"
-        ]
-        return "https://s3-{}.amazonaws.com/{}/{}".format(
-            location, settings.S3_BUCKET_NAME, file_name
-        )
+        img.save(buffer, format="PNG")
+        return buffer.getvalue()
 
     @staticmethod
     async def promise_all(
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from core.config import settings
+from core.utils.loggly import logger
+
+
+class Warmup:
+    """
+    Warmup: startup stage preloading caches, providers and ABIs concurrently
+    before the app reports ready
+
+    steps are registered by name and filtered with `WARMUP_STEPS`. a failed or
+    timed out step is logged and recorded but does not hold readiness back, the
+    data it preloads is then loaded by the first request needing it
+    """
+
+    def __init__(self) -> None:
+        self.steps: dict[str, Callable[[], Awaitable[Any]]] = {}
+        self.ready = False
+        self.createdAt = time.monotonic()
+        self.metrics: dict[str, Any] = {"steps": {}}
+        self.task: asyncio.Task[None] | None = None
+
+    def register(self, name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        self.steps[name] = step
+
+    def get_steps(self) -> dict[str, Callable[[], Awaitable[Any]]]:
+        if not settings.WARMUP_STEPS:
+            return self.steps
+        return {
+            name: step
+            for name, step in self.steps.items()
+            if name in settings.WARMUP_STEPS
+        }
+
+    async def run_step(self, name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        started = time.monotonic()
+        error = None
+        try:
+            await asyncio.wait_for(step(), settings.WARMUP_STEP_TIMEOUT)
+        except asyncio.TimeoutError:
+            error = f"timed out after {settings.WARMUP_STEP_TIMEOUT}s"
+        except Exception as e:
+            error = str(e)
+
+        duration = round((time.monotonic() - started) * 1000, 1)
+        self.metrics["steps"][name] = {"durationMs": duration, "error": error}
+        if error:
+            logger.error(f"Error warming up {name} - {error}")
+        else:
+            logger.info(f"warmed up {name} in {duration}ms")
+
+    async def run(self) -> None:
+        started = time.monotonic()
+        self.metrics["startupMs"] = round((started - self.createdAt) * 1000, 1)
+        if settings.WARMUP_ENABLED:
+            logger.info("Warming up")
+            await asyncio.gather(
+                *[self.run_step(name, step) for name, step in self.get_steps().items()]
+            )
+
+        self.metrics["warmupMs"] = round((time.monotonic() - started) * 1000, 1)
+        self.metrics["readyMs"] = round((time.monotonic() - self.createdAt) * 1000, 1)
+        self.ready = True
+        logger.info(
+            f"Ready in {self.metrics['readyMs']}ms, "
+            f"warm-up took {self.metrics['warmupMs']}ms"
+        )
+
+    async def start(self) -> None:
+        if settings.WARMUP_IN_BACKGROUND:
+            self.task = asyncio.create_task(self.run())
+        else:
+            await self.run()
+
+    def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    def get_stats(self) -> dict[str, Any]:
+        return {"ready": self.ready, **self.metrics}
+
+
+# created while the app modules are imported, startup metrics are measured from
+# here
+warmup = Warmup()
@@ -0,0 +1,73 @@
+"""
+benchmark_endpoints: measure requests/sec of the busiest read endpoints
+
+run the server once per driver mode and compare the output, e.g.
+
+    DATABASE_ASYNC_DRIVER=false python application.py
+    python scripts/benchmark_endpoints.py --token <access token>
+
+    DATABASE_ASYNC_DRIVER=true python application.py
+    python scripts/benchmark_endpoints.py --token <access token>
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import AsyncClient, Limits
+
+ENDPOINTS = ["/api/v1/wallets/", "/api/v1/blockchain/transactions"]
+
+
+async def benchmark_endpoint(
+    http_client: AsyncClient, endpoint: str, total: int, concurrency: int
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def hit() -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            response = await http_client.get(endpoint)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[hit() for _ in range(total)])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(
+        f"{endpoint}: {total / elapsed:.1f} req/s | "
+        f"p50 {statistics.median(latencies) * 1000:.1f}ms | "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms | "
+        f"failed {failures}/{total}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with AsyncClient(
+        base_url=args.base_url,
+        headers={"Authorization": f"Bearer {args.token}"},
+        limits=Limits(max_connections=args.concurrency),
+        timeout=60,
+    ) as http_client:
+        for endpoint in args.endpoints:
+            # warm the endpoint before measuring
+            await http_client.get(endpoint)
+            await benchmark_endpoint(
+                http_client, endpoint, args.requests, args.concurrency
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--endpoints", nargs="+", default=ENDPOINTS)
+    asyncio.run(main(parser.parse_args()))
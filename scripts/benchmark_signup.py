@@ -0,0 +1,65 @@
+"""
+benchmark_signup: measure the address derivation part of wallet creation for
+every registered chain, one chain after another on the event loop versus a
+shared seed fanned out to the derivation process pool
+
+    python scripts/benchmark_signup.py --rounds 10
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from mnemonic import Mnemonic
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from apps.blockchain.services.blockchain_service import (  # noqa: E402
+    BlockchainService,
+)
+from core.utils.key_cache import derivedKeyCache  # noqa: E402
+
+
+def report(label: str, timings: list[float]) -> None:
+    timings.sort()
+    print(
+        f"{label}: p50 {statistics.median(timings) * 1000:.1f}ms | "
+        f"max {timings[-1] * 1000:.1f}ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    blockchain_service = BlockchainService()
+    providers = list(BlockchainService.blockchainRegistry.registry.keys())
+    mnemo = Mnemonic("english")
+    print(f"deriving addresses for {len(providers)} chains, {args.rounds} rounds")
+
+    sequential: list[float] = []
+    pooled: list[float] = []
+    # warm the worker processes before measuring
+    await blockchain_service.derive_addresses(providers, mnemo.generate(strength=256))
+    for _ in range(args.rounds):
+        mnemonic = mnemo.generate(strength=256)
+        started = time.perf_counter()
+        for provider in providers:
+            await blockchain_service.create_address(provider, mnemonic)
+        sequential.append(time.perf_counter() - started)
+
+        # a fresh mnemonic so the pooled path cannot reuse the cached seed
+        mnemonic = mnemo.generate(strength=256)
+        started = time.perf_counter()
+        await blockchain_service.derive_addresses(providers, mnemonic)
+        pooled.append(time.perf_counter() - started)
+        derivedKeyCache.clear()
+
+    report("sequential create_address", sequential)
+    report("pooled derive_addresses", pooled)
+    BlockchainService.shutdown_derivation_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+"""
+build_abis: compile the contracts in solidity/ and write their ABIs to
+solidity/build/<contract>.json, along with the sha256 of the source they were
+built from, which is checked when the ABI is loaded
+
+    python scripts/build_abis.py
+    python scripts/build_abis.py --check  # exit 1 if an ABI is missing or stale
+
+artifacts with a null `compiler` were written from the interface declarations
+without solc and are reported by --check until they are rebuilt
+"""
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+SOLIDITY_DIR = Path(__file__).resolve().parent.parent / "solidity"
+BUILD_DIR = SOLIDITY_DIR / "build"
+
+
+def get_source_hash(source_path: Path) -> str:
+    return hashlib.sha256(source_path.read_bytes()).hexdigest()
+
+
+def compile_abi(source_path: Path, version: str) -> list[dict[str, Any]]:
+    from solcx import compile_standard, install_solc
+
+    install_solc(version, True)
+    compiled_sol = compile_standard(
+        {
+            "language": "Solidity",
+            "sources": {source_path.name: {"content": source_path.read_text()}},
+            "settings": {"outputSelection": {"*": {"*": ["abi"]}}},
+        },
+        solc_version=version,
+    )
+
+    return compiled_sol["contracts"][source_path.name][source_path.stem]["abi"]
+
+
+def is_stale(source_path: Path) -> bool:
+    artifact_path = BUILD_DIR / f"{source_path.stem}.json"
+    if not artifact_path.exists():
+        return True
+    artifact = json.loads(artifact_path.read_text())
+    return not artifact["compiler"] or artifact["sourceHash"] != get_source_hash(
+        source_path
+    )
+
+
+def main(args: argparse.Namespace) -> int:
+    sources = sorted(SOLIDITY_DIR.glob("*.sol"))
+    if args.check:
+        stale = [source.name for source in sources if is_stale(source)]
+        for name in stale:
+            print(f"{name}: abi missing, stale or not built by solc")
+        return 1 if stale else 0
+
+    BUILD_DIR.mkdir(exist_ok=True)
+    for source in sources:
+        artifact = {
+            "contractName": source.stem,
+            "compiler": args.version,
+            "sourceHash": get_source_hash(source),
+            "abi": compile_abi(source, args.version),
+        }
+        (BUILD_DIR / f"{source.stem}.json").write_text(
+            json.dumps(artifact, indent=2) + "\n"
+        )
+        print(f"{source.name}: {len(artifact['abi'])} abi entries")
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--version", default="0.6.12", help="solc version")
+    parser.add_argument("--check", action="store_true")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,15 @@
+"""
+cleanup_bitcoinlib_wallets: delete the throwaway wallets that address
+derivation used to leave in the bitcoinlib database
+
+    python scripts/cleanup_bitcoinlib_wallets.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from apps.blockchain.bitcoin.base_coin_service import BasecoinService  # noqa: E402
+
+if __name__ == "__main__":
+    print(f"deleted {BasecoinService.cleanup_orphaned_wallets()} orphaned wallets")